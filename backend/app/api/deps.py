@@ -1,8 +1,10 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Path, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.security import verify_token
+from app.core.security import verify_stream_token, verify_token
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
@@ -18,3 +20,29 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
         )
     
     return username
+
+
+def get_stream_user(
+    job_id: int = Path(...),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    token: Optional[str] = Query(None, description="Stream token from POST /scans/jobs/{job_id}/stream-token")
+) -> str:
+    """
+    Like get_current_user, but also accepts a stream token for this job as a
+    ?token= query parameter (for EventSource, which cannot set headers).
+    Access tokens are never accepted in the query string, where they would
+    end up in server and proxy logs.
+    """
+    if credentials:
+        username = verify_token(credentials.credentials)
+    else:
+        username = verify_stream_token(token, job_id) if token else None
+    
+    if username is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return username
@@ -1,27 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import json
 
-from app.database import get_db
-from app.api.deps import get_current_user
+from app.database import get_db, SessionLocal
+from app.api.deps import get_current_user, get_stream_user
 from app.schemas.scan import (
     ScanRequest, 
     ScanResponse, 
     ScanListResponse, 
     ScanListItem,
-    ScanResult
+    ScanResult,
+    ScanJobResponse,
+    ScanStreamTokenResponse,
+    ScanBatchResponse
 )
 from app.services.ultimate_scraper import scrape_website_ultimate
-from app.services.ultimate_extractor import extract_contacts_ultimate
-from app.services.llm_services import process_with_llm
+from app.services.ultimate_extractor import extract_contacts_in_pool
 from app.services.database_services import DatabaseService
+from app.services.job_queue import JobQueue
+from app.services.scan_cache import ScanCache, domain_key
+from app.services.batch_scans import (
+    BatchService,
+    BatchUploadError,
+    parse_batch_upload,
+    results_as_csv,
+    results_as_ndjson
+)
+from app.services.progress import ProgressPublisher, TERMINAL_STATUSES, events_after
+from app.core.security import create_stream_token
+from app.config import get_settings
 from app.middleware.rate_limit import limiter
 
+settings = get_settings()
+
 router = APIRouter(prefix="/scans", tags=["Scans"])
 
+# Seconds without events before a keep-alive comment is sent
+SSE_KEEPALIVE_SECONDS = 15
+
 
-@router.post("/", response_model=ScanResponse)
+@router.post("/", response_model=ScanJobResponse, status_code=202)
 @limiter.limit("5/hour")
 def create_scan(
     request: Request,
@@ -30,62 +52,211 @@ def create_scan(
     db: Session = Depends(get_db)
 ):
     """
-    MAIN ENDPOINT: Ultimate scan pipeline
+    MAIN ENDPOINT: Queue a scan for the background workers.
+    Poll GET /scans/jobs/{id} until it succeeds, then fetch /scans/{scan_id}.
+    
+    A fresh scan of the same site is reused (the job comes back already
+    succeeded) unless force_refresh is set, and a request for a site that is
+    already being scanned joins that job.
     """
+    website_url = str(scan_request.website_url)
+    key = domain_key(website_url)
+    queue = JobQueue(db)
+    
+    if not scan_request.force_refresh:
+        scan_id = ScanCache(db).lookup(key)
+        if scan_id is not None:
+            job = queue.add_completed(website_url, scan_id, requested_by=current_user, domain_key=key)
+            ProgressPublisher(job.id).publish('status', status='succeeded', scan_id=scan_id, cached=True)
+            print(f"[API] Reused scan {scan_id} for {website_url}")
+            return job
+    
+    job = queue.active_for(key)
+    if job is not None:
+        print(f"[API] Joined running scan job {job.id} for {website_url}")
+        return job
+    
+    job = queue.enqueue(website_url, requested_by=current_user, domain_key=key)
+    if job.status == "queued" and job.attempts == 0:
+        ProgressPublisher(job.id).publish('status', status='queued')
+    print(f"[API] Queued scan job {job.id} for {job.website_url}")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ScanJobResponse)
+def get_scan_job(
+    job_id: int,
+    current_user: str = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Status of a queued scan"""
+    job = JobQueue(db).get(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    return job
+
+
+@router.post("/jobs/{job_id}/stream-token", response_model=ScanStreamTokenResponse)
+def create_scan_job_stream_token(
+    job_id: int,
+    current_user: str = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Short-lived token that opens this job's progress stream, for ?token= on /events"""
+    if not JobQueue(db).get(job_id):
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    return ScanStreamTokenResponse(
+        token=create_stream_token(current_user, job_id),
+        expires_in=settings.SCAN_STREAM_TOKEN_SECONDS
+    )
+
+
+def _poll_job_events(job_id: int, after_id: int) -> Tuple[List[Dict], Optional[str]]:
+    """New events after `after_id` plus the job's current status"""
+    db = SessionLocal()
     try:
-        print(f"\n{'='*80}")
-        print(f"[API] ULTIMATE SCAN INITIATED")
-        print(f"[API] URL: {scan_request.website_url}")
-        print(f"{'='*80}\n")
-        
-        # Step 1: Ultimate scraping
-        scraped = scrape_website_ultimate(
-            url=str(scan_request.website_url),
-            max_pages=10,
-            use_selenium=True
-        )
-        
-        if scraped.get('error'):
-            raise HTTPException(status_code=400, detail=scraped['error'])
-        
-        # Step 2: Ultimate extraction
-        contacts = extract_contacts_ultimate(scraped)
-        
-        # Step 3: LLM processing
-        structured_result = process_with_llm(
-            website_url=scraped['base_url'],
-            scraped_text=scraped['combined_text'],
-            extracted_contacts=contacts
-        )
-        
-        # Step 4: Save to database
-        db_service = DatabaseService(db)
-        scan = db_service.create_scan(
-            website_url=scraped['base_url'],
-            structured_data=structured_result
-        )
-        
-        print(f"\n{'='*80}")
-        print(f"[API] SCAN COMPLETE")
-        print(f"[API] Scan ID: {scan.id}")
-        print(f"[API] Emails: {len(structured_result.emails)}")
-        print(f"[API] Phones: {len(structured_result.phone_numbers)}")
-        print(f"{'='*80}\n")
-        
-        return ScanResponse(
-            id=scan.id,
-            website_url=scan.website_url,
-            company_name=scan.company_name,
-            summary=scan.summary,
-            structured_data=structured_result,
-            created_at=scan.created_at
-        )
-        
-    except Exception as e:
-        print(f"[API] ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Scan failed: {str(e)}")
+        events = [
+            {'id': e.id, 'type': e.type, 'data': e.data}
+            for e in events_after(db, job_id, after_id)
+        ]
+        job = JobQueue(db).get(job_id)
+        return events, job.status if job else None
+    finally:
+        db.close()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_scan_job_events(
+    job_id: int,
+    request: Request,
+    after: int = Query(0, ge=0, description="Only events after this id"),
+    current_user: str = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of a job's progress: status, phase, page and
+    contacts events (partial results before the LLM step), then `end`.
+    Reconnecting clients resume from Last-Event-ID.
+    """
+    events, status = await run_in_threadpool(_poll_job_events, job_id, 0)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    last_event_id = request.headers.get('last-event-id', '')
+    last_id = max(after, int(last_event_id) if last_event_id.isdigit() else 0)
+    
+    async def event_stream():
+        nonlocal last_id
+        idle = 0.0
+        finished_polls = 0
+        while not await request.is_disconnected():
+            events, status = await run_in_threadpool(_poll_job_events, job_id, last_id)
+            ended = False
+            for event in events:
+                last_id = event['id']
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {event['data']}\n\n"
+                if event['type'] == 'status' and json.loads(event['data']).get('status') in TERMINAL_STATUSES:
+                    ended = True
+            
+            # A finished job ends the stream once its final events are out
+            finished_polls = finished_polls + 1 if status in TERMINAL_STATUSES and not events else 0
+            if ended or finished_polls >= 2:
+                yield f"event: end\ndata: {json.dumps({'status': status})}\n\n"
+                return
+            
+            idle = 0.0 if events else idle + settings.SCAN_EVENTS_POLL_INTERVAL
+            if idle >= SSE_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(settings.SCAN_EVENTS_POLL_INTERVAL)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _batch_response(batch, counts: Dict[str, int], **extra) -> ScanBatchResponse:
+    response = ScanBatchResponse.model_validate(batch)
+    return response.model_copy(update={'counts': counts, **extra})
+
+
+@router.post("/batches", response_model=ScanBatchResponse, status_code=202)
+@limiter.limit("10/hour")
+def create_scan_batch(
+    request: Request,
+    file: UploadFile = File(..., description="CSV or NDJSON list of websites or domains"),
+    force_refresh: bool = Form(False, description="Rescan sites that have a recent result"),
+    current_user: str = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue a bulk scan of up to BATCH_MAX_ITEMS sites. Poll GET /scans/batches/{id}
+    for progress and download finished rows from /scans/batches/{id}/results.
+    """
+    try:
+        parsed = parse_batch_upload(file.file.read(), file.filename or '')
+    except BatchUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    service = BatchService(db)
+    batch = service.create_batch(
+        parsed['urls'], name=file.filename, requested_by=current_user, force_refresh=force_refresh
+    )
+    print(f"[API] Queued scan batch {batch.id} with {batch.total} sites")
+    return _batch_response(
+        batch,
+        {'pending': batch.total, 'running': 0, 'done': 0, 'failed': 0},
+        invalid=parsed['invalid'],
+        duplicates=parsed['duplicates']
+    )
+
+
+@router.get("/batches/{batch_id}", response_model=ScanBatchResponse)
+def get_scan_batch(
+    batch_id: int,
+    current_user: str = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Status of a bulk scan with item counts"""
+    service = BatchService(db)
+    batch = service.get_batch(batch_id)
+    
+    if not batch:
+        raise HTTPException(status_code=404, detail="Scan batch not found")
+    
+    return _batch_response(batch, service.item_counts(batch_id))
+
+
+@router.get("/batches/{batch_id}/results")
+def get_scan_batch_results(
+    batch_id: int,
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    current_user: str = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Finished rows of a bulk scan so far (done and failed), streamed"""
+    if not BatchService(db).get_batch(batch_id):
+        raise HTTPException(status_code=404, detail="Scan batch not found")
+    
+    def rows():
+        # The request's session is closed before the body is streamed
+        stream_db = SessionLocal()
+        try:
+            results = BatchService(stream_db).iter_results(batch_id)
+            yield from (results_as_csv(results) if format == "csv" else results_as_ndjson(results))
+        finally:
+            stream_db.close()
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="scan-batch-{batch_id}.{format}"'}
+    )
 
 
 @router.get("/", response_model=ScanListResponse)
@@ -186,7 +357,7 @@ def debug_ultimate(
             use_selenium=True
         )
         
-        contacts = extract_contacts_ultimate(scraped)
+        contacts = extract_contacts_in_pool(scraped)
         
         return {
             "scraping_results": {
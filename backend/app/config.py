@@ -23,6 +23,108 @@ class Settings(BaseSettings):
     LLM_MODEL_GEMINI: str = "models/gemini-2.5-pro"
     LLM_MODEL_OPENAI: str = "gpt-4o-mini"
     
+    # Background scan workers (python -m app.worker)
+    SCAN_WORKER_PROCESSES: int = 2  # Worker processes started by app.worker
+    SCAN_WORKER_POLL_INTERVAL: float = 1.0  # Seconds between queue polls when idle
+    SCAN_JOB_MAX_ATTEMPTS: int = 3  # Tries before a job is marked failed
+    SCAN_JOB_VISIBILITY_TIMEOUT: int = 300  # Lease seconds; renewed by heartbeats, reclaimed when it lapses
+    SCAN_JOB_RETRY_BACKOFF: float = 30.0  # Seconds before the first retry, doubled per attempt
+    SCAN_EVENTS_POLL_INTERVAL: float = 0.5  # Seconds between event polls per progress stream
+    SCAN_EVENTS_RETENTION_HOURS: int = 24  # Progress events older than this are pruned at startup
+    SCAN_STREAM_TOKEN_SECONDS: int = 120  # Lifetime of the job-scoped token used to open a progress stream
+    SCAN_CACHE_TTL_HOURS: float = 24.0  # A site's last scan is reused this long unless force_refresh (0 = always rescan)
+    SCAN_INCREMENTAL_ENABLED: bool = True  # Rescans re-extract only changed pages and skip the LLM if nothing it sees changed
+    
+    # Bulk scans (POST /scans/batches), run as a staged pipeline inside one worker
+    BATCH_MAX_ITEMS: int = 50000  # Sites accepted per upload
+    BATCH_CLAIM_CHUNK: int = 500  # Pending items moved to running per database round trip
+    BATCH_SCRAPE_WORKERS: int = 16  # Sites fetched concurrently (I/O bound)
+    BATCH_EXTRACT_WORKERS: int = 8  # Threads handing sites to the CPU pool for contact extraction
+    BATCH_LLM_WORKERS: int = 4  # LLM requests in flight
+    BATCH_STAGE_QUEUE_SIZE: int = 32  # Items buffered between stages before upstream waits
+    BATCH_MAX_PAGES: int = 10  # Pages crawled per site
+    BATCH_USE_SELENIUM: bool = False  # Browser rendering is too slow for bulk runs
+    
+    # Scraper concurrency & politeness
+    SCRAPER_MAX_CONCURRENCY: int = 8  # Pages in flight across all hosts
+    SCRAPER_PER_HOST_CONCURRENCY: int = 3  # Pages in flight per host
+    SCRAPER_MAX_PAGE_BYTES: int = 3 * 1024 * 1024  # Bytes read per page before truncating
+    SCRAPER_MAX_SCAN_BYTES: int = 25 * 1024 * 1024  # Bytes read per scan across all pages
+    SCRAPER_MAX_SCRIPT_BYTES: int = 2 * 1024 * 1024  # Bytes read per external script
+    
+    # Per-host rate governor shared by all fetches in a process (replaces fixed sleeps)
+    RATE_GOVERNOR_ENABLED: bool = True
+    RATE_GOVERNOR_INITIAL_RATE: float = 4.0  # Requests/second to a host not seen before
+    RATE_GOVERNOR_MIN_RATE: float = 0.2  # Floor after repeated throttling
+    RATE_GOVERNOR_MAX_RATE: float = 10.0  # Ceiling reached by fast, healthy hosts
+    RATE_GOVERNOR_INCREASE: float = 0.25  # Requests/second added per fast successful response
+    RATE_GOVERNOR_BURST: int = 2  # Requests that may start back to back
+    RATE_GOVERNOR_TARGET_LATENCY: float = 2.0  # Slower responses reduce the rate
+    RATE_GOVERNOR_MAX_WAIT: float = 30.0  # Longest a request waits for its slot (e.g. Retry-After) before failing
+    RATE_GOVERNOR_RETRIES: int = 2  # Retries of a 429/503 response after its Retry-After pause
+    
+    # Process pool for CPU-bound scan work (HTML parsing, contact extraction)
+    CPU_POOL_ENABLED: bool = True  # False runs parsing and extraction inline in the scanning thread
+    CPU_POOL_WORKERS: int = 0  # Processes per scanning process (0 = cores / SCAN_WORKER_PROCESSES)
+    CPU_POOL_MAX_PENDING: int = 64  # Tasks queued or running before submitters wait
+    CPU_POOL_MAX_TASKS_PER_CHILD: int = 1000  # Tasks served before a worker process is replaced (0 = never)
+    
+    # Shared HTTP connection pool
+    HTTP_POOL_MAX_HOSTS: int = 32  # Hosts with a cached keep-alive pool
+    HTTP_POOL_PER_HOST: int = 6  # Max open connections per host
+    HTTP_HTTP2_ENABLED: bool = False  # Requires httpx[http2]
+    
+    # On-disk HTTP response cache
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_PATH: str = "./cache/http_cache.db"
+    HTTP_CACHE_TTL: int = 86400  # Seconds a response is served without revalidation
+    HTTP_CACHE_MAX_MB: int = 512  # Size budget before LRU eviction
+    
+    # Raw page body store
+    PAGE_STORE_DIR: str = "./cache/pages"
+    PAGE_STORE_CODEC: str = "auto"  # "auto", "zstd" or "gzip"
+    PAGE_STORE_MAX_AGE_DAYS: int = 14  # Unused blobs older than this are pruned at startup
+    
+    # Cross-scan cache for external scripts
+    ASSET_CACHE_ENABLED: bool = True
+    ASSET_CACHE_PATH: str = "./cache/assets.db"
+    ASSET_CACHE_TTL: int = 7 * 86400  # Seconds a script URL's last body and verdict are reused
+    
+    # HTML parsing
+    HTML_PARSER_BACKEND: str = "auto"  # "auto", "lxml", "selectolax" or "bs4"
+    
+    # Selenium browser pool
+    SELENIUM_POOL_SIZE: int = 2  # Max concurrent browsers per process
+    SELENIUM_POOL_MAX_USES: int = 20  # Scans served before a browser is recycled
+    SELENIUM_POOL_ACQUIRE_TIMEOUT: float = 30.0  # Seconds to wait for a free browser
+    SELENIUM_POOL_PREWARM: int = 1  # Browsers launched at startup
+    RENDER_SCORE_THRESHOLD: int = 3  # Render classifier score that triggers a browser render
+    RENDER_PAGE_DEADLINE: float = 15.0  # Max seconds to spend rendering one page
+    RENDER_QUIET_MS: int = 500  # DOM/network quiet time that counts as settled
+    RENDER_BLOCK_RESOURCES: bool = True  # Block images/media/fonts/trackers in browser renders
+    RENDER_BLOCK_STYLESHEETS: bool = False  # Also block CSS (may break layout-driven lazy loading)
+    RENDER_MAX_PAGE_BYTES: int = 8 * 1024 * 1024  # Stop loading a rendered page past this weight
+    PLAYWRIGHT_MAX_PAGES: int = 4  # Tabs rendering at once in the shared Playwright browser
+    
+    # robots.txt / sitemap link discovery
+    LINK_DISCOVERY_ENABLED: bool = True
+    LINK_DISCOVERY_TTL: int = 21600  # Seconds a site's sitemap URLs are reused
+    LINK_DISCOVERY_CACHE_SITES: int = 256  # Sites kept in the in-process cache
+    LINK_DISCOVERY_MAX_URLS: int = 5000  # URLs kept per site
+    LINK_DISCOVERY_MAX_SITEMAPS: int = 6  # Sitemap files read per site (index + children)
+    LINK_DISCOVERY_MAX_SITEMAP_BYTES: int = 10 * 1024 * 1024  # Per sitemap, compressed and decompressed
+    LINK_DISCOVERY_WAIT: float = 20.0  # Max seconds a scan waits for discovery
+    SCRAPER_MAX_CRAWL_DELAY: float = 5.0  # Upper bound on a robots.txt Crawl-delay we honour
+    SCRAPER_STOP_ENABLED: bool = True  # Stop crawling once contacts are saturated
+    SCRAPER_STOP_FIELDS: str = "emails,phones,addresses,socials"  # Fields that must all be found to stop
+    SCRAPER_STOP_PATIENCE: int = 3  # Stop after this many pages in a row with no new contacts
+    SCRAPER_MAX_DEPTH: int = 2  # Link hops from the homepage the crawl may follow
+    
+    # Link prioritization from past scan yields
+    LINK_YIELD_PRIOR_WEIGHT: float = 3.0  # Pseudo-fetches given to the keyword prior
+    LINK_YIELD_MIN_EXPECTED: float = 0.1  # Links expected to yield less than this are not fetched
+    LINK_YIELD_EXPLORE_PAGES: int = 1  # Pages per scan fetched from links below the cut-off, so unknown paths gather stats
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
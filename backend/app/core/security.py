@@ -6,6 +6,9 @@ from app.config import get_settings
 
 settings = get_settings()
 
+# Scope of tokens that may only open a scan job's progress stream
+STREAM_SCOPE = "scan_events"
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -38,7 +41,28 @@ def verify_token(token: str) -> Optional[str]:
     """Verify JWT token and return username"""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        # Scoped tokens (progress streams) are not access tokens
+        if payload.get("scope"):
+            return None
         username: str = payload.get("sub")
         return username
     except JWTError:
         return None
+
+
+def create_stream_token(username: str, job_id: int) -> str:
+    """Short-lived token that only opens the progress stream of one scan job"""
+    expire = datetime.utcnow() + timedelta(seconds=settings.SCAN_STREAM_TOKEN_SECONDS)
+    to_encode = {"sub": username, "scope": STREAM_SCOPE, "job": job_id, "exp": expire}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def verify_stream_token(token: str, job_id: int) -> Optional[str]:
+    """Username of a stream token issued for `job_id`, or None"""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("scope") != STREAM_SCOPE or payload.get("job") != job_id:
+        return None
+    return payload.get("sub")
@@ -5,6 +5,15 @@ from app.config import get_settings
 from app.database import engine, Base
 from app.api.routes import auth, scans
 from app.middleware.rate_limit import limiter, rate_limit_exceeded_handler
+from app.services.http_client import close_http_client
+from app.services.http_cache import close_http_cache
+from app.services.asset_cache import close_asset_cache
+from app.services.browser_pool import close_browser_pool
+from app.services.cpu_pool import close_cpu_pool
+from app.services.page_store import get_page_store
+from app.services.playwright_renderer import close_playwright_renderer
+from app.services.progress import prune_events
+import threading
 
 settings = get_settings()
 
@@ -36,6 +45,24 @@ app.include_router(auth.router)
 app.include_router(scans.router)
 
 
+@app.on_event("startup")
+def startup():
+    """Prune old page blobs and progress events in the background (browsers are pre-launched by the workers)"""
+    threading.Thread(target=get_page_store().prune, daemon=True).start()
+    threading.Thread(target=prune_events, daemon=True).start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    """Release process-wide resources"""
+    close_http_client()
+    close_http_cache()
+    close_asset_cache()
+    close_browser_pool()
+    close_playwright_renderer()
+    close_cpu_pool()
+
+
 @app.get("/")
 @limiter.limit("10/minute")
 def root(request: Request):
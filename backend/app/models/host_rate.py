@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float
+from app.database import Base
+from datetime import datetime, timezone
+
+
+class HostRate(Base):
+    """Request pacing state of one host, shared by every API and worker process"""
+
+    __tablename__ = "host_rates"
+
+    host = Column(String, primary_key=True)
+    rate = Column(Float, nullable=False)  # Requests per second currently allowed
+    tat = Column(Float, nullable=False, default=0.0)  # GCRA theoretical arrival time (Unix time)
+    crawl_delay = Column(Float, nullable=False, default=0.0)  # robots.txt floor on the interval
+    blocked_until = Column(Float, nullable=False, default=0.0)  # Retry-After (Unix time)
+    latency = Column(Float, nullable=True)  # EWMA of response time, seconds
+    requests = Column(Integer, nullable=False, default=0)
+    throttled = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0)  # Bumped on every write, for conditional updates
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.database import Base
+from datetime import datetime, timezone
+
+
+class PageFingerprint(Base):
+    """Content fingerprint and extractor evidence of one page as of a site's last scan"""
+
+    __tablename__ = "page_fingerprints"
+    __table_args__ = (
+        Index("uq_page_fingerprints_domain_url", "domain_key", "url", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    domain_key = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    fingerprint = Column(String, nullable=False)
+    contacts = Column(Text, nullable=False)  # JSON: extractor evidence for this page alone
+    scan_id = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+
+class SiteFingerprint(Base):
+    """What the LLM saw for a site's last scan: merged contacts and main text"""
+
+    __tablename__ = "site_fingerprints"
+
+    domain_key = Column(String, primary_key=True)
+    scan_id = Column(Integer, nullable=False)
+    text_fingerprint = Column(String, nullable=False)
+    contacts_fingerprint = Column(String, nullable=False)
+    contacts = Column(Text, nullable=False)  # JSON: merged contacts
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
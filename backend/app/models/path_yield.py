@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database import Base
+from datetime import datetime, timezone
+
+
+class PathYieldStat(Base):
+    """How often pages matching a URL path pattern produced new contacts"""
+    
+    __tablename__ = "path_yield_stats"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    pattern = Column(String, nullable=False, unique=True, index=True)  # e.g. "/locations/*"
+    
+    fetches = Column(Integer, nullable=False, default=0)  # Pages fetched
+    hits = Column(Integer, nullable=False, default=0)  # Pages with at least one new contact
+    new_contacts = Column(Integer, nullable=False, default=0)  # New emails/phones/addresses found
+    
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
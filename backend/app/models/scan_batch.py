@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, Boolean
+from app.database import Base
+from datetime import datetime, timezone
+
+
+class ScanBatch(Base):
+    """A bulk scan of many sites, leased to one worker at a time (same lease columns as ScanJob)"""
+
+    __tablename__ = "scan_batches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=True)  # Uploaded file name
+    requested_by = Column(String, nullable=True)
+    total = Column(Integer, nullable=False, default=0)
+    force_refresh = Column(Boolean, nullable=False, default=False)  # Rescan sites with a fresh cached result
+
+    # queued -> running -> succeeded / failed
+    status = Column(String, nullable=False, default="queued", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    worker_id = Column(String, nullable=True)
+    error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+
+class ScanBatchItem(Base):
+    """One site of a bulk scan"""
+
+    __tablename__ = "scan_batch_items"
+    __table_args__ = (
+        Index("ix_scan_batch_items_batch_status", "batch_id", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(Integer, nullable=False)
+    website_url = Column(String, nullable=False)
+
+    # pending -> running -> done / failed (running items go back to pending if a worker dies)
+    status = Column(String, nullable=False, default="pending")
+    scan_id = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database import Base
+from datetime import datetime, timezone
+
+
+class ScanCacheEntry(Base):
+    """Latest scan of a site, reused by new requests while it is fresh"""
+
+    __tablename__ = "scan_cache"
+
+    domain_key = Column(String, primary_key=True)
+    scan_id = Column(Integer, nullable=False)
+    scanned_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
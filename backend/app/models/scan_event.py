@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from app.database import Base
+from datetime import datetime, timezone
+
+
+class ScanEvent(Base):
+    """A progress event published while a scan job runs (streamed to clients)"""
+    
+    __tablename__ = "scan_events"
+    
+    id = Column(Integer, primary_key=True, index=True)  # Also the event's stream position
+    job_id = Column(Integer, nullable=False, index=True)
+    type = Column(String, nullable=False)  # status, phase, page, contacts, ...
+    data = Column(Text, nullable=False)  # JSON object
+    
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
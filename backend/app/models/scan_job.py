@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, text
+from app.database import Base
+from datetime import datetime, timezone
+
+
+class ScanJob(Base):
+    """A queued scan, claimed and run by a background worker"""
+
+    __tablename__ = "scan_jobs"
+    __table_args__ = (
+        # At most one queued/running job per site: identical requests join it instead
+        Index(
+            "uq_scan_jobs_active_domain", "domain_key", unique=True,
+            sqlite_where=text("status IN ('queued', 'running')"),
+            postgresql_where=text("status IN ('queued', 'running')")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    website_url = Column(String, nullable=False)
+    domain_key = Column(String, nullable=True)  # Site the job scans (scan_cache.domain_key)
+    requested_by = Column(String, nullable=True)
+
+    # queued -> running -> succeeded / failed (running jobs go back to queued on retry)
+    status = Column(String, nullable=False, default="queued", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+
+    # Queued jobs wait until available_at; running jobs whose locked_until has
+    # passed are considered abandoned and may be claimed by another worker
+    available_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    worker_id = Column(String, nullable=True)
+
+    # Outcome
+    scan_id = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
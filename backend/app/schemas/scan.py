@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -9,6 +9,20 @@ class SocialMedia(BaseModel):
     url: str
 
 
+class ScanDelta(BaseModel):
+    """What changed since the site's previous scan (incremental rescans)"""
+    previous_scan_id: Optional[int] = None
+    pages_added: List[str] = []
+    pages_changed: List[str] = []
+    pages_removed: List[str] = []
+    pages_unchanged: int = 0
+    emails_added: List[str] = []
+    emails_removed: List[str] = []
+    phone_numbers_added: List[str] = []
+    phone_numbers_removed: List[str] = []
+    llm_skipped: bool = False  # Contacts and text were unchanged: previous result reused
+
+
 class ScanResult(BaseModel):
     """Structured output from LLM"""
     company_name: str
@@ -20,11 +34,13 @@ class ScanResult(BaseModel):
     addresses: List[str] = []
     notes: Optional[str] = None
     sources: List[str] = []
+    delta: Optional[ScanDelta] = None  # Set by the pipeline, not the LLM
 
 
 class ScanRequest(BaseModel):
     """Request to scan a website"""
     website_url: HttpUrl
+    force_refresh: bool = False  # Rescan even if a recent result exists
 
 
 class ScanResponse(BaseModel):
@@ -58,4 +74,47 @@ class ScanListResponse(BaseModel):
     scans: List[ScanListItem]
     page: int
     page_size: int
-    total_pages: int
\ No newline at end of file
+    total_pages: int
+
+
+class ScanJobResponse(BaseModel):
+    """Status of a queued scan"""
+    id: int
+    website_url: str
+    status: str  # queued, running, succeeded or failed
+    attempts: int
+    max_attempts: int
+    scan_id: Optional[int]
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class ScanStreamTokenResponse(BaseModel):
+    """Token for ?token= on a job's progress stream"""
+    token: str
+    expires_in: int  # Seconds the token can be used to open the stream
+
+
+class ScanBatchResponse(BaseModel):
+    """Status of a bulk scan"""
+    id: int
+    name: Optional[str]
+    status: str  # queued, running, succeeded or failed
+    total: int
+    force_refresh: bool
+    counts: Dict[str, int] = {}  # Items per status: pending, running, done, failed
+    invalid: Optional[int] = None  # Rows skipped at upload (not a URL or domain)
+    duplicates: Optional[int] = None  # Rows skipped at upload (already listed)
+    attempts: int
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
@@ -1,9 +1,15 @@
-import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from urllib.parse import urljoin, urlparse
-import time
 import re
+from app.config import get_settings
+from app.services.http_client import get_http_client, ByteBudget, HTML_CONTENT_TYPES
+from app.services.page_store import get_page_store
+from app.services.link_discovery import get_link_discovery
+from app.services.playwright_renderer import get_playwright_renderer
+from app.services.asset_cache import get_asset_cache, is_library_asset
+
+settings = get_settings()
 
 
 class AdvancedWebsiteScraper:
@@ -23,6 +29,9 @@ class AdvancedWebsiteScraper:
             'Upgrade-Insecure-Requests': '1'
         }
         self.scraped_pages = []
+        self.byte_budget = ByteBudget(settings.SCRAPER_MAX_SCAN_BYTES)
+        self.truncated_pages: List[Dict] = []
+        self.script_stats: Dict[str, int] = {'library': 0, 'cached': 0, 'fetched': 0, 'failed': 0}
     
     def _normalize_url(self, url: str) -> str:
         """Ensure URL has proper scheme"""
@@ -52,25 +61,28 @@ class AdvancedWebsiteScraper:
         
         # Strategy 2: Find and scrape contact-related pages
         contact_pages = self._find_contact_pages(homepage_data['links'])
+        if not contact_pages:
+            contact_pages = self._find_contact_pages(self._sitemap_links())
         print(f"[Scraper] Found {len(contact_pages)} potential contact pages")
         
+        # Thin pages are rendered afterwards, all at once in separate tabs
+        # Pacing between requests comes from the shared rate governor
         for page_url in contact_pages[:4]:  # Limit to 4 additional pages
-            time.sleep(0.5)  # Polite delay
-            page_data = self._scrape_page(page_url)
+            page_data = self._scrape_page(page_url, render=False)
             if page_data:
                 self.scraped_pages.append(page_data)
         
         if not contact_pages:
             fallback_urls = self._fallback_contact_urls()
             for page_url in fallback_urls[:4]:
-                time.sleep(0.5)
-                page_data = self._scrape_page(page_url)
+                page_data = self._scrape_page(page_url, render=False)
                 if page_data:
                     self.scraped_pages.append(page_data)
         
+        self._render_thin_pages()
+        
         # Combine all content
         combined_text = "\n\n".join([p['text'] for p in self.scraped_pages])
-        combined_html = "\n\n".join([p['html'] for p in self.scraped_pages])
         
         print(f"[Scraper] Scraped {len(self.scraped_pages)} pages, {len(combined_text)} chars")
         
@@ -78,15 +90,47 @@ class AdvancedWebsiteScraper:
             'base_url': self.base_url,
             'pages': self.scraped_pages,
             'combined_text': combined_text,
-            'combined_html': combined_html,
-            'pages_scraped': len(self.scraped_pages)
+            'pages_scraped': len(self.scraped_pages),
+            'metadata': {
+                'bytes_downloaded': self.byte_budget.used,
+                'byte_budget_exhausted': self.byte_budget.exhausted,
+                'truncated_pages': self.truncated_pages,
+                'scripts': self.script_stats,
+            }
         }
     
-    def _scrape_page(self, url: str) -> Optional[Dict]:
-        """Scrape single page with error handling"""
+    def _fetch(self, url: str, page_cap: int, accept_types=None):
+        """Fetch within the scan byte budget; returns None once the budget is spent"""
+        allowance = self.byte_budget.reserve(page_cap)
+        if allowance <= 0:
+            print(f"[Scraper] Scan byte budget exhausted, skipping {url}")
+            return None
+        used = 0
+        try:
+            response = get_http_client().get(
+                url,
+                headers=self.headers,
+                timeout=self.timeout,
+                max_bytes=allowance,
+                accept_types=accept_types
+            )
+            used = len(response.content)
+            if response.truncated:
+                self.truncated_pages.append({'url': url, 'bytes': used})
+            return response
+        finally:
+            self.byte_budget.settle(allowance, used)
+    
+    def _scrape_page(self, url: str, render: bool = True) -> Optional[Dict]:
+        """
+        Scrape single page with error handling. Pages with almost no text are
+        rendered with Playwright right away, or only flagged when render=False.
+        """
         try:
             print(f"[Scraper] Fetching {url}")
-            response = requests.get(url, headers=self.headers, timeout=self.timeout, allow_redirects=True)
+            response = self._fetch(url, settings.SCRAPER_MAX_PAGE_BYTES, HTML_CONTENT_TYPES)
+            if response is None:
+                return None
             response.raise_for_status()
             
             # Parse with lxml parser (faster and more robust)
@@ -102,6 +146,9 @@ class AdvancedWebsiteScraper:
                 except Exception:
                     pass
             
+            # External scripts are collected before <script> tags are removed
+            scripts = self._script_urls(url, soup)
+            
             # Remove unwanted elements but KEEP footer/header (they have contact info!)
             for tag in soup(['script', 'style', 'noscript', 'iframe', 'svg']):
                 tag.decompose()
@@ -112,59 +159,111 @@ class AdvancedWebsiteScraper:
                 text = text + "\n\n" + "\n\n".join(json_ld_texts)
             
             if len(text) < 200:
-                try:
-                    from playwright.sync_api import sync_playwright
-                    print("[Scraper] Rendering JS with Playwright")
-                    with sync_playwright() as p:
-                        browser = p.chromium.launch(headless=True)
-                        context = browser.new_context()
-                        page = context.new_page()
-                        page.goto(url, wait_until="networkidle")
-                        content = page.content()
-                        browser.close()
+                if not render:
+                    # Scripts are read once, from the rendered page (or the
+                    # static one if rendering fails), not on both passes
+                    page_data = self._page_from_soup(url, soup, title, text, [])
+                    page_data['needs_render'] = True
+                    page_data['static_scripts'] = scripts
+                    return page_data
+                print("[Scraper] Rendering JS with Playwright")
+                content = get_playwright_renderer().render(url, self.headers['User-Agent'])
+                if content:
                     soup = BeautifulSoup(content, 'lxml')
                     text = soup.get_text(separator=' ', strip=True)
-                except Exception as e:
-                    print(f"[Scraper] Playwright fallback failed: {e}")
-            
-            # Also get text from specific contact-relevant sections
-            contact_text = self._extract_contact_sections(soup)
-            if contact_text:
-                text = text + "\n\n" + contact_text
-            
-            scripts = []
-            for script in soup.find_all('script', src=True):
-                scripts.append(urljoin(url, script['src']))
-            js_texts = []
-            for s in scripts[:3]:
-                try:
-                    r = requests.get(s, headers=self.headers, timeout=self.timeout)
-                    if r.status_code == 200 and len(r.text) < 2_000_000:
-                        js_texts.append(r.text)
-                except Exception as e:
-                    pass
-            if js_texts:
-                text = text + "\n\n" + "\n\n".join(js_texts)
+                    scripts = self._script_urls(url, soup)
             
-            # Get all links
-            links = []
-            for link in soup.find_all('a', href=True):
-                full_url = urljoin(url, link['href'])
-                if self._is_same_domain(full_url) and full_url not in links:
-                    links.append(full_url)
-            
-            return {
-                'url': url,
-                'title': title,
-                'text': text,
-                'html': str(soup),
-                'links': links
-            }
+            return self._page_from_soup(url, soup, title, text, scripts)
             
         except Exception as e:
             print(f"[Scraper] Error scraping {url}: {e}")
             return None
     
+    def _render_thin_pages(self):
+        """Render every page flagged by _scrape_page(render=False) concurrently"""
+        thin = [i for i, page in enumerate(self.scraped_pages) if page.pop('needs_render', False)]
+        if not thin:
+            return
+        
+        print(f"[Scraper] Rendering {len(thin)} pages with Playwright")
+        urls = [self.scraped_pages[i]['url'] for i in thin]
+        contents = get_playwright_renderer().render_many(urls, self.headers['User-Agent'])
+        for i, content in zip(thin, contents):
+            page = self.scraped_pages[i]
+            static_scripts = page.pop('static_scripts', [])
+            if content:
+                try:
+                    soup = BeautifulSoup(content, 'lxml')
+                    text = soup.get_text(separator=' ', strip=True)
+                    scripts = self._script_urls(page['url'], soup)
+                    self.scraped_pages[i] = self._page_from_soup(page['url'], soup, page['title'], text, scripts)
+                    continue
+                except Exception as e:
+                    print(f"[Scraper] Error parsing rendered {page['url']}: {e}")
+            # Rendering failed: keep the static page, with the scripts it skipped
+            js_texts = self._script_texts(static_scripts)
+            if js_texts:
+                page['text'] = page['text'] + "\n\n" + "\n\n".join(js_texts)
+    
+    def _page_from_soup(self, url: str, soup: BeautifulSoup, title: str, text: str, scripts: List[str]) -> Dict:
+        """Page data from a parsed page and its visible text"""
+        # Also get text from specific contact-relevant sections
+        contact_text = self._extract_contact_sections(soup)
+        if contact_text:
+            text = text + "\n\n" + contact_text
+        
+        js_texts = self._script_texts(scripts)
+        if js_texts:
+            text = text + "\n\n" + "\n\n".join(js_texts)
+        
+        # Get all links
+        links = []
+        for link in soup.find_all('a', href=True):
+            full_url = urljoin(url, link['href'])
+            if self._is_same_domain(full_url) and full_url not in links:
+                links.append(full_url)
+        
+        return {
+            'url': url,
+            'title': title,
+            'text': text,
+            'html_ref': get_page_store().put(str(soup)),
+            'links': links
+        }
+    
+    def _fetch_script(self, url: str):
+        return self._fetch(url, settings.SCRAPER_MAX_SCRIPT_BYTES)
+    
+    def _script_urls(self, url: str, soup: BeautifulSoup) -> List[str]:
+        """External scripts of a page, minus known library bundles"""
+        scripts = []
+        for script in soup.find_all('script', src=True):
+            src = urljoin(url, script['src'])
+            if is_library_asset(src):
+                self.script_stats['library'] += 1
+            elif src not in scripts:
+                scripts.append(src)
+        return scripts
+    
+    def _script_texts(self, scripts: List[str]) -> List[str]:
+        """Text of the first scripts that may hold contact data"""
+        asset_cache = get_asset_cache()
+        js_texts = []
+        for src in scripts[:3]:
+            try:
+                if asset_cache is not None:
+                    text, source = asset_cache.get_script(src, self._fetch_script)
+                else:
+                    r = self._fetch_script(src)
+                    ok = r is not None and r.status_code == 200 and not r.truncated
+                    text, source = (r.text, 'fetched') if ok else (None, 'failed')
+            except Exception:
+                text, source = None, 'failed'
+            self.script_stats[source] += 1
+            if text:
+                js_texts.append(text)
+        return js_texts
+    
     def _extract_contact_sections(self, soup: BeautifulSoup) -> str:
         """Extract text from sections likely to contain contact info"""
         contact_text_parts = []
@@ -218,11 +317,21 @@ class AdvancedWebsiteScraper:
             'base_url': self.base_url,
             'pages': [],
             'combined_text': '',
-            'combined_html': '',
             'pages_scraped': 0,
             'error': reason
         }
 
+    def _sitemap_links(self) -> List[str]:
+        """Pages listed in the site's sitemaps that robots.txt lets us fetch"""
+        if not settings.LINK_DISCOVERY_ENABLED:
+            return []
+        try:
+            site_links = get_link_discovery().discover(self.base_url, self.headers)
+        except Exception as e:
+            print(f"[Scraper] Sitemap discovery failed: {e}")
+            return []
+        return [url for url in site_links.urls if site_links.is_allowed(url)]
+
     def _fallback_contact_urls(self) -> List[str]:
         """Build common contact/about pages when homepage has few links"""
         candidates = [
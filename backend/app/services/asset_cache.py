@@ -0,0 +1,189 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.config import get_settings
+from app.services.http_cache import cache_key
+from app.services.page_store import get_page_store
+from app.services.render_profile import BLOCKED_HOSTS
+
+settings = get_settings()
+
+# Hosts serving only shared library bundles, analytics and widget loaders
+LIBRARY_HOSTS = [
+    'code.jquery.com', 'ajax.googleapis.com', 'ajax.aspnetcdn.com', 'cdnjs.cloudflare.com',
+    'cdn.jsdelivr.net', 'unpkg.com', 'stackpath.bootstrapcdn.com', 'maxcdn.bootstrapcdn.com',
+    'polyfill.io', 'cdn.polyfill.io', 'www.gstatic.com', 'www.google.com/recaptcha',
+    'www.googletagmanager.com', 'www.google-analytics.com', 'connect.facebook.net',
+    'platform.twitter.com', 'static.hotjar.com', 'js.hs-scripts.com', 'js.hsforms.net',
+    'widget.intercom.io', 'js.stripe.com', 'static.cloudflareinsights.com', 'cdn.shopify.com/shopifycloud',
+] + BLOCKED_HOSTS
+
+# File names of well-known libraries (with optional version / .min / hash suffixes)
+LIBRARY_FILE_PATTERN = re.compile(
+    r'^(jquery([.-][\w.-]+)?|bootstrap|popper|react(-dom)?|angular|vue|lodash|underscore|moment|'
+    r'modernizr|polyfills?|core-js|swiper|slick|owl\.carousel|gsap|three|d3|chart|'
+    r'aos|lazysizes|isotope|masonry|fancybox|lightbox|select2|wp-embed|wp-emoji-release|'
+    r'gtag|gtm|analytics|recaptcha__\w+|webpack-runtime|runtime|framework|vendors?|chunk-vendors)'
+    r'([.-][\w.-]*)?\.js$',
+    re.IGNORECASE
+)
+
+# Cheap signals that a script may carry contact data worth keeping in page text
+CONTACT_SIGNAL_PATTERN = re.compile(
+    r'mailto:|tel:|'
+    r'\b[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9][A-Za-z0-9.-]*\.[A-Za-z]{2,}\b|'
+    r'\(?\b\d{3}\)?[-.\s]\d{3}[-.\s]\d{4}\b|'
+    r'\+\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{3,4}[-.\s]?\d{3,4}\b'
+)
+
+
+def is_library_asset(url: str) -> bool:
+    """True for scripts known to be shared libraries or trackers, which never hold a site's contacts"""
+    parts = urlsplit(url)
+    target = f"{parts.netloc}{parts.path}".lower()
+    if any(host in target for host in LIBRARY_HOSTS):
+        return True
+    filename = parts.path.rsplit('/', 1)[-1]
+    return bool(LIBRARY_FILE_PATTERN.match(filename))
+
+
+def may_hold_contacts(text: str) -> bool:
+    return CONTACT_SIGNAL_PATTERN.search(text) is not None
+
+
+class AssetCache:
+    """
+    Cross-scan cache for external scripts.
+
+    - Script URLs map to the SHA-256 of the body last fetched from them
+    - Each distinct body is checked once for contact data; the verdict is kept
+      per hash, so the same bundle served from many URLs is only scanned once
+    - Bodies with possible contacts are kept in the page store (same hash);
+      bodies without are dropped and never appended to page text again
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = path or settings.ASSET_CACHE_PATH
+        self.ttl = settings.ASSET_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS asset_urls (
+                key TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS asset_verdicts (
+                digest TEXT PRIMARY KEY,
+                has_contacts INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+
+    def _cached_digest(self, url: str) -> Optional[Tuple[str, bool]]:
+        """(digest, has_contacts) for a URL fetched within the TTL"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT u.digest, v.has_contacts FROM asset_urls u "
+                "JOIN asset_verdicts v ON v.digest = u.digest "
+                "WHERE u.key = ? AND u.stored_at >= ?",
+                (cache_key(url), time.time() - self.ttl)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], bool(row[1])
+
+    def record(self, url: str, body: bytes) -> Tuple[str, bool]:
+        """Remember which body a URL served and whether it may hold contacts"""
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT has_contacts FROM asset_verdicts WHERE digest = ?", (digest,)
+            ).fetchone()
+        if row is not None:
+            has_contacts = bool(row[0])
+        else:
+            has_contacts = may_hold_contacts(body.decode('utf-8', errors='replace'))
+
+        if has_contacts:
+            get_page_store().put(body)
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO asset_verdicts VALUES (?, ?, ?, ?)",
+                (digest, int(has_contacts), len(body), now)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO asset_urls VALUES (?, ?, ?)",
+                (cache_key(url), digest, now)
+            )
+        return digest, has_contacts
+
+    def get_script(self, url: str, fetch: Callable[[str], Optional[object]]) -> Tuple[Optional[str], str]:
+        """
+        Script text worth adding to page text, and where the answer came from
+        ('library', 'cached', 'fetched' or 'failed'). Text is None for library
+        bundles and scripts without contact signals. `fetch(url)` returns an
+        HTTP response or None.
+        """
+        if is_library_asset(url):
+            return None, 'library'
+
+        cached = self._cached_digest(url)
+        if cached is not None:
+            digest, has_contacts = cached
+            if not has_contacts:
+                return None, 'cached'
+            try:
+                return get_page_store().get_text(digest), 'cached'
+            except (OSError, RuntimeError):
+                pass  # blob pruned from the page store; fetch it again
+
+        response = fetch(url)
+        if response is None or response.status_code != 200 or response.truncated:
+            return None, 'failed'
+        _, has_contacts = self.record(url, response.content)
+        return (response.text if has_contacts else None), 'fetched'
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[AssetCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_asset_cache() -> Optional[AssetCache]:
+    """Shared asset cache, or None when disabled"""
+    global _cache
+    if not settings.ASSET_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AssetCache()
+    return _cache
+
+
+def close_asset_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
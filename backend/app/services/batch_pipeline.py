@@ -0,0 +1,262 @@
+import queue
+import threading
+import traceback
+from typing import Callable, Dict, List, Optional
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.scan_batch import ScanBatch, ScanBatchItem
+from app.services.ultimate_scraper import scrape_website_ultimate
+from app.services.ultimate_extractor import extract_contacts_in_pool
+from app.services.llm_services import process_with_llm
+from app.services.database_services import DatabaseService
+from app.services.link_yield import aggregate_page_yields
+from app.services.scan_cache import ScanCache, domain_key
+from app.services.incremental_scan import IncrementalScan
+
+settings = get_settings()
+
+# End-of-stream marker passed between stages
+_STOP = object()
+
+STAGE_LABELS = {'scrape': 'Scrape', 'extract': 'Extraction', 'llm': 'LLM'}
+
+
+class BatchPipeline:
+    """
+    Runs one bulk scan as a pipeline of bounded stages, each with its own
+    worker count, so slow LLM calls overlap with fetching the next sites:
+
+        feeder -> scrape (I/O) -> extract (CPU pool) -> LLM (network) -> writer
+
+    - The feeder moves pending items to running in chunks and stops feeding
+      when `stop` is set; items already in flight are finished
+    - Bounded queues between stages apply backpressure: a stage that falls
+      behind makes the ones before it wait instead of buffering the batch
+    - A single writer thread owns the database session for results
+    - A failing site fails only its item, never the batch
+    - Sites with a fresh cached scan skip the stages and reuse it, unless
+      the batch was uploaded with force_refresh
+    """
+
+    def __init__(self, batch_id: int, worker_id: str, stop: threading.Event):
+        self.batch_id = batch_id
+        self.worker_id = worker_id
+        self.stop = stop
+        self.counts = {'done': 0, 'failed': 0}
+        self.yield_model = None
+        self.force_refresh = False
+
+        size = settings.BATCH_STAGE_QUEUE_SIZE
+        self.scrape_queue: queue.Queue = queue.Queue(size)
+        self.extract_queue: queue.Queue = queue.Queue(size)
+        self.llm_queue: queue.Queue = queue.Queue(size)
+        self.write_queue: queue.Queue = queue.Queue(size)
+
+    def run(self) -> Dict[str, int]:
+        """Process the batch's pending items; returns counts of items finished by this run"""
+        db = SessionLocal()
+        try:
+            db_service = DatabaseService(db)
+            self.yield_model = db_service.load_yield_model()
+            self.force_refresh = db.query(ScanBatch.force_refresh).filter(ScanBatch.id == self.batch_id).scalar() or False
+            # Items a dead worker left running have no result: run them again
+            self._set_status(db, ScanBatchItem.status == "running", "pending")
+        finally:
+            db.close()
+
+        stages = [
+            ('scrape', self._scrape, self.scrape_queue, self.extract_queue,
+             settings.BATCH_SCRAPE_WORKERS, settings.BATCH_EXTRACT_WORKERS),
+            ('extract', self._extract, self.extract_queue, self.llm_queue,
+             settings.BATCH_EXTRACT_WORKERS, settings.BATCH_LLM_WORKERS),
+            ('llm', self._llm, self.llm_queue, self.write_queue,
+             settings.BATCH_LLM_WORKERS, 1),
+        ]
+        threads = [
+            threading.Thread(target=self._feed, name=f"batch-{self.batch_id}-feed", daemon=True),
+            threading.Thread(target=self._write, name=f"batch-{self.batch_id}-write", daemon=True),
+        ]
+        for name, handler, inbox, outbox, workers, downstream in stages:
+            remaining = [max(1, workers)]
+            lock = threading.Lock()
+            for i in range(max(1, workers)):
+                threads.append(threading.Thread(
+                    target=self._stage_worker,
+                    args=(name, handler, inbox, outbox, remaining, lock, max(1, downstream)),
+                    name=f"batch-{self.batch_id}-{name}-{i}",
+                    daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"[Batch {self.batch_id}] Run finished: {self.counts['done']} done, {self.counts['failed']} failed")
+        return dict(self.counts)
+
+    def _set_status(self, db, condition, status: str, item_ids: Optional[List[int]] = None):
+        query = db.query(ScanBatchItem).filter(ScanBatchItem.batch_id == self.batch_id, condition)
+        if item_ids is not None:
+            query = query.filter(ScanBatchItem.id.in_(item_ids))
+        query.update({ScanBatchItem.status: status}, synchronize_session=False)
+        db.commit()
+
+    # ---- Stages ----
+
+    def _feed(self):
+        """Claim pending items chunk by chunk and hand them to the scrape stage"""
+        db = SessionLocal()
+        cache = ScanCache(db)
+        try:
+            while not self.stop.is_set():
+                chunk = (
+                    db.query(ScanBatchItem.id, ScanBatchItem.website_url)
+                    .filter(ScanBatchItem.batch_id == self.batch_id, ScanBatchItem.status == "pending")
+                    .order_by(ScanBatchItem.id)
+                    .limit(settings.BATCH_CLAIM_CHUNK)
+                    .all()
+                )
+                if not chunk:
+                    break
+                self._set_status(db, ScanBatchItem.status == "pending", "running", [item_id for item_id, _ in chunk])
+                cached = {} if self.force_refresh else cache.lookup_many(domain_key(url) for _, url in chunk)
+
+                for position, item in enumerate(chunk):
+                    if self.stop.is_set():
+                        # Not started yet: leave them for the next run
+                        unfed = [item_id for item_id, _ in chunk[position:]]
+                        self._set_status(db, ScanBatchItem.status == "running", "pending", unfed)
+                        print(f"[Batch {self.batch_id}] Stopping: {len(unfed)} items returned to pending")
+                        break
+                    scan_id = cached.get(domain_key(item[1]))
+                    if scan_id is not None:
+                        self.write_queue.put(('cached', item[0], item[1], scan_id))
+                    else:
+                        self.scrape_queue.put(item)
+        except Exception as e:
+            db.rollback()
+            traceback.print_exc()
+            print(f"[Batch {self.batch_id}] Feeder failed: {e}")
+        finally:
+            db.close()
+            for _ in range(max(1, settings.BATCH_SCRAPE_WORKERS)):
+                self.scrape_queue.put(_STOP)
+
+    def _stage_worker(
+        self,
+        name: str,
+        handler: Callable,
+        inbox: queue.Queue,
+        outbox: queue.Queue,
+        remaining: List[int],
+        lock: threading.Lock,
+        downstream: int
+    ):
+        """Run `handler` on each item of `inbox`; the stage's last worker to exit stops the next stage"""
+        try:
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    break
+                item_id, website_url = item[0], item[1]
+                try:
+                    outbox.put(handler(*item))
+                except Exception as e:
+                    print(f"[Batch {self.batch_id}] {name} failed for {website_url}: {e}")
+                    self.write_queue.put(('failed', item_id, website_url, f"{STAGE_LABELS[name]} failed: {e}"))
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(downstream):
+                    outbox.put(_STOP)
+
+    def _scrape(self, item_id: int, website_url: str):
+        scraped = scrape_website_ultimate(
+            url=website_url,
+            max_pages=settings.BATCH_MAX_PAGES,
+            use_selenium=settings.BATCH_USE_SELENIUM,
+            yield_model=self.yield_model
+        )
+        if scraped.get('error'):
+            raise ValueError(scraped['error'])
+        return item_id, website_url, scraped
+
+    def _extract(self, item_id: int, website_url: str, scraped: Dict):
+        if not settings.SCAN_INCREMENTAL_ENABLED:
+            return item_id, website_url, scraped, extract_contacts_in_pool(scraped), None
+        db = SessionLocal()
+        try:
+            incremental = IncrementalScan.load(db, website_url)
+        finally:
+            db.close()
+        return item_id, website_url, scraped, incremental.extract(scraped), incremental
+
+    def _llm(self, item_id: int, website_url: str, scraped: Dict, contacts: Dict, incremental: Optional[IncrementalScan]):
+        structured_result = incremental.reusable_result() if incremental else None
+        llm_skipped = structured_result is not None
+        if structured_result is None:
+            structured_result = process_with_llm(
+                website_url=scraped['base_url'],
+                scraped_text=scraped['combined_text'],
+                extracted_contacts=contacts
+            )
+        if incremental:
+            structured_result = incremental.finish(structured_result, llm_skipped=llm_skipped)
+        return 'done', item_id, website_url, scraped, structured_result, incremental
+
+    def _write(self):
+        """Save results and item outcomes; the only thread writing them to the database"""
+        db = SessionLocal()
+        db_service = DatabaseService(db)
+        cache = ScanCache(db)
+        try:
+            while True:
+                result = self.write_queue.get()
+                if result is _STOP:
+                    break
+                outcome, item_id, website_url = result[0], result[1], result[2]
+                values = {ScanBatchItem.status: outcome}
+                try:
+                    if outcome == 'cached':
+                        outcome = 'done'
+                        values = {ScanBatchItem.status: outcome, ScanBatchItem.scan_id: result[3]}
+                    elif outcome == 'done':
+                        scraped, structured_result, incremental = result[3], result[4], result[5]
+                        try:
+                            db_service.record_path_yields(aggregate_page_yields(scraped['metadata']['page_yields']))
+                        except Exception as e:
+                            db.rollback()
+                            print(f"[Batch {self.batch_id}] Could not record link yields: {e}")
+                        scan = db_service.create_scan(
+                            website_url=scraped['base_url'],
+                            structured_data=structured_result
+                        )
+                        cache.store(domain_key(website_url), scan.id)
+                        if incremental:
+                            incremental.record(db, scan.id)
+                        values[ScanBatchItem.scan_id] = scan.id
+                    else:
+                        values[ScanBatchItem.error] = result[3][:2000]
+
+                    db.query(ScanBatchItem).filter(ScanBatchItem.id == item_id).update(values, synchronize_session=False)
+                    db.commit()
+                    self.counts[outcome] += 1
+                except Exception as e:
+                    db.rollback()
+                    traceback.print_exc()
+                    print(f"[Batch {self.batch_id}] Could not save result for {website_url}: {e}")
+                    try:
+                        db.query(ScanBatchItem).filter(ScanBatchItem.id == item_id).update(
+                            {ScanBatchItem.status: 'failed', ScanBatchItem.error: f"Save failed: {e}"[:2000]},
+                            synchronize_session=False
+                        )
+                        db.commit()
+                        self.counts['failed'] += 1
+                    except Exception:
+                        db.rollback()
+        finally:
+            db.close()
@@ -0,0 +1,208 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.scan import Scan
+from app.models.scan_batch import ScanBatch, ScanBatchItem
+from app.services.scan_cache import domain_key
+
+settings = get_settings()
+
+# Header names accepted for the site column of a CSV upload / key of an NDJSON object
+URL_FIELDS = ('website_url', 'url', 'website', 'domain', 'site', 'homepage')
+
+# Columns of the CSV result download
+RESULT_COLUMNS = [
+    'website_url', 'status', 'scan_id', 'company_name', 'emails', 'phone_numbers',
+    'socials', 'addresses', 'summary', 'error'
+]
+
+INSERT_CHUNK = 1000
+
+
+class BatchUploadError(ValueError):
+    """The uploaded file could not be turned into a list of sites"""
+
+
+def normalize_site_url(raw: str) -> Optional[str]:
+    """A fetchable homepage URL for a domain or URL cell, or None if it is not one"""
+    value = (raw or '').strip().strip('"\'')
+    if not value or value.startswith('#'):
+        return None
+    if '://' not in value:
+        value = 'https://' + value
+    parts = urlsplit(value)
+    host = (parts.hostname or '').lower()
+    if parts.scheme not in ('http', 'https') or '.' not in host or ' ' in host:
+        return None
+    return value
+
+
+def _csv_values(text: str) -> Iterator[str]:
+    rows = csv.reader(io.StringIO(text))
+    first = next(rows, None)
+    if first is None:
+        return
+    header = [cell.strip().lower() for cell in first]
+    column = next((header.index(name) for name in URL_FIELDS if name in header), None)
+    if column is None:
+        # No recognizable header: the first row is data, sites are in the first column
+        column = 0
+        yield first[0] if first else ''
+    for row in rows:
+        if len(row) > column:
+            yield row[column]
+
+
+def _ndjson_values(text: str) -> Iterator[str]:
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            raise BatchUploadError(f"Line {number} is not valid JSON")
+        if isinstance(record, str):
+            yield record
+        elif isinstance(record, dict):
+            yield next((str(record[name]) for name in URL_FIELDS if record.get(name)), '')
+
+
+def parse_batch_upload(content: bytes, filename: str = '', max_items: Optional[int] = None) -> Dict:
+    """
+    Sites listed in a CSV (one per row, `website_url`/`url`/`domain` column or
+    the first column) or NDJSON upload (objects with one of those keys, or bare
+    strings). A site listed more than once (same domain_key) is kept once.
+    Returns {'urls': [...], 'invalid': n, 'duplicates': n}.
+    """
+    max_items = max_items or settings.BATCH_MAX_ITEMS
+    text = content.decode('utf-8-sig', errors='replace')
+    is_ndjson = filename.lower().endswith(('.ndjson', '.jsonl')) or text.lstrip()[:1] in ('{', '"')
+    values = _ndjson_values(text) if is_ndjson else _csv_values(text)
+
+    urls: List[str] = []
+    seen = set()
+    invalid = duplicates = 0
+    for value in values:
+        url = normalize_site_url(value)
+        if url is None:
+            invalid += 1
+            continue
+        key = domain_key(url)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        urls.append(url)
+        if len(urls) > max_items:
+            raise BatchUploadError(f"Too many sites: at most {max_items} per batch")
+
+    if not urls:
+        raise BatchUploadError("No valid website URLs or domains found")
+    return {'urls': urls, 'invalid': invalid, 'duplicates': duplicates}
+
+
+class BatchService:
+    """Creating bulk scans and reading their progress and results"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_batch(
+        self,
+        urls: List[str],
+        name: Optional[str] = None,
+        requested_by: Optional[str] = None,
+        force_refresh: bool = False
+    ) -> ScanBatch:
+        batch = ScanBatch(
+            name=name,
+            requested_by=requested_by,
+            force_refresh=force_refresh,
+            total=len(urls),
+            status="queued",
+            attempts=0,
+            max_attempts=settings.SCAN_JOB_MAX_ATTEMPTS,
+            available_at=datetime.now(timezone.utc)
+        )
+        self.db.add(batch)
+        self.db.flush()
+
+        for start in range(0, len(urls), INSERT_CHUNK):
+            self.db.execute(insert(ScanBatchItem), [
+                {'batch_id': batch.id, 'website_url': url, 'status': 'pending'}
+                for url in urls[start:start + INSERT_CHUNK]
+            ])
+        self.db.commit()
+        self.db.refresh(batch)
+        return batch
+
+    def get_batch(self, batch_id: int) -> Optional[ScanBatch]:
+        return self.db.query(ScanBatch).filter(ScanBatch.id == batch_id).first()
+
+    def item_counts(self, batch_id: int) -> Dict[str, int]:
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        rows = (
+            self.db.query(ScanBatchItem.status, func.count(ScanBatchItem.id))
+            .filter(ScanBatchItem.batch_id == batch_id)
+            .group_by(ScanBatchItem.status)
+            .all()
+        )
+        for status, count in rows:
+            counts[status] = count
+        return counts
+
+    def iter_results(self, batch_id: int) -> Iterator[Dict]:
+        """Finished items with their scan results, in upload order"""
+        rows = (
+            self.db.query(ScanBatchItem, Scan)
+            .outerjoin(Scan, Scan.id == ScanBatchItem.scan_id)
+            .filter(ScanBatchItem.batch_id == batch_id, ScanBatchItem.status.in_(['done', 'failed']))
+            .order_by(ScanBatchItem.id)
+            .yield_per(500)
+        )
+        for item, scan in rows:
+            data = json.loads(scan.structured_data) if scan is not None else {}
+            yield {
+                'website_url': item.website_url,
+                'status': item.status,
+                'scan_id': item.scan_id,
+                'company_name': data.get('company_name'),
+                'emails': data.get('emails', []),
+                'phone_numbers': data.get('phone_numbers', []),
+                'socials': data.get('socials', []),
+                'addresses': data.get('addresses', []),
+                'summary': data.get('summary'),
+                'error': item.error,
+            }
+
+
+def results_as_csv(results: Iterator[Dict]) -> Iterator[str]:
+    """CSV lines for iter_results(); list fields are joined with '; '"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=RESULT_COLUMNS)
+    writer.writeheader()
+    for result in results:
+        row = dict(result)
+        row['socials'] = [social.get('url', '') for social in row['socials']]
+        for field in ('emails', 'phone_numbers', 'socials', 'addresses'):
+            row[field] = '; '.join(row[field])
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+def results_as_ndjson(results: Iterator[Dict]) -> Iterator[str]:
+    for result in results:
+        yield json.dumps(result, default=str) + "\n"
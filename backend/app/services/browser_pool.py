@@ -0,0 +1,263 @@
+import shutil
+import tempfile
+import threading
+import time
+from typing import List, Optional, Set
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from app.config import get_settings
+from app.services.page_readiness import INSTRUMENT_JS
+from app.services.render_profile import apply_lightweight_options, install_request_blocking
+from app.services.rate_governor import get_rate_governor
+
+settings = get_settings()
+
+HIDE_WEBDRIVER_JS = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+
+class PooledBrowser:
+    """
+    A pre-launched headless Chrome owned by the pool and lent to one scan at a time
+    """
+
+    def __init__(self, driver: webdriver.Chrome, profile_dir: str):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.uses = 0
+        self.created_at = time.time()
+        self.visited_origins: Set[str] = set()
+
+    def open(self, url: str):
+        """
+        Navigate (paced by the rate governor) and remember the origin so its
+        storage is wiped on release
+        """
+        parsed = urlparse(url)
+        if parsed.scheme and parsed.netloc:
+            self.visited_origins.add(f"{parsed.scheme}://{parsed.netloc}")
+        governor = get_rate_governor()
+        if governor is None:
+            self.driver.get(url)
+            return
+        governor.acquire(url)
+        started = time.monotonic()
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            # Slow, not failed: the latency alone lowers the host's rate
+            governor.record(url, 200, time.monotonic() - started)
+            raise
+        except Exception:
+            governor.record(url, None, time.monotonic() - started)
+            raise
+        # WebDriver exposes no status code; only the load time is observed
+        governor.record(url, 200, time.monotonic() - started)
+
+
+class BrowserPool:
+    """
+    Bounded pool of warm headless Chrome instances.
+
+    - Browsers are launched once and reused across scans
+    - Each browser gets its own throwaway profile directory
+    - On release, cookies, cache and per-origin storage are cleared so the next
+      scan starts from a clean context
+    - Browsers failing a health check or reaching max_uses are recycled
+    """
+
+    def __init__(self, size: Optional[int] = None, max_uses: Optional[int] = None, acquire_timeout: Optional[float] = None):
+        self.size = max(1, size or settings.SELENIUM_POOL_SIZE)
+        self.max_uses = max(1, max_uses or settings.SELENIUM_POOL_MAX_USES)
+        self.acquire_timeout = settings.SELENIUM_POOL_ACQUIRE_TIMEOUT if acquire_timeout is None else acquire_timeout
+        self._idle: List[PooledBrowser] = []
+        self._total = 0  # idle + lent out + launching
+        self._closed = False
+        self._cond = threading.Condition()
+        self._driver_path: Optional[str] = None
+        self._driver_path_lock = threading.Lock()
+
+    def _resolve_driver_path(self) -> str:
+        """Resolve chromedriver once per process instead of once per scan"""
+        with self._driver_path_lock:
+            if self._driver_path is None:
+                self._driver_path = ChromeDriverManager().install()
+            return self._driver_path
+
+    def _launch(self) -> PooledBrowser:
+        profile_dir = tempfile.mkdtemp(prefix='scraper-chrome-')
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        apply_lightweight_options(chrome_options)
+
+        try:
+            service = Service(self._resolve_driver_path())
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            # Hide webdriver and track page readiness on every document, not just the current one
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': HIDE_WEBDRIVER_JS})
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INSTRUMENT_JS})
+            # Only the DOM matters: skip images, media, fonts and trackers
+            install_request_blocking(driver)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+
+        print(f"[BrowserPool] Launched browser ({profile_dir})")
+        return PooledBrowser(driver, profile_dir)
+
+    def _is_healthy(self, browser: PooledBrowser) -> bool:
+        try:
+            return browser.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _destroy(self, browser: PooledBrowser):
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+        shutil.rmtree(browser.profile_dir, ignore_errors=True)
+
+    def _reset(self, browser: PooledBrowser):
+        """Wipe everything the previous scan left behind"""
+        driver = browser.driver
+        driver.get('about:blank')
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        for origin in browser.visited_origins:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        browser.visited_origins.clear()
+
+    def warm(self, count: int = 1):
+        """Pre-launch browsers so the first scans don't pay the cold start"""
+        for _ in range(count):
+            with self._cond:
+                if self._closed or self._total >= self.size:
+                    return
+                self._total += 1
+            try:
+                browser = self._launch()
+            except Exception as e:
+                print(f"[BrowserPool] Warm-up launch failed: {e}")
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                return
+            with self._cond:
+                self._idle.append(browser)
+                self._cond.notify()
+
+    def acquire(self, user_agent: Optional[str] = None) -> Optional[PooledBrowser]:
+        """
+        Borrow a healthy browser, launching one if the pool has room.
+        Returns None if none becomes available within acquire_timeout.
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            browser = None
+            launch = False
+            with self._cond:
+                while not self._idle and self._total >= self.size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        print("[BrowserPool] Timed out waiting for a browser")
+                        return None
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return None
+                if self._idle:
+                    browser = self._idle.pop()
+                else:
+                    self._total += 1
+                    launch = True
+
+            if launch:
+                try:
+                    browser = self._launch()
+                except Exception as e:
+                    print(f"[BrowserPool] Launch failed: {e}")
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    return None
+            elif not self._is_healthy(browser):
+                print("[BrowserPool] Discarding unhealthy browser")
+                self._discard(browser)
+                continue
+
+            if user_agent:
+                try:
+                    browser.driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent})
+                except Exception:
+                    pass
+            return browser
+
+    def release(self, browser: PooledBrowser):
+        """Return a browser, recycling it if it is worn out or broken"""
+        browser.uses += 1
+        recycle = self._closed or browser.uses >= self.max_uses
+        if not recycle:
+            try:
+                self._reset(browser)
+            except Exception as e:
+                print(f"[BrowserPool] Reset failed, recycling browser: {e}")
+                recycle = True
+
+        if recycle:
+            self._discard(browser)
+            return
+
+        with self._cond:
+            self._idle.append(browser)
+            self._cond.notify()
+
+    def _discard(self, browser: PooledBrowser):
+        self._destroy(browser)
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for browser in idle:
+            self._destroy(browser)
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Shared browser pool for the whole process"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+    return _pool
+
+
+def close_browser_pool():
+    """Quit all pooled browsers (called on app shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,199 @@
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from app.config import get_settings
+from app.services.progress import current_progress, progress_scope
+
+settings = get_settings()
+
+# True inside pool workers, where tasks always run inline
+_in_pool_worker = False
+
+
+def _init_worker():
+    """Pool worker start-up: import the parsing and extraction stack once, before the first task"""
+    global _in_pool_worker
+    _in_pool_worker = True
+    import app.services.page_model  # noqa: F401
+    import app.services.ultimate_extractor  # noqa: F401
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+class _UnpicklableResult(Exception):
+    """A task's return value could not be pickled back to the caller"""
+
+
+# What pickle raises for objects it cannot serialize (locks, parse trees, generators)
+_PICKLE_ERRORS = (pickle.PicklingError, TypeError, AttributeError)
+
+
+def _call(payload: bytes, job_id: Optional[int]) -> bytes:
+    """
+    Run a pickled `(fn, args)` task in a worker, publishing its progress events
+    to the submitting scan's job. The result is pickled here so a failure to
+    serialize it is told apart from an exception raised by the task.
+    """
+    fn, args = pickle.loads(payload)
+    if job_id is None:
+        result = fn(*args)
+    else:
+        with progress_scope(job_id):
+            result = fn(*args)
+    try:
+        return pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+    except _PICKLE_ERRORS as e:
+        raise _UnpicklableResult(repr(e))
+
+
+def default_workers() -> int:
+    """The host's cores, split across the scan worker processes that each own a pool"""
+    return max(1, (os.cpu_count() or 1) // max(1, settings.SCAN_WORKER_PROCESSES))
+
+
+class CpuPool:
+    """
+    Warm process pool for the CPU-bound part of a scan (HTML parsing, contact
+    extraction), so it uses all cores instead of queueing behind one
+    process's GIL. Fetching stays on the caller's threads and event loops;
+    only picklable payloads (HTML strings, page dicts, ParsedPage) cross over.
+
+    - Workers are spawned, not forked (callers hold threads, sockets and
+      browser sessions), import the parsing stack up front and are recycled
+      after CPU_POOL_MAX_TASKS_PER_CHILD tasks
+    - At most CPU_POOL_MAX_PENDING tasks are queued or running; callers past
+      that block, which holds back fetching instead of buffering pages
+    - Progress events published by a task go to the caller's scan job
+    - If the pool breaks (a worker crashed), it is restarted and the failed
+      call runs inline; so do calls whose arguments or result cannot be
+      pickled. Exceptions raised by the task itself propagate to the caller
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = workers or settings.CPU_POOL_WORKERS or default_workers()
+        self._slots = threading.BoundedSemaphore(max(1, max_pending or settings.CPU_POOL_MAX_PENDING))
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._closed = False
+        self._start()
+
+    def _start(self):
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            max_tasks_per_child=settings.CPU_POOL_MAX_TASKS_PER_CHILD or None
+        )
+        # Start every worker now rather than on the first scan
+        for _ in range(self.workers):
+            self._executor.submit(_ready)
+        print(f"[CpuPool] Started {self.workers} worker processes")
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._closed or self._executor is not broken:
+                return
+            print("[CpuPool] Pool broke, restarting it")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._start()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """
+        Queue `fn(*args)` (a module-level function) on the pool; blocks while
+        the pool is full. A call whose arguments cannot be pickled is not
+        queued, and runs inline when its result is asked for.
+        """
+        try:
+            payload = pickle.dumps((fn, args), pickle.HIGHEST_PROTOCOL)
+        except _PICKLE_ERRORS as e:
+            future = Future()
+            future.set_exception(_UnpicklableResult(f"arguments: {e!r}"))
+            future.executor = None
+            return future
+
+        self._slots.acquire()
+        try:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("CPU pool is closed")
+                future = self._executor.submit(_call, payload, current_progress().job_id)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        future.executor = self._executor
+        return future
+
+    def result(self, future: Future, fn: Callable, *args):
+        """Result of a submitted task, re-run inline if the pool could not run it"""
+        try:
+            return pickle.loads(future.result())
+        except (BrokenProcessPool, _UnpicklableResult) as e:
+            print(f"[CpuPool] {getattr(fn, '__qualname__', fn)} could not run in the pool ({e}), running inline")
+            if isinstance(e, BrokenProcessPool):
+                self._restart(future.executor)
+            return fn(*args)
+
+    def run(self, fn: Callable, *args):
+        """`fn(*args)` in a worker process; blocks until it returns"""
+        return self.result(self.submit(fn, *args), fn, *args)
+
+    def map(self, fn: Callable, arg_tuples: Iterable[Tuple]) -> List:
+        """`fn(*args)` for each tuple, run in parallel; results in input order"""
+        submitted = [(self.submit(fn, *args), args) for args in arg_tuples]
+        return [self.result(future, fn, *args) for future, args in submitted]
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_pool: Optional[CpuPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_cpu_pool() -> Optional[CpuPool]:
+    """Shared pool for the process (None if disabled, or when called inside a pool worker)"""
+    global _pool
+    if not settings.CPU_POOL_ENABLED or _in_pool_worker:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = CpuPool()
+    return _pool
+
+
+def run_cpu(fn: Callable, *args):
+    """`fn(*args)` on the shared pool, or inline when there is none"""
+    pool = get_cpu_pool()
+    if pool is None:
+        return fn(*args)
+    return pool.run(fn, *args)
+
+
+def map_cpu(fn: Callable, arg_tuples: Iterable[Tuple]) -> List:
+    """`fn(*args)` for each tuple on the shared pool (inline when there is none); results in input order"""
+    pool = get_cpu_pool()
+    if pool is None:
+        return [fn(*args) for args in arg_tuples]
+    return pool.map(fn, arg_tuples)
+
+
+def close_cpu_pool():
+    """Stop the pool's worker processes (called on shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
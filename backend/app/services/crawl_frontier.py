@@ -0,0 +1,170 @@
+import heapq
+import itertools
+import posixpath
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'twclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'hsctatracking',
+    'ref', 'ref_src', 'source', 'spm', 'si', 'trk',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'vero_')
+
+# Directory index documents that serve the same page as the directory
+INDEX_DOCUMENTS = {'index.html', 'index.htm', 'index.php', 'default.aspx', 'default.asp'}
+
+
+def site_host(url: str) -> str:
+    """Hostname without a leading www., so apex and www. count as one site"""
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL for fetching: lowercase scheme and host, no default port,
+    no fragment, no tracking parameters, sorted query, resolved dot segments,
+    no index document and no trailing slash (except for the root).
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'https'
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or '/'
+    while '//' in path:
+        path = path.replace('//', '/')
+    path = posixpath.normpath(path) if path not in ('', '/') else '/'
+    if not path.startswith('/'):
+        path = '/' + path
+    head, _, last = path.rpartition('/')
+    if last.lower() in INDEX_DOCUMENTS:
+        path = head or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def url_key(url: str) -> str:
+    """Dedup key: canonical URL with http/https and www./apex folded together"""
+    parts = urlsplit(canonicalize_url(url))
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    return urlunsplit(('', host, parts.path, parts.query, ''))
+
+
+class CrawlFrontier:
+    """
+    Priority queue of URLs still to crawl for one site.
+
+    - URLs are canonicalized on the way in and deduplicated by url_key()
+    - Highest score pops first (ties: shallower, then shorter, then first discovered)
+    - Links deeper than max_depth are not queued; links scoring below
+      min_score are held back for exploration: up to `explore_slots` of them
+      (best score first) are handed out by pop_exploration(), so paths with
+      no history get fetched and can build up a yield record
+    - Fetched pages are also deduplicated on their final, post-redirect URL
+
+    Thread-safe so fetch workers can report redirects.
+    """
+
+    def __init__(self, score_fn: Callable[[str], float], max_depth: int, min_score: float = 0.0, explore_slots: int = 0):
+        self.score_fn = score_fn
+        self.max_depth = max_depth
+        self.min_score = min_score
+        self.explore_slots = explore_slots
+        self._heap: List[Tuple[float, int, int, int, str]] = []
+        self._explore_heap: List[Tuple[float, int, int, int, str]] = []  # below min_score
+        self._counter = itertools.count()
+        self._seen: Set[str] = set()  # queued or visited
+        self._fetched: Set[str] = set()  # final URLs already parsed
+        self._lock = threading.Lock()
+        self.discovered = 0
+        self.rejected = 0
+        self.duplicates = 0
+        self.explored = 0
+
+    def add(self, url: str, depth: int) -> bool:
+        """Queue a link found at `depth`; False if it is a duplicate, too deep or not worth it"""
+        if depth > self.max_depth:
+            return False
+        canonical = canonicalize_url(url)
+        key = url_key(canonical)
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            self.discovered += 1
+        score = self.score_fn(canonical)
+        entry = (-score, depth, len(canonical), next(self._counter), canonical)
+        if score < self.min_score:
+            with self._lock:
+                self.rejected += 1
+                if self.explored < self.explore_slots:
+                    heapq.heappush(self._explore_heap, entry)
+            return False
+        with self._lock:
+            heapq.heappush(self._heap, entry)
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """Best (url, depth) still queued, or None"""
+        with self._lock:
+            if not self._heap:
+                return None
+            _, depth, _, _, url = heapq.heappop(self._heap)
+            return url, depth
+
+    @property
+    def exploration_left(self) -> int:
+        """Exploration slots still unused that have a candidate link"""
+        with self._lock:
+            return min(self.explore_slots - self.explored, len(self._explore_heap))
+
+    def pop_exploration(self) -> Optional[Tuple[str, int]]:
+        """Best (url, depth) that scored below min_score, while exploration slots remain"""
+        with self._lock:
+            if self.explored >= self.explore_slots or not self._explore_heap:
+                return None
+            self.explored += 1
+            _, depth, _, _, url = heapq.heappop(self._explore_heap)
+            return url, depth
+
+    def mark_visited(self, url: str):
+        """Record a URL fetched outside the queue (e.g. the homepage)"""
+        with self._lock:
+            self._seen.add(url_key(url))
+
+    def is_visited(self, url: str) -> bool:
+        with self._lock:
+            return url_key(url) in self._seen
+
+    def claim_final_url(self, requested_url: str, final_url: str) -> bool:
+        """
+        Record the URL a fetch ended up at. Returns False when another fetch
+        already reached the same document (e.g. both /contact and /contact-us
+        redirect to /contact-us/), so it is parsed only once.
+        """
+        final_key = url_key(final_url)
+        with self._lock:
+            self._seen.add(final_key)
+            if final_key in self._fetched:
+                self.duplicates += 1
+                return False
+            self._fetched.add(final_key)
+            self._fetched.add(url_key(requested_url))
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
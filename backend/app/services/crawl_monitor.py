@@ -0,0 +1,141 @@
+import re
+import threading
+from typing import Dict, List, Optional, Set
+
+import phonenumbers
+
+from app.config import get_settings
+from app.services.ultimate_extractor import validate_emails
+
+settings = get_settings()
+
+SOCIAL_PATTERN = re.compile(
+    r'(?:facebook\.com|fb\.com|linkedin\.com/(?:company|in|school)|instagram\.com|'
+    r'twitter\.com|x\.com|youtube\.com|tiktok\.com|pinterest\.com)/[^\s"\'<>)]+',
+    re.IGNORECASE
+)
+
+CONTACT_FIELDS = ('emails', 'phones', 'addresses', 'socials')
+
+
+def _valid_phone(phone: str, region: str) -> Optional[str]:
+    """E.164 form of a phone number phonenumbers accepts (dialled locally or with a country code), else None"""
+    digits = re.sub(r'\D', '', phone)
+    for candidate, candidate_region in ((phone, region), ('+' + digits, None)):
+        try:
+            parsed = phonenumbers.parse(candidate, candidate_region)
+        except phonenumbers.NumberParseException:
+            continue
+        if phonenumbers.is_valid_number(parsed):
+            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    return None
+
+
+def _page_contacts(page_data: Dict, region: str = 'US') -> Dict[str, Set[str]]:
+    """
+    Cheap per-page contact extraction, normalized for deduplication. Raw regex
+    hits (image names like logo@2x.png, order ids) are dropped unless they
+    validate as an email or phone number.
+    """
+    visible = page_data.get('visible_contacts', {})
+    attributes = page_data.get('attributes_contacts', {})
+    document = page_data.get('document')
+
+    found: Dict[str, Set[str]] = {field: set() for field in CONTACT_FIELDS}
+    found['emails'] = validate_emails(set(visible.get('emails', []) + attributes.get('emails', [])))
+    for phone in set(visible.get('phones', []) + attributes.get('phones', [])):
+        number = _valid_phone(phone, region)
+        if number:
+            found['phones'].add(number)
+
+    if document is not None:
+        for address in document.addresses:
+            found['addresses'].add(' '.join(address.lower().split()))
+        organization = document.structured_data.get('organization') or {}
+        if organization.get('address'):
+            found['addresses'].add(str(organization['address']).lower())
+        for target in document.link_targets + [anchor['href'] for anchor in document.anchors]:
+            match = SOCIAL_PATTERN.search(target)
+            if match:
+                found['socials'].add(match.group(0).lower().rstrip('/'))
+    return found
+
+
+class CrawlMonitor:
+    """
+    Tracks what a scan has found so far and decides when crawling can stop.
+
+    - saturated: every field in `fields` has at least one value
+    - no_new_contacts: the last `patience` pages added no new email, phone or address
+
+    Only emails and phones that pass validation count towards either rule.
+    `default_region` is used to parse phone numbers written without a country code.
+
+    Thread-safe: pages may be observed from fetch worker threads.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[List[str]] = None,
+        patience: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        default_region: str = 'US'
+    ):
+        if fields is None:
+            fields = [f.strip() for f in settings.SCRAPER_STOP_FIELDS.split(',') if f.strip()]
+        self.fields = [f for f in fields if f in CONTACT_FIELDS]
+        self.patience = settings.SCRAPER_STOP_PATIENCE if patience is None else patience
+        self.enabled = settings.SCRAPER_STOP_ENABLED if enabled is None else enabled
+        self.default_region = default_region
+        self.seen: Dict[str, Set[str]] = {field: set() for field in CONTACT_FIELDS}
+        self.pages_observed = 0
+        self.barren_streak = 0
+        self.stop_reason: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def observe(self, page_data: Dict, new_page: bool = True) -> int:
+        """
+        Record a page and return how many new emails/phones/addresses it added.
+        Pass new_page=False when re-observing a page (e.g. after rendering it).
+        """
+        found = _page_contacts(page_data, self.default_region)
+        with self._lock:
+            new_contacts = 0
+            for field, values in found.items():
+                fresh = values - self.seen[field]
+                self.seen[field].update(fresh)
+                if field != 'socials':
+                    new_contacts += len(fresh)
+
+            if new_page:
+                self.pages_observed += 1
+                self.barren_streak = 0 if new_contacts else self.barren_streak + 1
+            elif new_contacts:
+                self.barren_streak = 0
+
+            self._update_stop_reason()
+            return new_contacts
+
+    def _update_stop_reason(self):
+        if not self.enabled or self.stop_reason:
+            return
+        if self.fields and all(self.seen[field] for field in self.fields):
+            self.stop_reason = 'saturated'
+        elif self.patience and self.barren_streak >= self.patience:
+            self.stop_reason = 'no_new_contacts'
+
+    def should_stop(self) -> bool:
+        return self.stop_reason is not None
+
+    def found(self, field: str) -> List[str]:
+        """Normalized values of one field seen so far"""
+        with self._lock:
+            return sorted(self.seen[field])
+    
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                'stop_reason': self.stop_reason,
+                'pages_observed': self.pages_observed,
+                'fields_found': {field: len(self.seen[field]) for field in CONTACT_FIELDS},
+            }
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 from app.models.scan import Scan
+from app.models.path_yield import PathYieldStat
 from app.schemas.scan import ScanResult
+from app.services.link_yield import PathYield, YieldModel
 import json
 
 
@@ -76,8 +78,41 @@ class DatabaseService:
     def get_total_count(self) -> int:
         """Get total number of scans"""
         return self.db.query(Scan).count()
+    
+    def load_yield_model(self, limit: int = 5000) -> YieldModel:
+        """Link prioritizer built from the most-fetched path patterns"""
+        rows = (
+            self.db.query(PathYieldStat)
+            .order_by(PathYieldStat.fetches.desc())
+            .limit(limit)
+            .all()
+        )
+        return YieldModel({
+            row.pattern: PathYield(row.fetches, row.hits, row.new_contacts)
+            for row in rows
+        })
+    
+    def record_path_yields(self, yields: Dict[str, PathYield]):
+        """Add one scan's per-pattern results to the running totals"""
+        if not yields:
+            return
+        
+        existing = {
+            row.pattern: row
+            for row in self.db.query(PathYieldStat).filter(PathYieldStat.pattern.in_(list(yields)))
+        }
+        for pattern, result in yields.items():
+            row = existing.get(pattern)
+            if row is None:
+                row = PathYieldStat(pattern=pattern, fetches=0, hits=0, new_contacts=0)
+                self.db.add(row)
+            row.fetches += result.fetches
+            row.hits += result.hits
+            row.new_contacts += result.new_contacts
+        
+        self.db.commit()
 
 
 def get_database_service(db: Session) -> DatabaseService:
     """Factory function for database service"""
-    return DatabaseService(db)
\ No newline at end of file
+    return DatabaseService(db)
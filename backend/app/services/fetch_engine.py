@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
+from urllib.parse import urlparse
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class PolitenessPolicy:
+    """
+    Limits how hard a single scan may hit the network
+
+    - max_concurrency: requests in flight across all hosts
+    - per_host_concurrency: requests in flight to one host
+
+    Spacing between requests to a host is not set per scan: the process-wide
+    rate governor paces every request (see rate_governor).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None
+    ):
+        self.max_concurrency = max(1, max_concurrency or settings.SCRAPER_MAX_CONCURRENCY)
+        self.per_host_concurrency = max(1, per_host_concurrency or settings.SCRAPER_PER_HOST_CONCURRENCY)
+
+
+class AsyncFetchEngine:
+    """
+    Fetches many URLs concurrently with asyncio while honouring a politeness policy.
+
+    The fetch function itself is blocking (requests / BeautifulSoup), so it runs on a
+    bounded thread pool; the event loop only schedules work and enforces the limits.
+
+    `should_stop` is checked right before each fetch starts; once it returns True
+    the remaining URLs are skipped (their result is None and they are listed in
+    `skipped`).
+    """
+
+    def __init__(
+        self,
+        fetch_fn: Callable[[str], Any],
+        policy: Optional[PolitenessPolicy] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ):
+        self.fetch_fn = fetch_fn
+        self.policy = policy or PolitenessPolicy()
+        self.should_stop = should_stop
+        self.skipped: List[str] = []
+
+    def fetch_all(self, urls: List[str]) -> List[Any]:
+        """
+        Fetch all URLs and return results in the same order as `urls`
+        """
+        if not urls:
+            return []
+        return asyncio.run(self._fetch_all(urls))
+
+    async def _fetch_all(self, urls: List[str]) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        global_limit = asyncio.Semaphore(self.policy.max_concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        async def fetch_one(url: str, executor: ThreadPoolExecutor) -> Any:
+            host = urlparse(url).netloc
+            host_limit = host_limits.setdefault(host, asyncio.Semaphore(self.policy.per_host_concurrency))
+            async with global_limit, host_limit:
+                if self.should_stop and self.should_stop():
+                    self.skipped.append(url)
+                    return None
+                try:
+                    return await loop.run_in_executor(executor, self.fetch_fn, url)
+                except Exception as e:
+                    print(f"[FetchEngine] ✗ {url}: {e}")
+                    return None
+
+        with ThreadPoolExecutor(max_workers=self.policy.max_concurrency) as executor:
+            return await asyncio.gather(*(fetch_one(url, executor) for url in urls))
@@ -0,0 +1,262 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Union
+
+from bs4 import BeautifulSoup, UnicodeDammit
+import lxml.html
+from lxml import etree
+
+from app.config import get_settings
+
+settings = get_settings()
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # optional dependency, lxml is the default fast backend
+    SelectolaxParser = None
+
+# Parsers tried in order when falling back to BeautifulSoup
+SOUP_PARSERS = ['lxml', 'html5lib', 'html.parser']
+
+
+class HtmlDocument(ABC):
+    """
+    Minimal read-mostly view of a parsed HTML tree.
+
+    ParsedPage builds all of its views through this interface, so the tree can
+    come from any backend. Elements are backend-native objects and are only
+    passed back into the document's own methods.
+    """
+
+    backend = ''
+
+    @abstractmethod
+    def elements(self, *tags: str) -> Iterable:
+        """Elements in document order (all of them when no tags are given)"""
+
+    @abstractmethod
+    def top_elements(self) -> List:
+        """Children of the document root (empty for an empty document)"""
+
+    @abstractmethod
+    def children(self, element) -> List:
+        """Direct child elements (text nodes excluded)"""
+
+    @abstractmethod
+    def tag(self, element) -> str:
+        """Lower-case tag name"""
+
+    @abstractmethod
+    def attrs(self, element) -> Dict[str, str]:
+        """Attributes with multi-valued ones (class) joined by spaces"""
+
+    @abstractmethod
+    def text(self, element, separator: str = '', strip: bool = False) -> str:
+        """Text of the subtree; with strip=True each text node is stripped and empty ones dropped"""
+
+    @abstractmethod
+    def markup(self, element) -> str:
+        """Serialized HTML of the element"""
+
+    @abstractmethod
+    def remove(self, tags: List[str]):
+        """Delete these elements and everything inside them"""
+
+    @abstractmethod
+    def document_text(self, separator: str = ' ') -> str:
+        """Text of the whole document"""
+
+
+class SoupDocument(HtmlDocument):
+    """BeautifulSoup tree: slowest, but the most forgiving of broken markup"""
+
+    backend = 'bs4'
+
+    def __init__(self, soup: BeautifulSoup):
+        self.soup = soup
+
+    def elements(self, *tags: str) -> Iterable:
+        return self.soup.find_all(list(tags) if tags else True)
+
+    def top_elements(self) -> List:
+        return self.soup.find_all(True, recursive=False)
+
+    def children(self, element) -> List:
+        return element.find_all(True, recursive=False)
+
+    def tag(self, element) -> str:
+        return element.name
+
+    def attrs(self, element) -> Dict[str, str]:
+        return {
+            key: value if isinstance(value, str) else ' '.join(value)
+            for key, value in element.attrs.items()
+        }
+
+    def text(self, element, separator: str = '', strip: bool = False) -> str:
+        return element.get_text(separator=separator, strip=strip)
+
+    def markup(self, element) -> str:
+        return str(element)
+
+    def remove(self, tags: List[str]):
+        for element in self.soup(tags):
+            element.decompose()
+
+    def document_text(self, separator: str = ' ') -> str:
+        return self.soup.get_text(separator=separator, strip=True)
+
+
+class LxmlDocument(HtmlDocument):
+    """lxml.html tree: C parser and C-level iteration, no Python node objects per string"""
+
+    backend = 'lxml'
+
+    def __init__(self, root):
+        self.root = root
+
+    def elements(self, *tags: str) -> Iterable:
+        # iter() also yields comments and processing instructions, whose tag is not a str
+        return (el for el in self.root.iter(*tags) if isinstance(el.tag, str))
+
+    def top_elements(self) -> List:
+        return [self.root]
+
+    def children(self, element) -> List:
+        return [child for child in element if isinstance(child.tag, str)]
+
+    def tag(self, element) -> str:
+        return element.tag
+
+    def attrs(self, element) -> Dict[str, str]:
+        return dict(element.attrib)
+
+    def text(self, element, separator: str = '', strip: bool = False) -> str:
+        if strip:
+            return separator.join(part.strip() for part in element.itertext() if part.strip())
+        return separator.join(element.itertext())
+
+    def markup(self, element) -> str:
+        return etree.tostring(element, encoding='unicode', method='html', with_tail=False)
+
+    def remove(self, tags: List[str]):
+        for element in list(self.root.iter(*tags)):
+            if element.getparent() is not None:
+                element.drop_tree()  # keeps the element's tail text, like decompose()
+
+    def document_text(self, separator: str = ' ') -> str:
+        return self.text(self.root, separator, strip=True)
+
+
+class SelectolaxDocument(HtmlDocument):
+    """selectolax (lexbor) tree: the fastest backend when installed"""
+
+    backend = 'selectolax'
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    @staticmethod
+    def _is_element(node) -> bool:
+        # Text, comment and doctype nodes have tags like '-text' / '_comment'
+        return node.tag[0] not in '-_!'
+
+    def elements(self, *tags: str) -> Iterable:
+        if self.tree.root is None:
+            return []
+        wanted = set(tags)
+        return (
+            node for node in self.tree.root.traverse(include_text=False)
+            if self._is_element(node) and (not wanted or node.tag in wanted)
+        )
+
+    def top_elements(self) -> List:
+        return [self.tree.root] if self.tree.root is not None else []
+
+    def children(self, element) -> List:
+        return [node for node in element.iter(include_text=False) if self._is_element(node)]
+
+    def tag(self, element) -> str:
+        return element.tag
+
+    def attrs(self, element) -> Dict[str, str]:
+        return {key: value or '' for key, value in element.attributes.items()}
+
+    def text(self, element, separator: str = '', strip: bool = False) -> str:
+        if not strip:
+            return element.text(deep=True, separator=separator)
+        # text(strip=True) keeps whitespace-only nodes as empty parts; split on a
+        # character HTML parsers never emit and drop them, like the other backends
+        parts = element.text(deep=True, separator='\x00', strip=True).split('\x00')
+        return separator.join(part for part in parts if part)
+
+    def markup(self, element) -> str:
+        return element.html or ''
+
+    def remove(self, tags: List[str]):
+        self.tree.strip_tags(tags)
+
+    def document_text(self, separator: str = ' ') -> str:
+        if self.tree.root is None:
+            return ''
+        return self.text(self.tree.root, separator, strip=True)
+
+
+def decode_html(html: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    """Body as text: the declared charset if known, else <meta> / UTF-8 / Windows-1252 detection"""
+    if isinstance(html, str):
+        return html
+    if encoding:
+        try:
+            return html.decode(encoding, errors='replace')
+        except LookupError:
+            pass
+    return UnicodeDammit(html, is_html=True).unicode_markup or ''
+
+
+def _parse_lxml(markup: str) -> HtmlDocument:
+    # Encode ourselves: lxml rejects str input that carries an XML encoding declaration
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    return LxmlDocument(lxml.html.document_fromstring(markup.encode('utf-8', errors='replace'), parser=parser))
+
+
+def _parse_selectolax(markup: str) -> HtmlDocument:
+    return SelectolaxDocument(SelectolaxParser(markup))
+
+
+def parse_soup(markup: Union[str, bytes]) -> BeautifulSoup:
+    """BeautifulSoup tree, trying each parser until one succeeds"""
+    for parser in SOUP_PARSERS:
+        try:
+            return BeautifulSoup(markup, parser)
+        except Exception:
+            continue
+    raise ValueError("All BeautifulSoup parsers failed")
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    backend = (backend or settings.HTML_PARSER_BACKEND).lower()
+    if backend == 'auto':
+        return 'selectolax' if SelectolaxParser is not None else 'lxml'
+    if backend == 'selectolax' and SelectolaxParser is None:
+        print("[HtmlParsers] selectolax not installed, using lxml")
+        return 'lxml'
+    return backend
+
+
+def parse_html(html: Union[str, bytes], encoding: Optional[str] = None, backend: Optional[str] = None) -> HtmlDocument:
+    """
+    Parse a page with the configured fast backend, falling back to
+    BeautifulSoup when the fast parser fails or finds no document at all.
+    """
+    markup = decode_html(html, encoding)
+    backend = resolve_backend(backend)
+
+    if backend != 'bs4':
+        try:
+            document = _parse_selectolax(markup) if backend == 'selectolax' else _parse_lxml(markup)
+            if document.top_elements() or not markup.strip():
+                return document
+        except Exception as e:
+            print(f"[HtmlParsers] {backend} failed ({e}), falling back to BeautifulSoup")
+
+    return SoupDocument(parse_soup(markup))
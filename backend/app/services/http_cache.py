@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from app.config import get_settings
+
+settings = get_settings()
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Response headers that describe the transfer, not the stored (decoded) body
+UNCACHED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive', 'set-cookie'}
+
+
+def cache_key(url: str) -> str:
+    """Normalize a URL into a cache key (case, default port, empty path, fragment)"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+
+class CacheEntry:
+    """A stored response"""
+
+    def __init__(self, url: str, final_url: str, status_code: int, headers: Dict[str, str], body: bytes, stored_at: float):
+        self.url = url
+        self.final_url = final_url
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('etag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('last-modified')
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Persistent response cache in a local SQLite file.
+
+    - Keyed by normalized request URL
+    - Stores the decoded body (zlib-compressed), headers, ETag and Last-Modified
+    - Entries younger than `ttl` are served without touching the network; older
+      ones are revalidated with If-None-Match / If-Modified-Since
+    - Total stored size is kept under `max_bytes` by evicting least recently used entries
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.path = path or settings.HTTP_CACHE_PATH
+        self.ttl = settings.HTTP_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = max_bytes or settings.HTTP_CACHE_MAX_MB * 1024 * 1024
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_http_cache_last_access ON http_cache (last_access)")
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        key = cache_key(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT final_url, status_code, headers, body, stored_at FROM http_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE http_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+
+        final_url, status_code, headers, body, stored_at = row
+        return CacheEntry(url, final_url, status_code, json.loads(headers), zlib.decompress(body), stored_at)
+
+    def put(self, url: str, final_url: str, status_code: int, headers: Dict[str, str], body: bytes):
+        cache_control = (headers.get('Cache-Control') or '').lower()
+        if 'no-store' in cache_control:
+            return
+
+        stored_headers = {k.lower(): v for k, v in headers.items() if k.lower() not in UNCACHED_HEADERS}
+        compressed = zlib.compress(body, 6)
+        if len(compressed) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key(url), final_url, status_code, json.dumps(stored_headers), compressed, len(compressed), now, now)
+            )
+            self._evict()
+
+    def touch(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """Mark an entry fresh again after a 304, merging updated validators"""
+        key = cache_key(url)
+        with self._lock:
+            if headers:
+                row = self._conn.execute("SELECT headers FROM http_cache WHERE key = ?", (key,)).fetchone()
+                if row:
+                    stored = json.loads(row[0])
+                    for name in ('etag', 'last-modified', 'cache-control', 'expires'):
+                        if headers.get(name):
+                            stored[name] = headers[name]
+                    self._conn.execute("UPDATE http_cache SET headers = ? WHERE key = ?", (json.dumps(stored), key))
+            now = time.time()
+            self._conn.execute("UPDATE http_cache SET stored_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+
+    def _evict(self):
+        """Drop least recently used entries until under the size budget (lock held)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM http_cache ORDER BY last_access").fetchall():
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        print(f"[HttpCache] Evicted {evicted} entries")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Shared cache instance, or None when disabled"""
+    global _cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HttpCache()
+    return _cache
+
+
+def close_http_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
@@ -0,0 +1,356 @@
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from app.config import get_settings
+from app.services.http_cache import get_http_cache
+from app.services.rate_governor import RETRY_STATUSES, get_rate_governor
+
+settings = get_settings()
+
+CHUNK_SIZE = 64 * 1024
+
+# Content types accepted when fetching pages to parse
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+
+class HttpStatusError(Exception):
+    """Raised by HttpResponse.raise_for_status() for 4xx/5xx responses"""
+
+    def __init__(self, status_code: int, url: str):
+        super().__init__(f"HTTP {status_code} for {url}")
+        self.status_code = status_code
+        self.url = url
+
+
+class ResponseRejected(Exception):
+    """Raised when a response is skipped before its body is downloaded"""
+
+    def __init__(self, url: str, reason: str):
+        super().__init__(f"Rejected {url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+class ByteBudget:
+    """
+    Thread-safe download budget shared by all fetches of one scan.
+
+    Each fetch reserves up to a per-page cap before downloading and gives back
+    what it did not use, so concurrent fetches can never overspend the budget.
+    """
+
+    def __init__(self, total_bytes: int):
+        self.total_bytes = total_bytes
+        self.used = 0
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        with self._lock:
+            return self.used + self._reserved >= self.total_bytes
+
+    def reserve(self, page_cap: int) -> int:
+        with self._lock:
+            allowance = max(0, min(page_cap, self.total_bytes - self.used - self._reserved))
+            self._reserved += allowance
+            return allowance
+
+    def settle(self, reserved: int, used: int):
+        with self._lock:
+            self._reserved -= reserved
+            self.used += used
+
+
+def _charset_from_headers(headers: CaseInsensitiveDict) -> Optional[str]:
+    """Charset declared in Content-Type, if any (no ISO-8859-1 guessing)"""
+    content_type = headers.get('Content-Type') or ''
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            return value.strip('"\' ')
+    return None
+
+
+class HttpResponse:
+    """
+    Backend-independent response returned by PooledHttpClient
+    """
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: CaseInsensitiveDict,
+        content: bytes,
+        encoding: Optional[str] = None,
+        from_cache: bool = False,
+        truncated: bool = False
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.from_cache = from_cache
+        self.truncated = truncated
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding or 'utf-8', errors='replace')
+        except LookupError:
+            # Unknown charset in the Content-Type header
+            return self.content.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HttpStatusError(self.status_code, self.url)
+
+
+class PooledHttpClient:
+    """
+    Process-wide HTTP client with keep-alive connection pooling.
+
+    Uses requests with a bounded per-host pool by default. When HTTP/2 is enabled
+    and httpx (with the h2 extra) is installed, requests are multiplexed over
+    httpx instead.
+    """
+
+    def __init__(
+        self,
+        max_hosts: Optional[int] = None,
+        per_host: Optional[int] = None,
+        http2: Optional[bool] = None
+    ):
+        self.max_hosts = max_hosts or settings.HTTP_POOL_MAX_HOSTS
+        self.per_host = per_host or settings.HTTP_POOL_PER_HOST
+        self.http2 = settings.HTTP_HTTP2_ENABLED if http2 is None else http2
+        self._httpx_client = None
+        self._session: Optional[requests.Session] = None
+
+        if self.http2:
+            self._httpx_client = self._build_httpx_client()
+        if self._httpx_client is None:
+            self._session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        # pool_maxsize is per host; pool_block makes it a hard limit instead of a soft one
+        adapter = HTTPAdapter(
+            pool_connections=self.max_hosts,
+            pool_maxsize=self.per_host,
+            pool_block=True,
+            max_retries=0
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        # The session is shared across scans: never keep cookies between requests
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    def _build_httpx_client(self):
+        try:
+            import httpx
+            return httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_hosts * self.per_host,
+                    max_keepalive_connections=self.max_hosts * self.per_host
+                )
+            )
+        except ImportError as e:
+            print(f"[HttpClient] HTTP/2 unavailable ({e}), falling back to requests")
+            return None
+
+    @property
+    def backend(self) -> str:
+        return 'httpx-h2' if self._httpx_client is not None else 'requests'
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+        use_cache: bool = True,
+        max_bytes: Optional[int] = None,
+        accept_types: Optional[Tuple[str, ...]] = None
+    ) -> HttpResponse:
+        """
+        GET a URL following redirects over a pooled connection.
+
+        Fresh cached responses are returned without a request; stale ones are
+        revalidated with a conditional request. Requests are paced per host by
+        the rate governor, and 429/503 responses are retried after their
+        Retry-After pause (up to RATE_GOVERNOR_RETRIES times).
+
+        The body is streamed: responses whose Content-Type is not in
+        `accept_types` (or that look binary) raise ResponseRejected before the
+        body is read, and reading stops after `max_bytes` with truncated=True.
+        """
+        cache = get_http_cache() if use_cache else None
+        entry = cache.get(url) if cache else None
+        if entry and entry.is_fresh(cache.ttl):
+            return self._from_cache_entry(entry, max_bytes, accept_types)
+
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(entry.validators())
+
+        response = self._governed_send(url, request_headers, timeout, max_bytes, accept_types)
+
+        if entry and response.status_code == 304:
+            cache.touch(url, response.headers)
+            return self._from_cache_entry(entry, max_bytes, accept_types)
+
+        if cache and response.status_code == 200 and not response.truncated:
+            cache.put(url, response.url, response.status_code, response.headers, response.content)
+
+        return response
+
+    def _from_cache_entry(self, entry, max_bytes: Optional[int], accept_types: Optional[Tuple[str, ...]]) -> HttpResponse:
+        headers = CaseInsensitiveDict(entry.headers)
+        _check_content_type(entry.final_url, headers, accept_types)
+        body = entry.body
+        truncated = max_bytes is not None and len(body) > max_bytes
+        if truncated:
+            body = body[:max_bytes]
+        return HttpResponse(
+            entry.final_url, entry.status_code, headers, body,
+            _charset_from_headers(headers), from_cache=True, truncated=truncated
+        )
+
+    def _governed_send(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        max_bytes: Optional[int],
+        accept_types: Optional[Tuple[str, ...]]
+    ) -> HttpResponse:
+        """_send() paced by the rate governor, which learns from every response"""
+        governor = get_rate_governor()
+        if governor is None:
+            return self._send(url, headers, timeout, max_bytes, accept_types)
+
+        retries = max(0, settings.RATE_GOVERNOR_RETRIES)
+        for attempt in range(retries + 1):
+            governor.acquire(url)
+            started = time.monotonic()
+            try:
+                response = self._send(url, headers, timeout, max_bytes, accept_types)
+            except ResponseRejected:
+                governor.record(url, 200, time.monotonic() - started)
+                raise
+            except Exception:
+                governor.record(url, None, time.monotonic() - started)
+                raise
+            pause = governor.record(
+                url, response.status_code, time.monotonic() - started, response.headers.get('Retry-After')
+            )
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                break
+            if pause is not None and pause > settings.RATE_GOVERNOR_MAX_WAIT:
+                print(f"[HttpClient] {url} returned {response.status_code}, Retry-After {pause:.0f}s is too long to wait")
+                break
+            print(f"[HttpClient] {url} returned {response.status_code}, backing off (retry {attempt + 1}/{retries})")
+        return response
+
+    def _send(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        max_bytes: Optional[int],
+        accept_types: Optional[Tuple[str, ...]]
+    ) -> HttpResponse:
+        if self._httpx_client is not None:
+            with self._httpx_client.stream('GET', url, headers=headers, timeout=timeout) as r:
+                return _read_body(
+                    str(r.url), r.status_code, CaseInsensitiveDict(r.headers),
+                    r.iter_bytes(CHUNK_SIZE), max_bytes, accept_types
+                )
+
+        r = self._session.get(url, headers=headers, timeout=timeout, allow_redirects=True, stream=True)
+        try:
+            return _read_body(
+                r.url, r.status_code, CaseInsensitiveDict(r.headers),
+                r.iter_content(CHUNK_SIZE), max_bytes, accept_types
+            )
+        finally:
+            # Returns the connection to the pool, or drops it if the body was abandoned
+            r.close()
+
+    def close(self):
+        if self._httpx_client is not None:
+            self._httpx_client.close()
+        if self._session is not None:
+            self._session.close()
+
+
+def _check_content_type(url: str, headers: CaseInsensitiveDict, accept_types: Optional[Tuple[str, ...]]):
+    if not accept_types:
+        return
+    content_type = (headers.get('Content-Type') or '').split(';')[0].strip().lower()
+    if content_type and not content_type.startswith(accept_types):
+        raise ResponseRejected(url, f"content type {content_type}")
+
+
+def _read_body(
+    url: str,
+    status_code: int,
+    headers: CaseInsensitiveDict,
+    chunks: Iterable[bytes],
+    max_bytes: Optional[int],
+    accept_types: Optional[Tuple[str, ...]]
+) -> HttpResponse:
+    """Read a streamed body, rejecting unwanted content and stopping at max_bytes"""
+    if status_code == 200:
+        _check_content_type(url, headers, accept_types)
+        declared = headers.get('Content-Length')
+        if max_bytes is not None and declared and declared.isdigit() and int(declared) > max_bytes:
+            print(f"[HttpClient] {url} declares {int(declared):,} bytes, reading first {max_bytes:,}")
+
+    body = bytearray()
+    truncated = False
+    for chunk in chunks:
+        if accept_types and not body and b'\x00' in chunk[:1024]:
+            raise ResponseRejected(url, "binary content")
+        if max_bytes is not None and len(body) + len(chunk) > max_bytes:
+            body.extend(chunk[:max_bytes - len(body)])
+            truncated = True
+            break
+        body.extend(chunk)
+
+    return HttpResponse(url, status_code, headers, bytes(body), _charset_from_headers(headers), truncated=truncated)
+
+
+_client: Optional[PooledHttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHttpClient:
+    """Shared client instance for the whole process"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PooledHttpClient()
+                print(f"[HttpClient] Pooled client ready ({_client.backend}, {_client.per_host} conns/host)")
+    return _client
+
+
+def close_http_client():
+    """Close pooled connections (called on app shutdown)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
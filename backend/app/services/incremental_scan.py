@@ -0,0 +1,202 @@
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.page_fingerprint import PageFingerprint, SiteFingerprint
+from app.models.scan import Scan
+from app.schemas.scan import ScanDelta, ScanResult
+from app.services.cpu_pool import map_cpu
+from app.services.progress import current_progress
+from app.services.scan_cache import domain_key
+from app.services.ultimate_extractor import (
+    EVIDENCE_VERSION, UltimateContactExtractor, contacts_from_evidence, extract_page_evidence
+)
+
+
+def _digest(value) -> str:
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode('utf-8', 'replace')).hexdigest()
+
+
+def page_fingerprint(page: Dict) -> str:
+    """Everything the extractor reads from a page: text, JSON-LD and contact attributes"""
+    attributes = page.get('attributes_contacts') or {}
+    return _digest({
+        'text': ' '.join(page.get('text', '').split()),
+        'structured_data': page.get('structured_data') or {},
+        'emails': sorted(attributes.get('emails', [])),
+        'phones': sorted(attributes.get('phones', [])),
+    })
+
+
+def main_text(page: Dict) -> str:
+    """
+    Page text outside contact-heavy sections (header, footer, address, ...).
+    Those sections only matter to the LLM through the contacts in them, which
+    are compared separately.
+    """
+    document = page.get('document')
+    if document is None:
+        return page.get('text', '')
+    text = document.text
+    for section in document.contact_sections.split("\n\n"):
+        if section:
+            text = text.replace(section, ' ')
+    return ' '.join(text.split())
+
+
+def text_fingerprint(pages: Iterable[Dict]) -> str:
+    """Main text of the site, independent of the order pages were crawled in"""
+    return _digest(sorted((page['url'], page.get('title', ''), main_text(page)) for page in pages))
+
+
+def _is_current(evidence: Optional[Dict]) -> bool:
+    """Stored page evidence the current extractor can merge"""
+    return isinstance(evidence, dict) and evidence.get('version') == EVIDENCE_VERSION
+
+
+def _added_removed(current: List[str], previous: List[str]) -> Tuple[List[str], List[str]]:
+    return sorted(set(current) - set(previous)), sorted(set(previous) - set(current))
+
+
+class IncrementalScan:
+    """
+    Rescan of a site against the fingerprints of its previous scan.
+
+    - extract() fingerprints every page and re-extracts per-page evidence
+      only for pages that changed (or are new), in parallel on the CPU pool;
+      unchanged pages reuse their stored evidence. Merging the evidence of all
+      pages scores phones and de-duplicates across pages, so the contacts are
+      the same as a non-incremental scan's
+    - reusable_result() returns the previous structured result when neither
+      the contacts nor the main text changed, so the LLM is skipped
+    - finish() attaches the delta to the scan result; record() stores the
+      fingerprints for the next rescan
+
+    Holds no database session between calls, so it can move across threads
+    (batch pipeline stages).
+    """
+
+    def __init__(self, website_url: str, previous_pages: Dict[str, Tuple[str, Dict]], previous_site: Optional[Dict]):
+        self.domain_key = domain_key(website_url)
+        self.previous_pages = previous_pages
+        self.previous_site = previous_site
+        self.pages: Dict[str, Tuple[str, Dict]] = {}
+        self.changed: List[str] = []
+        self.added: List[str] = []
+        self.contacts: Dict = {}
+        self.text_fingerprint = ''
+
+    @classmethod
+    def load(cls, db: Session, website_url: str) -> 'IncrementalScan':
+        key = domain_key(website_url)
+        previous_pages = {
+            row.url: (row.fingerprint, json.loads(row.contacts))
+            for row in db.query(PageFingerprint).filter(PageFingerprint.domain_key == key)
+        }
+        previous_site = None
+        site = db.query(SiteFingerprint).filter(SiteFingerprint.domain_key == key).first()
+        if site is not None:
+            scan = db.query(Scan.structured_data).filter(Scan.id == site.scan_id).first()
+            previous_site = {
+                'scan_id': site.scan_id,
+                'text_fingerprint': site.text_fingerprint,
+                'contacts_fingerprint': site.contacts_fingerprint,
+                'contacts': json.loads(site.contacts),
+                'result': scan[0] if scan is not None else None,
+            }
+        return cls(website_url, previous_pages, previous_site)
+
+    def extract(self, scraped: Dict) -> Dict:
+        """Contacts of the site; only changed or new pages are extracted"""
+        progress = current_progress()
+        progress.publish('phase', phase='extraction', message="Extracting contact details")
+        region = UltimateContactExtractor(scraped).default_region
+
+        stale = []
+        for page in scraped['pages']:
+            url = page['url']
+            fingerprint = page_fingerprint(page)
+            previous = self.previous_pages.get(url)
+            if previous is not None and previous[0] != fingerprint:
+                self.changed.append(url)
+            elif previous is None:
+                self.added.append(url)
+            # Evidence stored by an older extractor is re-extracted even if the page is unchanged
+            if previous is not None and previous[0] == fingerprint and _is_current(previous[1]):
+                self.pages[url] = (fingerprint, previous[1])
+            else:
+                stale.append((page, fingerprint))
+
+        extracted = map_cpu(extract_page_evidence, [(page, scraped['base_url'], region) for page, _ in stale])
+        for (page, fingerprint), evidence in zip(stale, extracted):
+            self.pages[page['url']] = (fingerprint, evidence)
+
+        self.contacts = contacts_from_evidence(
+            (self.pages[page['url']][1] for page in scraped['pages']), scraped['base_url'], region
+        )
+        self.text_fingerprint = text_fingerprint(scraped['pages'])
+        print(
+            f"[Incremental] {len(self.added)} new, {len(self.changed)} changed, "
+            f"{len(self.pages) - len(self.added) - len(self.changed)} unchanged pages, {len(stale)} extracted"
+        )
+        progress.publish('contacts', **self.contacts)
+        return self.contacts
+
+    def reusable_result(self) -> Optional[ScanResult]:
+        """The previous scan's result if the LLM would see the same input again"""
+        previous = self.previous_site
+        if not previous or not previous['result']:
+            return None
+        if previous['text_fingerprint'] != self.text_fingerprint:
+            return None
+        if previous['contacts_fingerprint'] != _digest(self.contacts):
+            return None
+        print(f"[Incremental] Contacts and text unchanged: reusing scan {previous['scan_id']}")
+        return ScanResult(**json.loads(previous['result']))
+
+    def finish(self, result: ScanResult, llm_skipped: bool = False) -> ScanResult:
+        """`result` with the delta against the previous scan"""
+        previous_contacts = self.previous_site['contacts'] if self.previous_site else {}
+        emails_added, emails_removed = _added_removed(self.contacts.get('emails', []), previous_contacts.get('emails', []))
+        phones_added, phones_removed = _added_removed(
+            self.contacts.get('phone_numbers', []), previous_contacts.get('phone_numbers', [])
+        )
+        delta = ScanDelta(
+            previous_scan_id=self.previous_site['scan_id'] if self.previous_site else None,
+            pages_added=self.added,
+            pages_changed=self.changed,
+            pages_removed=sorted(set(self.previous_pages) - set(self.pages)),
+            pages_unchanged=len(self.pages) - len(self.added) - len(self.changed),
+            emails_added=emails_added,
+            emails_removed=emails_removed,
+            phone_numbers_added=phones_added,
+            phone_numbers_removed=phones_removed,
+            llm_skipped=llm_skipped
+        )
+        return result.model_copy(update={'delta': delta})
+
+    def record(self, db: Session, scan_id: int):
+        """Store this scan's fingerprints as the baseline for the next rescan"""
+        db.query(PageFingerprint).filter(PageFingerprint.domain_key == self.domain_key).delete(synchronize_session=False)
+        db.add_all([
+            PageFingerprint(
+                domain_key=self.domain_key,
+                url=url,
+                fingerprint=fingerprint,
+                contacts=json.dumps(evidence),
+                scan_id=scan_id
+            )
+            for url, (fingerprint, evidence) in self.pages.items()
+        ])
+        db.merge(SiteFingerprint(
+            domain_key=self.domain_key,
+            scan_id=scan_id,
+            text_fingerprint=self.text_fingerprint,
+            contacts_fingerprint=_digest(self.contacts),
+            contacts=json.dumps(self.contacts)
+        ))
+        db.commit()
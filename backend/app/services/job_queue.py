@@ -0,0 +1,210 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Type
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.scan_job import ScanJob
+
+settings = get_settings()
+
+# Candidates looked at per claim attempt; others may grab some of them first
+CLAIM_BATCH = 5
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """
+    Durable job queue on top of a table with lease columns (scan_jobs by
+    default, scan_batches for bulk scans).
+
+    - claim() leases a job to one worker by a conditional UPDATE, so several
+      worker processes can poll the same database safely
+    - A lease lasts visibility_timeout seconds and is extended by heartbeat();
+      a job whose lease runs out (worker died) becomes claimable again
+    - Failed attempts are retried with exponential backoff up to max_attempts
+    """
+
+    def __init__(self, db: Session, visibility_timeout: Optional[float] = None, model: Type = ScanJob):
+        self.db = db
+        self.model = model
+        self.visibility_timeout = visibility_timeout or settings.SCAN_JOB_VISIBILITY_TIMEOUT
+
+    def enqueue(self, website_url: str, requested_by: Optional[str] = None, domain_key: Optional[str] = None) -> ScanJob:
+        """
+        Queue a scan. If a job for the same domain_key is already queued or
+        running, that job is returned instead, so identical requests share one run.
+        """
+        job = ScanJob(
+            website_url=website_url,
+            domain_key=domain_key,
+            requested_by=requested_by,
+            status="queued",
+            attempts=0,
+            max_attempts=settings.SCAN_JOB_MAX_ATTEMPTS,
+            available_at=_now()
+        )
+        self.db.add(job)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Lost the race against an identical request (uq_scan_jobs_active_domain)
+            self.db.rollback()
+            active = self.active_for(domain_key) if domain_key else None
+            if active is None:
+                raise
+            return active
+        self.db.refresh(job)
+        return job
+
+    def active_for(self, domain_key: str) -> Optional[ScanJob]:
+        """The queued or running job for a site, if any"""
+        return (
+            self.db.query(ScanJob)
+            .filter(ScanJob.domain_key == domain_key, ScanJob.status.in_(["queued", "running"]))
+            .first()
+        )
+
+    def add_completed(self, website_url: str, scan_id: int, requested_by: Optional[str] = None, domain_key: Optional[str] = None) -> ScanJob:
+        """Record a request answered from an existing scan as an already succeeded job"""
+        now = _now()
+        job = ScanJob(
+            website_url=website_url,
+            domain_key=domain_key,
+            requested_by=requested_by,
+            status="succeeded",
+            attempts=0,
+            max_attempts=settings.SCAN_JOB_MAX_ATTEMPTS,
+            available_at=now,
+            scan_id=scan_id,
+            finished_at=now
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get(self, job_id: int) -> Optional[ScanJob]:
+        return self.db.query(self.model).filter(self.model.id == job_id).first()
+
+    def _claimable(self, now: datetime):
+        return or_(
+            and_(self.model.status == "queued", self.model.available_at <= now),
+            and_(self.model.status == "running", self.model.locked_until < now)
+        )
+
+    def claim(self, worker_id: str) -> Optional[ScanJob]:
+        """Lease the oldest available job to `worker_id`, or None if there is none"""
+        now = _now()
+        candidates = (
+            self.db.query(self.model.id, self.model.status, self.model.attempts, self.model.max_attempts)
+            .filter(self._claimable(now))
+            .order_by(self.model.available_at, self.model.id)
+            .limit(CLAIM_BATCH)
+            .all()
+        )
+        for job_id, status, attempts, max_attempts in candidates:
+            if status == "running" and attempts >= max_attempts:
+                # Abandoned on its last attempt: give up instead of running it again
+                self._update_if_claimable(job_id, now, {
+                    self.model.status: "failed",
+                    self.model.error: "Worker lease expired on final attempt",
+                    self.model.locked_until: None,
+                    self.model.finished_at: now,
+                })
+                continue
+
+            claimed = self._update_if_claimable(job_id, now, {
+                self.model.status: "running",
+                self.model.worker_id: worker_id,
+                self.model.attempts: self.model.attempts + 1,
+                self.model.locked_until: now + timedelta(seconds=self.visibility_timeout),
+                self.model.started_at: now,
+                self.model.error: None,
+            })
+            if claimed:
+                return self.get(job_id)
+        return None
+
+    def _update_if_claimable(self, job_id: int, now: datetime, values) -> bool:
+        """Apply `values` only if the job is still claimable; False if another worker won"""
+        updated = (
+            self.db.query(self.model)
+            .filter(self.model.id == job_id, self._claimable(now))
+            .update(values, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated == 1
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Extend the lease; False if this worker no longer holds the job"""
+        updated = (
+            self.db.query(self.model)
+            .filter(self.model.id == job_id, self.model.status == "running", self.model.worker_id == worker_id)
+            .update({self.model.locked_until: _now() + timedelta(seconds=self.visibility_timeout)}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated == 1
+
+    def complete(self, job_id: int, worker_id: str, **outcome) -> bool:
+        """Mark the job succeeded, storing `outcome` columns (e.g. scan_id)"""
+        values = {getattr(self.model, column): value for column, value in outcome.items()}
+        values.update({
+            self.model.status: "succeeded",
+            self.model.locked_until: None,
+            self.model.finished_at: _now(),
+        })
+        updated = (
+            self.db.query(self.model)
+            .filter(self.model.id == job_id, self.model.status == "running", self.model.worker_id == worker_id)
+            .update(values, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated == 1
+
+    def release(self, job_id: int, worker_id: str) -> bool:
+        """Hand an unfinished job back (worker shutting down) without using up an attempt"""
+        updated = (
+            self.db.query(self.model)
+            .filter(self.model.id == job_id, self.model.status == "running", self.model.worker_id == worker_id)
+            .update({
+                self.model.status: "queued",
+                self.model.attempts: self.model.attempts - 1,
+                self.model.locked_until: None,
+                self.model.available_at: _now(),
+            }, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str, retryable: bool = True) -> Optional[str]:
+        """
+        Record a failed attempt. Retryable failures are requeued with backoff
+        until max_attempts is reached. Returns the job's new status.
+        """
+        job = self.get(job_id)
+        if job is None or job.status != "running" or job.worker_id != worker_id:
+            return None
+
+        now = _now()
+        if retryable and job.attempts < job.max_attempts:
+            delay = settings.SCAN_JOB_RETRY_BACKOFF * (2 ** (job.attempts - 1))
+            job.status = "queued"
+            job.available_at = now + timedelta(seconds=delay)
+        else:
+            job.status = "failed"
+            job.finished_at = now
+        job.error = error[:2000]
+        job.locked_until = None
+        self.db.commit()
+        return job.status
+
+
+def get_job_queue(db: Session) -> JobQueue:
+    """Factory function for the job queue"""
+    return JobQueue(db)
@@ -0,0 +1,284 @@
+import gzip
+import io
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+from app.config import get_settings
+from app.services.crawl_frontier import site_host
+from app.services.http_client import get_http_client
+
+settings = get_settings()
+
+MAX_ROBOTS_BYTES = 512 * 1024
+DISCOVERY_TIMEOUT = 10  # Seconds per robots.txt / sitemap request
+
+# Child sitemaps of an index are read in this order of preference: page and
+# company sitemaps hold contact/about pages, product and blog ones rarely do
+CHILD_SITEMAP_PREFERRED = ['page', 'main', 'site', 'company', 'about', 'contact']
+CHILD_SITEMAP_AVOIDED = ['product', 'post', 'blog', 'news', 'article', 'image', 'video', 'tag', 'category', 'author']
+
+
+class SiteLinks:
+    """
+    What robots.txt and the sitemaps say about one site
+    """
+
+    def __init__(
+        self,
+        origin: str,
+        urls: Optional[List[str]] = None,
+        sitemaps: Optional[List[str]] = None,
+        crawl_delay: Optional[float] = None,
+        robots: Optional[RobotFileParser] = None
+    ):
+        self.origin = origin
+        self.urls = urls or []
+        self.sitemaps = sitemaps or []
+        self.crawl_delay = crawl_delay
+        self.robots = robots
+        self.fetched_at = time.time()
+
+    def is_allowed(self, url: str) -> bool:
+        """False when robots.txt disallows the URL for all user agents"""
+        if self.robots is None:
+            return True
+        return self.robots.can_fetch('*', url)
+
+
+class LinkDiscovery:
+    """
+    Finds a site's pages from robots.txt and sitemap.xml instead of crawling.
+
+    - Sitemap locations come from robots.txt, with /sitemap.xml as the default
+    - Sitemap indexes are followed (preferring page-like child sitemaps)
+    - Gzipped sitemaps are decompressed on the fly; downloads and decompressed
+      size are both capped, and parsing is incremental (iterparse)
+    - Results are cached per site for `ttl` seconds
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_urls: Optional[int] = None,
+        max_sitemaps: Optional[int] = None,
+        max_sitemap_bytes: Optional[int] = None
+    ):
+        self.ttl = settings.LINK_DISCOVERY_TTL if ttl is None else ttl
+        self.max_urls = max_urls or settings.LINK_DISCOVERY_MAX_URLS
+        self.max_sitemaps = max_sitemaps or settings.LINK_DISCOVERY_MAX_SITEMAPS
+        self.max_sitemap_bytes = max_sitemap_bytes or settings.LINK_DISCOVERY_MAX_SITEMAP_BYTES
+        self._cache: Dict[str, SiteLinks] = {}
+        self._lock = threading.Lock()
+
+    def discover(self, base_url: str, headers: Optional[Dict[str, str]] = None) -> SiteLinks:
+        """Site links for `base_url`, served from the per-site cache when fresh"""
+        parsed = urlparse(base_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        key = site_host(base_url)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and time.time() - cached.fetched_at < self.ttl:
+                return cached
+
+        site_links = self._discover(origin, headers or {})
+
+        with self._lock:
+            self._cache[key] = site_links
+            if len(self._cache) > settings.LINK_DISCOVERY_CACHE_SITES:
+                oldest = min(self._cache, key=lambda k: self._cache[k].fetched_at)
+                del self._cache[oldest]
+        return site_links
+
+    def _discover(self, origin: str, headers: Dict[str, str]) -> SiteLinks:
+        robots = self._fetch_robots(origin, headers)
+        sitemaps = robots.site_maps() if robots else None
+        if not sitemaps:
+            sitemaps = [urljoin(origin + '/', 'sitemap.xml')]
+
+        crawl_delay = None
+        if robots:
+            delay = robots.crawl_delay('*')
+            crawl_delay = float(delay) if delay is not None else None
+
+        site = site_host(origin)
+        urls: List[str] = []
+        seen = set()
+        queue: List[Tuple[str, int]] = [(url, 0) for url in sitemaps]
+        read: List[str] = []
+
+        while queue and len(read) < self.max_sitemaps and len(urls) < self.max_urls:
+            sitemap_url, depth = queue.pop(0)
+            if sitemap_url in read:
+                continue
+            read.append(sitemap_url)
+
+            page_urls, child_sitemaps = self._read_sitemap(sitemap_url, headers)
+            for url in page_urls:
+                if url not in seen and site_host(url) == site:
+                    seen.add(url)
+                    urls.append(url)
+                    if len(urls) >= self.max_urls:
+                        break
+            if depth < 2:
+                queue.extend((child, depth + 1) for child in _order_child_sitemaps(child_sitemaps))
+
+        print(f"[LinkDiscovery] {origin}: {len(urls)} URLs from {len(read)} sitemaps")
+        return SiteLinks(origin, urls, read, crawl_delay, robots)
+
+    def _fetch_robots(self, origin: str, headers: Dict[str, str]) -> Optional[RobotFileParser]:
+        """Parsed robots.txt, or None if it is missing or unreadable (everything allowed)"""
+        robots_url = urljoin(origin + '/', 'robots.txt')
+        try:
+            response = get_http_client().get(
+                robots_url, headers=headers, timeout=DISCOVERY_TIMEOUT, max_bytes=MAX_ROBOTS_BYTES
+            )
+        except Exception as e:
+            print(f"[LinkDiscovery] robots.txt failed for {origin}: {e}")
+            return None
+        if response.status_code >= 400:
+            return None
+
+        robots = RobotFileParser(robots_url)
+        robots.parse(response.text.splitlines())
+        return robots
+
+    def _read_sitemap(self, url: str, headers: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """Page URLs and child sitemap URLs listed in one sitemap"""
+        try:
+            response = get_http_client().get(
+                url, headers=headers, timeout=DISCOVERY_TIMEOUT, max_bytes=self.max_sitemap_bytes
+            )
+            if response.status_code >= 400:
+                return [], []
+        except Exception as e:
+            print(f"[LinkDiscovery] Sitemap failed {url}: {e}")
+            return [], []
+
+        if response.content[:2] == b'\x1f\x8b':
+            stream = io.BufferedReader(
+                _CappedReader(gzip.GzipFile(fileobj=io.BytesIO(response.content)), self.max_sitemap_bytes)
+            )
+            head = stream.peek(64)
+        else:
+            stream = io.BytesIO(response.content)
+            head = response.content[:64]
+
+        if not head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<'):
+            # Plain-text sitemap: one URL per line
+            try:
+                text = stream.read().decode('utf-8', errors='replace')
+            except (EOFError, OSError):
+                return [], []
+            return [line.strip() for line in text.splitlines() if line.strip().startswith('http')], []
+
+        return _parse_sitemap_xml(stream, self.max_urls)
+
+
+class _CappedReader(io.RawIOBase):
+    """Read at most `limit` bytes from a (decompressing) stream"""
+
+    def __init__(self, raw, limit: int):
+        self._raw = raw
+        self._remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._remaining <= 0:
+            return 0
+        data = self._raw.read(min(len(b), self._remaining))
+        self._remaining -= len(data)
+        b[:len(data)] = data
+        return len(data)
+
+
+# Namespaces of sitemap <loc> elements (current, legacy Google, and none for sloppy sitemaps)
+SITEMAP_NAMESPACES = {
+    '',
+    'http://www.sitemaps.org/schemas/sitemap/0.9',
+    'http://www.google.com/schemas/sitemap/0.84',
+    'http://www.google.com/schemas/sitemap/0.9',
+}
+
+
+def _split_tag(tag: str) -> Tuple[str, str]:
+    """(namespace, local name) of an ElementTree tag"""
+    if tag.startswith('{'):
+        namespace, _, name = tag[1:].partition('}')
+        return namespace, name
+    return '', tag
+
+
+def _parse_sitemap_xml(stream, max_urls: int) -> Tuple[List[str], List[str]]:
+    """
+    Incrementally parse a <urlset> or <sitemapindex>. A document cut off by a
+    byte cap still yields every URL read before the cut. Only sitemap <loc>
+    elements directly inside <url> or <sitemap> count, so image and video
+    extension URLs (<image:loc>, <video:content_loc>) are ignored.
+    """
+    page_urls: List[str] = []
+    child_sitemaps: List[str] = []
+    # (namespace, name) of the open elements
+    path: List[Tuple[str, str]] = []
+
+    try:
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                path.append(_split_tag(elem.tag))
+                continue
+            namespace, name = path.pop()
+            parent = path[-1] if path else None
+            if (
+                name == 'loc' and elem.text and namespace in SITEMAP_NAMESPACES
+                and parent is not None and parent[0] in SITEMAP_NAMESPACES and parent[1] in ('url', 'sitemap')
+            ):
+                (child_sitemaps if parent[1] == 'sitemap' else page_urls).append(elem.text.strip())
+                if len(page_urls) >= max_urls:
+                    break
+            elif name in ('url', 'sitemap'):
+                elem.clear()
+    except (ET.ParseError, EOFError, OSError):
+        # Truncated by the byte cap, or a corrupt gzip stream
+        pass
+
+    return page_urls, child_sitemaps
+
+
+def _order_child_sitemaps(urls: List[str]) -> List[str]:
+    def rank(url: str) -> int:
+        name = urlparse(url).path.lower()
+        if any(keyword in name for keyword in CHILD_SITEMAP_PREFERRED):
+            return 0
+        if any(keyword in name for keyword in CHILD_SITEMAP_AVOIDED):
+            return 2
+        return 1
+    return sorted(urls, key=rank)
+
+
+_discovery: Optional[LinkDiscovery] = None
+_discovery_lock = threading.Lock()
+
+
+def get_link_discovery() -> LinkDiscovery:
+    """Shared discovery instance (and per-site cache) for the whole process"""
+    global _discovery
+    if _discovery is None:
+        with _discovery_lock:
+            if _discovery is None:
+                _discovery = LinkDiscovery()
+    return _discovery
+
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='link-discovery')
+
+
+def discover_site_links_async(base_url: str, headers: Optional[Dict[str, str]] = None) -> Future:
+    """Start discovery in the background so it overlaps the homepage fetch"""
+    return _executor.submit(get_link_discovery().discover, base_url, headers)
@@ -0,0 +1,140 @@
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Keywords behind the prior for paths we have no history for
+HIGH_PRIORITY_KEYWORDS = ['contact', 'reach', 'get-in-touch', 'talk', 'connect']
+MEDIUM_PRIORITY_KEYWORDS = [
+    'about', 'team', 'people', 'company', 'who-we-are',
+    'leadership', 'careers', 'jobs', 'location', 'office',
+    'info', 'information', 'help', 'support', 'faq'
+]
+
+# Expected new contacts per fetch before any history is seen
+HIGH_PRIORITY_PRIOR = 1.0
+MEDIUM_PRIORITY_PRIOR = 0.3
+DEFAULT_PRIOR = 0.02
+
+# One page listing hundreds of numbers should not dominate a pattern's average
+MAX_CONTACTS_PER_PAGE = 10
+
+MAX_PATTERN_DEPTH = 3
+
+LOCALE_SEGMENT = re.compile(r'^[a-z]{2}([-_][a-z]{2})?$')
+ID_SEGMENT = re.compile(r'^(\d+|[0-9a-f]{8,}|[0-9a-f]{8}-[0-9a-f-]{27})$')
+PAGE_EXTENSION = re.compile(r'\.(html?|php|aspx?|jsp|cfm)$')
+
+
+def _is_structural(segment: str) -> bool:
+    """Segments naming a section (kept in patterns) rather than an item (wildcarded)"""
+    return any(keyword in segment for keyword in HIGH_PRIORITY_KEYWORDS + MEDIUM_PRIORITY_KEYWORDS)
+
+
+def path_pattern(url: str) -> str:
+    """
+    Collapse a URL into a path pattern shared across sites.
+
+    /en/contact-us.html -> /contact-us, /locations/new-york -> /locations/*,
+    /about/team/jane-doe -> /about/team/*
+    """
+    segments = [s for s in urlparse(url).path.lower().split('/') if s]
+    if len(segments) > 1 and LOCALE_SEGMENT.match(segments[0]):
+        segments = segments[1:]
+
+    parts: List[str] = []
+    for index, segment in enumerate(segments[:MAX_PATTERN_DEPTH]):
+        segment = PAGE_EXTENSION.sub('', segment)
+        if ID_SEGMENT.match(segment) or (index > 0 and not _is_structural(segment)):
+            parts.append('*')
+            break
+        parts.append(segment)
+
+    if len(segments) > len(parts) and (not parts or parts[-1] != '*'):
+        parts.append('*')
+    return '/' + '/'.join(parts)
+
+
+def _parent_pattern(pattern: str) -> Optional[str]:
+    if pattern == '/':
+        return None
+    return pattern.rsplit('/', 1)[0] or '/'
+
+
+def keyword_prior(url: str) -> float:
+    """Expected yield of a path from its keywords alone"""
+    parsed = urlparse(url)
+    target = f"{parsed.path}?{parsed.query}".lower()
+    if any(keyword in target for keyword in HIGH_PRIORITY_KEYWORDS):
+        return HIGH_PRIORITY_PRIOR
+    if any(keyword in target for keyword in MEDIUM_PRIORITY_KEYWORDS):
+        return MEDIUM_PRIORITY_PRIOR
+    return DEFAULT_PRIOR
+
+
+class PathYield:
+    """Aggregated outcome of fetching pages matching one pattern"""
+
+    def __init__(self, fetches: int = 0, hits: int = 0, new_contacts: int = 0):
+        self.fetches = fetches
+        self.hits = hits
+        self.new_contacts = new_contacts
+
+    def add(self, new_contacts: int):
+        self.fetches += 1
+        self.hits += 1 if new_contacts else 0
+        self.new_contacts += min(new_contacts, MAX_CONTACTS_PER_PAGE)
+
+
+class YieldModel:
+    """
+    Ranks candidate links by expected new contacts per fetch.
+
+    The keyword prior is shrunk towards the observed average of the URL's parent
+    pattern and then its own pattern (additive smoothing with `prior_weight`
+    pseudo-fetches), so patterns that never paid off sink below the cut-off.
+    Links without contact keywords start below it; the crawler fetches a few
+    of them per scan (LINK_YIELD_EXPLORE_PAGES), and patterns that pay off
+    there rise above the cut-off.
+    """
+
+    def __init__(
+        self,
+        stats: Optional[Dict[str, PathYield]] = None,
+        prior_weight: Optional[float] = None,
+        min_expected: Optional[float] = None
+    ):
+        self.stats = stats or {}
+        self.prior_weight = settings.LINK_YIELD_PRIOR_WEIGHT if prior_weight is None else prior_weight
+        self.min_expected = settings.LINK_YIELD_MIN_EXPECTED if min_expected is None else min_expected
+
+    def expected_yield(self, url: str) -> float:
+        estimate = keyword_prior(url)
+        pattern = path_pattern(url)
+        for candidate in (_parent_pattern(pattern), pattern):
+            stat = self.stats.get(candidate) if candidate else None
+            if stat and stat.fetches:
+                estimate = (stat.new_contacts + self.prior_weight * estimate) / (stat.fetches + self.prior_weight)
+        return estimate
+
+    def rank(self, links: Iterable[str]) -> List[str]:
+        """Links worth fetching, best expected yield first (shorter URLs win ties)"""
+        scored = []
+        for link in links:
+            expected = self.expected_yield(link)
+            if expected >= self.min_expected:
+                scored.append((expected, -len(link), link))
+        scored.sort(reverse=True)
+        return [link for _, _, link in scored]
+
+
+def aggregate_page_yields(page_yields: List[Dict]) -> Dict[str, PathYield]:
+    """Group one scan's per-page results ({'url', 'new_contacts'}) by pattern"""
+    aggregated: Dict[str, PathYield] = {}
+    for page in page_yields:
+        pattern = path_pattern(page['url'])
+        aggregated.setdefault(pattern, PathYield()).add(page['new_contacts'])
+    return aggregated
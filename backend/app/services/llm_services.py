@@ -4,9 +4,13 @@ import requests
 from openai import OpenAI
 from app.config import get_settings
 from app.schemas.scan import ScanResult
+from app.services.progress import publish
 
 settings = get_settings()
 
+# Scraped text sent to the model; anything past this is never seen by it
+LLM_MAX_TEXT_CHARS = 15000
+
 
 class LLMService:
     """Service for interacting with LLM to generate structured output"""
@@ -38,7 +42,7 @@ class LLMService:
 Website URL: {website_url}
 
 Scraped Content:
-{scraped_text[:15000]}  
+{scraped_text[:LLM_MAX_TEXT_CHARS]}  
 
 Already Extracted Contacts via Regex (USE THESE - they are from the actual page):
 - Emails: {', '.join(extracted_contacts.get('emails', [])) or 'None found'}
@@ -167,6 +171,7 @@ START YOUR RESPONSE WITH THE JSON OBJECT ONLY. Include AT MINIMUM the emails and
         prompt = self._build_prompt(website_url, scraped_text, extracted_contacts)
         
         # Call appropriate LLM
+        publish('phase', phase='llm', message="Structuring results with AI", provider=self.provider)
         if self.provider == "gemini":
             raw_json = self._call_gemini(prompt)
         else:
@@ -0,0 +1,241 @@
+import json
+import re
+from typing import Dict, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+from app.services.html_parsers import HtmlDocument, SoupDocument, parse_html
+
+# Tags that never carry visible text
+NOISE_TAGS = ['script', 'style', 'noscript', 'iframe', 'svg', 'canvas']
+
+# class/id fragments of sections likely to hold contact details
+CONTACT_SECTION_KEYWORDS = [
+    'contact', 'footer', 'header', 'info', 'phone', 'email',
+    'address', 'location', 'office', 'headquarters', 'reach',
+    'connect', 'social', 'follow', 'touch', 'call', 'visit'
+]
+
+# Tags always treated as contact sections
+CONTACT_SECTION_TAGS = {'footer', 'header', 'address', 'aside'}
+
+CONTACT_KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, CONTACT_SECTION_KEYWORDS)))
+
+# Form controls listed in a form's fields view
+FORM_FIELD_TAGS = {'input', 'textarea', 'select'}
+
+# Max sections collected per keyword and attribute (class or id)
+MAX_SECTIONS_PER_KEYWORD = 3
+
+# Attributes whose values may hold absolute URLs (social profiles, embeds, etc.)
+URL_ATTRIBUTES = ['href', 'src', 'content', 'data-href', 'data-url']
+
+
+class ParsedPage:
+    """
+    A page parsed exactly once, with every view the scraper and extractor need.
+
+    Built from a single parsed tree (lxml, selectolax or BeautifulSoup, see
+    html_parsers). The tree itself is not kept, so the object is cheap to hold
+    for the rest of the scan.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        title: str = '',
+        meta_description: str = '',
+        text: str = '',
+        contact_sections: str = '',
+        anchors: Optional[List[Dict]] = None,
+        forms: Optional[List[Dict]] = None,
+        addresses: Optional[List[str]] = None,
+        json_ld: Optional[List] = None,
+        json_ld_raw: Optional[List[str]] = None,
+        link_targets: Optional[List[str]] = None,
+        attribute_contacts: Optional[Dict] = None,
+    ):
+        self.url = url
+        self.title = title
+        self.meta_description = meta_description
+        self.text = text
+        self.contact_sections = contact_sections
+        self.anchors = anchors or []
+        self.forms = forms or []
+        self.addresses = addresses or []
+        self.json_ld = json_ld or []
+        self.json_ld_raw = json_ld_raw or []
+        self.link_targets = link_targets or []
+        self.attribute_contacts = attribute_contacts or {'emails': [], 'phones': []}
+
+    @classmethod
+    def from_html(
+        cls,
+        url: str,
+        html: Union[str, bytes],
+        encoding: Optional[str] = None,
+        backend: Optional[str] = None
+    ) -> 'ParsedPage':
+        """Parse with the configured fast backend (BeautifulSoup only as a fallback)"""
+        return cls.from_document(url, parse_html(html, encoding, backend))
+
+    @classmethod
+    def from_soup(cls, url: str, soup: BeautifulSoup) -> 'ParsedPage':
+        return cls.from_document(url, SoupDocument(soup))
+
+    @classmethod
+    def from_document(cls, url: str, doc: HtmlDocument) -> 'ParsedPage':
+        """
+        Build all views from `doc` in one pass over its elements. Consumes the
+        document: noise tags are removed from it in place.
+        """
+        page = cls(url)
+        emails = set()
+        phones = set()
+
+        # Views that need <script>/<iframe> must be taken before noise removal
+        for element in doc.elements():
+            tag = doc.tag(element)
+            attrs = doc.attrs(element)
+
+            for attr in URL_ATTRIBUTES:
+                value = attrs.get(attr)
+                if value and '//' in value:
+                    page.link_targets.append(value)
+
+            # data-* attributes
+            if 'data-email' in attrs:
+                emails.add(attrs['data-email'])
+            for attr in ('data-phone', 'data-tel'):
+                if attr in attrs:
+                    phones.add(attrs[attr])
+
+            if tag == 'a' and 'href' in attrs:
+                href = attrs['href']
+                page.anchors.append({'href': href, 'text': doc.text(element, ' ', strip=True)})
+                # mailto: and tel: links
+                href_lower = href.lower()
+                if 'mailto:' in href_lower:
+                    emails.add(href_lower.split('mailto:')[-1].split('?')[0])
+                if 'tel:' in href_lower:
+                    phones.add(href_lower.split('tel:')[-1])
+            elif tag == 'title' and not page.title:
+                page.title = doc.text(element, strip=True)
+            elif tag == 'meta' and not page.meta_description and attrs.get('name') == 'description':
+                page.meta_description = attrs.get('content', '')
+            elif tag == 'script' and attrs.get('type') == 'application/ld+json':
+                raw = doc.text(element)
+                if raw:
+                    page.json_ld_raw.append(raw)
+                    try:
+                        page.json_ld.append(json.loads(raw))
+                    except ValueError:
+                        pass
+            elif tag == 'form':
+                page.forms.append(_form_view(doc, element))
+            elif tag == 'address':
+                page.addresses.append(doc.text(element, strip=True))
+
+        page.attribute_contacts = {'emails': list(emails), 'phones': list(phones)}
+
+        # Remove noise but KEEP headers/footers (they have contact info!)
+        doc.remove(NOISE_TAGS)
+
+        page.text = doc.document_text(' ')
+        page.contact_sections = extract_contact_sections(doc)
+        return page
+
+    @property
+    def structured_data(self) -> Dict:
+        """Organization and contact point objects from JSON-LD"""
+        structured = {}
+        for data in self.json_ld:
+            if isinstance(data, dict):
+                # Look for Organization data
+                if data.get('@type') == 'Organization':
+                    structured['organization'] = data
+                # Look for contact point
+                if 'contactPoint' in data:
+                    structured['contact_point'] = data['contactPoint']
+        return structured
+
+
+def _form_view(doc: HtmlDocument, form) -> Dict:
+    """Plain-data view of a <form>"""
+    attrs = doc.attrs(form)
+    return {
+        'action': attrs.get('action', ''),
+        'method': attrs.get('method', 'get'),
+        'text': doc.text(form).lower(),
+        'markup': doc.markup(form).lower(),
+        'fields': [
+            {
+                'type': field_attrs.get('type', 'text'),
+                'name': field_attrs.get('name', ''),
+                'placeholder': field_attrs.get('placeholder', ''),
+                'required': 'required' in field_attrs
+            }
+            for field_attrs in (
+                doc.attrs(field) for field in _descendants(doc, form, FORM_FIELD_TAGS)
+            )
+        ]
+    }
+
+
+def _descendants(doc: HtmlDocument, element, tags) -> List:
+    """Descendants of `element` with one of `tags`, in document order"""
+    found = []
+    stack = list(reversed(doc.children(element)))
+    while stack:
+        node = stack.pop()
+        if doc.tag(node) in tags:
+            found.append(node)
+        stack.extend(reversed(doc.children(node)))
+    return found
+
+
+def extract_contact_sections(doc: Union[HtmlDocument, BeautifulSoup]) -> str:
+    """
+    Extract text from sections likely to have contact info in one walk of the tree.
+
+    An element is collected when its tag is in CONTACT_SECTION_TAGS or its class/id
+    contains a keyword (at most MAX_SECTIONS_PER_KEYWORD per keyword and attribute).
+    Descendants of a collected element are skipped so nested sections are not
+    collected twice.
+    """
+    if isinstance(doc, BeautifulSoup):
+        doc = SoupDocument(doc)
+
+    contact_parts = []
+    seen = set()
+    quota = {}
+
+    stack = [iter(doc.top_elements())]
+    while stack:
+        elem = next(stack[-1], None)
+        if elem is None:
+            stack.pop()
+            continue
+
+        attrs = doc.attrs(elem)
+        selected = doc.tag(elem) in CONTACT_SECTION_TAGS
+        for attr in ('class', 'id'):
+            value = attrs.get(attr)
+            if not value:
+                continue
+            for keyword in set(CONTACT_KEYWORD_PATTERN.findall(value.lower())):
+                used = quota.get((attr, keyword), 0)
+                if used < MAX_SECTIONS_PER_KEYWORD:
+                    quota[(attr, keyword)] = used + 1
+                    selected = True
+
+        if selected:
+            text = doc.text(elem, ' ', strip=True)
+            if text and len(text) > 10 and text not in seen:
+                seen.add(text)
+                contact_parts.append(text)
+            continue  # the whole subtree is covered by this text
+
+        stack.append(iter(doc.children(elem)))
+
+    return "\n\n".join(contact_parts)
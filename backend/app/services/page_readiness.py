@@ -0,0 +1,111 @@
+import time
+from typing import Dict, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Installed on every new document (see BrowserPool). Tracks the last DOM mutation
+# and the number of fetch/XHR requests in flight from the very start of the page.
+INSTRUMENT_JS = """
+(() => {
+  if (window.__scraperReady) return;
+  const state = window.__scraperReady = {lastMutation: 0, lastNetwork: 0, inflight: 0};
+  const now = () => performance.now();
+  new MutationObserver(() => { state.lastMutation = now(); })
+    .observe(document, {childList: true, subtree: true, characterData: true});
+  const start = () => { state.inflight++; state.lastNetwork = now(); };
+  const done = () => { state.inflight = Math.max(0, state.inflight - 1); state.lastNetwork = now(); };
+  if (window.fetch) {
+    const origFetch = window.fetch;
+    window.fetch = function () { start(); return origFetch.apply(this, arguments).finally(done); };
+  }
+  const origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    start();
+    this.addEventListener('loadend', done, {once: true});
+    return origSend.apply(this, arguments);
+  };
+})();
+"""
+
+PROBE_JS = """
+const s = window.__scraperReady;
+if (!s) return null;
+let lastResource = 0;
+let bytes = 0;
+for (const r of performance.getEntriesByType('resource')) {
+  lastResource = Math.max(lastResource, r.responseEnd);
+  bytes += r.transferSize || r.encodedBodySize || 0;
+}
+for (const n of performance.getEntriesByType('navigation')) bytes += n.transferSize || n.encodedBodySize || 0;
+return {
+  bytes: bytes,
+  now: performance.now(),
+  readyState: document.readyState,
+  inflight: s.inflight,
+  lastActivity: Math.max(s.lastMutation, s.lastNetwork, lastResource)
+};
+"""
+
+
+def wait_for_page_settled(
+    driver,
+    timeout: Optional[float] = None,
+    quiet_ms: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    poll_interval: float = 0.1
+) -> Dict:
+    """
+    Block until the page is loaded, has no fetch/XHR in flight and the DOM and
+    network have been quiet for `quiet_ms`, or until `timeout` seconds pass.
+
+    Loading is stopped (window.stop) once the page has pulled in more than
+    `max_bytes`, as reported by Resource Timing. Cross-origin responses without
+    Timing-Allow-Origin report 0 bytes, so the cap is a lower bound.
+
+    Returns how long settling took and why the wait ended.
+    """
+    timeout = settings.RENDER_PAGE_DEADLINE if timeout is None else timeout
+    quiet_ms = settings.RENDER_QUIET_MS if quiet_ms is None else quiet_ms
+    max_bytes = settings.RENDER_MAX_PAGE_BYTES if max_bytes is None else max_bytes
+    started = time.monotonic()
+    deadline = started + max(timeout, 0)
+
+    while True:
+        try:
+            state = driver.execute_script(PROBE_JS)
+            if state is None:
+                # Page was loaded without the instrumentation (e.g. not a pooled browser)
+                driver.execute_script(INSTRUMENT_JS)
+                state = driver.execute_script(PROBE_JS)
+        except Exception as e:
+            return _result(started, settled=False, reason=f'probe_failed: {e}')
+
+        if (
+            state
+            and state['readyState'] == 'complete'
+            and state['inflight'] == 0
+            and state['now'] - state['lastActivity'] >= quiet_ms
+        ):
+            return _result(started, settled=True, reason='quiet')
+
+        if state and max_bytes and state['bytes'] > max_bytes:
+            try:
+                driver.execute_script("window.stop();")
+            except Exception:
+                pass
+            return _result(started, settled=False, reason='weight_cap')
+
+        if time.monotonic() >= deadline:
+            return _result(started, settled=False, reason='deadline')
+
+        time.sleep(poll_interval)
+
+
+def _result(started: float, settled: bool, reason: str) -> Dict:
+    return {
+        'settled': settled,
+        'settle_ms': int((time.monotonic() - started) * 1000),
+        'reason': reason,
+    }
@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Union
+
+from app.config import get_settings
+
+settings = get_settings()
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, gzip is the fallback
+    zstandard = None
+
+
+class PageStore:
+    """
+    Content-addressed, compressed blob store for raw page bodies.
+
+    Each body is written once under its SHA-256, so pages carry only the hash
+    and identical pages across scans share one file. Blobs are zstd-compressed
+    when `zstandard` is installed, gzip otherwise.
+    """
+
+    def __init__(self, root: Optional[str] = None, codec: Optional[str] = None):
+        self.root = root or settings.PAGE_STORE_DIR
+        codec = (codec or settings.PAGE_STORE_CODEC).lower()
+        if codec == 'auto':
+            codec = 'zstd' if zstandard is not None else 'gzip'
+        if codec == 'zstd' and zstandard is None:
+            print("[PageStore] zstandard not installed, using gzip")
+            codec = 'gzip'
+        self.codec = codec
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, digest: str, codec: str) -> str:
+        extension = 'zst' if codec == 'zstd' else 'gz'
+        return os.path.join(self.root, digest[:2], f"{digest}.{extension}")
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=6).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def put(self, content: Union[str, bytes]) -> str:
+        """Store a body and return its content hash"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, self.codec)
+
+        if os.path.exists(path):
+            # Refresh mtime so prune() keeps blobs that are still in use
+            os.utime(path)
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._compress(data))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest
+
+    def get_bytes(self, digest: str) -> bytes:
+        zstd_path = self._path(digest, 'zstd')
+        if os.path.exists(zstd_path):
+            if zstandard is None:
+                raise RuntimeError(f"Blob {digest} is zstd-compressed but zstandard is not installed")
+            with open(zstd_path, 'rb') as f:
+                return zstandard.ZstdDecompressor().decompress(f.read())
+        with gzip.open(self._path(digest, 'gzip'), 'rb') as f:
+            return f.read()
+
+    def get_text(self, digest: str) -> str:
+        return self.get_bytes(digest).decode('utf-8', errors='replace')
+
+    def prune(self, max_age_days: Optional[float] = None) -> int:
+        """Delete blobs not written or reused within `max_age_days`"""
+        max_age_days = settings.PAGE_STORE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        if removed:
+            print(f"[PageStore] Pruned {removed} blobs")
+        return removed
+
+
+_store: Optional[PageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_page_store() -> PageStore:
+    """Shared page store for the whole process"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PageStore()
+    return _store
+
+
+def load_page_html(page: Dict) -> str:
+    """Raw HTML of a scraped page, loaded from the store on demand"""
+    if page.get('html_ref'):
+        return get_page_store().get_text(page['html_ref'])
+    return page.get('html', '')
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from typing import List, Optional
+
+from app.config import get_settings
+from app.services.render_profile import LIGHTWEIGHT_ARGUMENTS, should_block_request
+from app.services.rate_governor import get_rate_governor
+
+settings = get_settings()
+
+
+class PlaywrightRenderer:
+    """
+    One long-lived headless Chromium shared by every scan in the process.
+
+    - The browser is launched on first use and relaunched if it dies
+    - Playwright runs on its own event loop thread, so any worker thread can render
+    - Each batch gets a fresh browser context (no cookies leak between scans)
+      and its pages render concurrently in separate tabs, at most max_pages at once
+    """
+
+    def __init__(self, max_pages: Optional[int] = None, page_timeout: Optional[float] = None):
+        self.max_pages = max(1, max_pages or settings.PLAYWRIGHT_MAX_PAGES)
+        self.page_timeout = page_timeout or settings.RENDER_PAGE_DEADLINE
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = asyncio.Lock()
+        self._pages = asyncio.Semaphore(self.max_pages)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='playwright-renderer',
+                    daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    async def _get_browser(self):
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                from playwright.async_api import async_playwright
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                args = LIGHTWEIGHT_ARGUMENTS if settings.RENDER_BLOCK_RESOURCES else []
+                self._browser = await self._playwright.chromium.launch(headless=True, args=args)
+                print("[PlaywrightRenderer] Launched browser")
+            return self._browser
+
+    async def _route(self, route):
+        request = route.request
+        if should_block_request(request.url, request.resource_type):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _render_page(self, context, url: str) -> Optional[str]:
+        governor = get_rate_governor()
+        if governor is not None:
+            # Wait for the host's slot without blocking the other tabs
+            wait = governor.reserve(url, settings.RATE_GOVERNOR_MAX_WAIT)
+            if wait > settings.RATE_GOVERNOR_MAX_WAIT:
+                print(f"[PlaywrightRenderer] Skipping {url}: host is throttling requests")
+                return None
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        async with self._pages:
+            page = await context.new_page()
+            try:
+                started = time.monotonic()
+                response = None
+                try:
+                    response = await page.goto(url, wait_until='networkidle', timeout=self.page_timeout * 1000)
+                except Exception as e:
+                    # Pages that poll or stream never go idle; keep what has rendered so far
+                    if page.url in ('', 'about:blank'):
+                        if governor is not None:
+                            governor.record(url, None, time.monotonic() - started)
+                        raise
+                    print(f"[PlaywrightRenderer] {url} not idle after {self.page_timeout}s ({type(e).__name__}), using current DOM")
+                if governor is not None:
+                    status = response.status if response is not None else 200
+                    retry_after = response.headers.get('retry-after') if response is not None else None
+                    governor.record(url, status, time.monotonic() - started, retry_after)
+                return await page.content()
+            except Exception as e:
+                print(f"[PlaywrightRenderer] Render failed for {url}: {e}")
+                return None
+            finally:
+                await page.close()
+
+    async def _render_batch(self, urls: List[str], user_agent: Optional[str]) -> List[Optional[str]]:
+        browser = await self._get_browser()
+        context = await browser.new_context(user_agent=user_agent)
+        try:
+            await context.route('**/*', self._route)
+            return list(await asyncio.gather(*(self._render_page(context, url) for url in urls)))
+        finally:
+            await context.close()
+
+    def render_many(self, urls: List[str], user_agent: Optional[str] = None) -> List[Optional[str]]:
+        """
+        Rendered HTML for each URL (None where rendering failed), rendering
+        them concurrently. Blocks the calling thread until the batch is done.
+        """
+        if not urls:
+            return []
+        if self._closed:
+            return [None] * len(urls)
+
+        future = asyncio.run_coroutine_threadsafe(self._render_batch(urls, user_agent), self._ensure_loop())
+        # Pages beyond max_pages wait for a free tab, so allow one deadline per wave plus launch time
+        waves = -(-len(urls) // self.max_pages)
+        try:
+            return future.result(timeout=self.page_timeout * (waves + 1) + 30)
+        except Exception as e:
+            future.cancel()
+            print(f"[PlaywrightRenderer] Batch of {len(urls)} failed: {e}")
+            return [None] * len(urls)
+
+    def render(self, url: str, user_agent: Optional[str] = None) -> Optional[str]:
+        return self.render_many([url], user_agent)[0]
+
+    async def _shutdown(self):
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=15)
+        except Exception as e:
+            print(f"[PlaywrightRenderer] Shutdown failed: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+
+_renderer: Optional[PlaywrightRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_playwright_renderer() -> PlaywrightRenderer:
+    """Shared Playwright renderer for the whole process"""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = PlaywrightRenderer()
+    return _renderer
+
+
+def close_playwright_renderer():
+    """Close the shared browser (called on app shutdown)"""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is not None:
+            _renderer.close()
+            _renderer = None
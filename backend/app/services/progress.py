@@ -0,0 +1,97 @@
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.scan_event import ScanEvent
+
+settings = get_settings()
+
+# Status events that end a job's stream
+TERMINAL_STATUSES = {'succeeded', 'failed'}
+
+
+class ProgressPublisher:
+    """
+    Publishes a scan job's progress events to the scan_events table, where
+    the API streams them to clients. Publishing never raises: progress is
+    best-effort and must not fail a scan. Thread-safe.
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, **data):
+        try:
+            payload = json.dumps(data, default=str)
+            with self._lock:
+                db = SessionLocal()
+                try:
+                    db.add(ScanEvent(job_id=self.job_id, type=event_type, data=payload))
+                    db.commit()
+                finally:
+                    db.close()
+        except Exception as e:
+            print(f"[Progress] Could not publish {event_type} for job {self.job_id}: {e}")
+
+
+class NullPublisher:
+    """Used outside a job (debug endpoint, scripts): events are dropped"""
+
+    job_id = None
+
+    def publish(self, event_type: str, **data):
+        pass
+
+
+_NULL = NullPublisher()
+_current: ContextVar[Optional[ProgressPublisher]] = ContextVar('scan_progress', default=None)
+
+
+def current_progress():
+    """Publisher of the job running in this context (a no-op one if none)"""
+    return _current.get() or _NULL
+
+
+def publish(event_type: str, **data):
+    current_progress().publish(event_type, **data)
+
+
+@contextmanager
+def progress_scope(job_id: int):
+    """Route publish() calls in this context (and objects created in it) to `job_id`"""
+    token = _current.set(ProgressPublisher(job_id))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def events_after(db, job_id: int, after_id: int = 0, limit: int = 200) -> List[ScanEvent]:
+    return (
+        db.query(ScanEvent)
+        .filter(ScanEvent.job_id == job_id, ScanEvent.id > after_id)
+        .order_by(ScanEvent.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def prune_events(retention_hours: Optional[float] = None) -> int:
+    """Delete events older than the retention window"""
+    retention_hours = settings.SCAN_EVENTS_RETENTION_HOURS if retention_hours is None else retention_hours
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+    db = SessionLocal()
+    try:
+        removed = db.query(ScanEvent).filter(ScanEvent.created_at < cutoff).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    if removed:
+        print(f"[Progress] Pruned {removed} scan events")
+    return removed
@@ -0,0 +1,251 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from sqlalchemy.exc import IntegrityError
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.host_rate import HostRate
+
+settings = get_settings()
+
+# Status codes that mean "slow down" rather than "this page is broken"
+# (403 is how many WAFs and CDNs rate-limit crawlers)
+THROTTLE_STATUSES = {403, 429, 503}
+# Throttling responses worth retrying after their Retry-After pause
+RETRY_STATUSES = {429, 503}
+# Gateway errors: a sign of an overloaded origin, so they also cut the rate
+OVERLOAD_STATUSES = THROTTLE_STATUSES | {502, 504}
+
+# AIMD factors: rate multiplier on throttling/errors and on slow responses
+ERROR_DECREASE = 0.5
+SLOW_DECREASE = 0.8
+
+# Hosts not requested for this long are forgotten
+HOST_STATE_TTL = timedelta(days=1)
+
+T = TypeVar('T')
+
+
+def host_key(url: str) -> str:
+    """Host (and port) a request goes to, with www./apex folded together"""
+    host = urlsplit(url).netloc.lower().rsplit('@', 1)[-1]
+    return host[4:] if host.startswith('www.') else host
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostThrottled(Exception):
+    """The host asked us to back off for longer than a request may wait"""
+
+    def __init__(self, url: str, wait: float):
+        super().__init__(f"{host_key(url)} is throttling requests, next slot in {wait:.0f}s")
+        self.url = url
+        self.wait = wait
+
+
+class HostState:
+    """Pacing state of one host, as read from its HostRate row"""
+
+    FIELDS = ('rate', 'tat', 'crawl_delay', 'blocked_until', 'latency', 'requests', 'throttled', 'errors')
+
+    def __init__(self, row: HostRate):
+        for field in self.FIELDS:
+            setattr(self, field, getattr(row, field))
+
+    @property
+    def interval(self) -> float:
+        return max(1.0 / self.rate, self.crawl_delay)
+
+    def values(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class RateGovernor:
+    """
+    Per-host request pacing shared by every fetch on the machine (pages,
+    scripts, robots.txt/sitemaps and browser navigations, in the API and in
+    every worker process), so concurrent scans of one site share its budget
+    instead of each adding their own load.
+
+    - Token bucket (GCRA): requests to a host start at most `rate` per second,
+      with bursts of RATE_GOVERNOR_BURST
+    - AIMD: fast successful (2xx/3xx) responses raise the rate additively;
+      throttling (403/429/503), gateway and network errors and responses
+      slower than the latency target cut it multiplicatively, within
+      [RATE_GOVERNOR_MIN_RATE, RATE_GOVERNOR_MAX_RATE]. Other 4xx leave it as is
+    - Retry-After pauses the host; robots.txt Crawl-delay caps its rate
+
+    Host state lives in the host_rates table. Each change reads the row and
+    writes it back only if no other process changed it in between (else it
+    retries), like JobQueue's conditional claims. Waiting happens outside
+    the database: reserve() hands out a start time and the caller sleeps
+    until then.
+    """
+
+    def __init__(
+        self,
+        initial_rate: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        target_latency: Optional[float] = None
+    ):
+        self.min_rate = min_rate or settings.RATE_GOVERNOR_MIN_RATE
+        self.max_rate = max(self.min_rate, max_rate or settings.RATE_GOVERNOR_MAX_RATE)
+        self.initial_rate = min(self.max_rate, max(self.min_rate, initial_rate or settings.RATE_GOVERNOR_INITIAL_RATE))
+        self.burst = max(1, burst or settings.RATE_GOVERNOR_BURST)
+        self.target_latency = target_latency or settings.RATE_GOVERNOR_TARGET_LATENCY
+        self.increase = settings.RATE_GOVERNOR_INCREASE
+
+    def _create(self, db, host: str):
+        """Insert the host's row (another process may win the race) and forget idle hosts"""
+        now = datetime.now(timezone.utc)
+        try:
+            db.query(HostRate).filter(HostRate.updated_at < now - HOST_STATE_TTL).delete(synchronize_session=False)
+            db.add(HostRate(host=host, rate=self.initial_rate, updated_at=now))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+
+    def _update(self, url: str, change: Callable[[HostState, float], T]) -> T:
+        """
+        Apply `change(state, now)` to the host's state (now is Unix time) and
+        store the result unless another process wrote the row first, in which
+        case it is re-read and `change` runs again
+        """
+        host = host_key(url)
+        db = SessionLocal()
+        try:
+            while True:
+                row = db.query(HostRate).filter(HostRate.host == host).first()
+                if row is None:
+                    self._create(db, host)
+                    continue
+                state = HostState(row)
+                result = change(state, time.time())
+                values = state.values()
+                if values == HostState(row).values():
+                    db.rollback()
+                    return result
+                updated = (
+                    db.query(HostRate)
+                    .filter(HostRate.host == host, HostRate.version == row.version)
+                    .update(
+                        {**values, 'version': row.version + 1, 'updated_at': datetime.now(timezone.utc)},
+                        synchronize_session=False
+                    )
+                )
+                db.commit()
+                if updated == 1:
+                    return result
+        finally:
+            db.close()
+
+    def reserve(self, url: str, max_wait: Optional[float] = None) -> float:
+        """
+        Book the next request slot for the URL's host; returns seconds to wait
+        before sending. If that is more than `max_wait`, nothing is booked.
+        """
+        def book(state: HostState, now: float) -> float:
+            interval = state.interval
+            start = max(now, state.tat - interval * (self.burst - 1), state.blocked_until)
+            if max_wait is not None and start - now > max_wait:
+                return start - now
+            state.tat = max(state.tat, start) + interval
+            state.requests += 1
+            return start - now
+
+        return self._update(url, book)
+
+    def acquire(self, url: str):
+        """Block until a request to the URL's host may start; HostThrottled if that is too far off"""
+        max_wait = settings.RATE_GOVERNOR_MAX_WAIT
+        wait = self.reserve(url, max_wait)
+        if wait > max_wait:
+            raise HostThrottled(url, wait)
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, url: str, status_code: Optional[int], latency: float, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Adapt the host's rate to a response (status_code None = network error).
+        Returns the Retry-After pause in seconds, if the response asked for one.
+        """
+        pause = parse_retry_after(retry_after) if status_code in THROTTLE_STATUSES else None
+
+        def adapt(state: HostState, now: float):
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+            if status_code is None or status_code in OVERLOAD_STATUSES:
+                if status_code in THROTTLE_STATUSES:
+                    state.throttled += 1
+                else:
+                    state.errors += 1
+                state.rate = max(self.min_rate, state.rate * ERROR_DECREASE)
+                if pause is not None:
+                    state.blocked_until = max(state.blocked_until, now + pause)
+            elif latency > self.target_latency:
+                state.rate = max(self.min_rate, state.rate * SLOW_DECREASE)
+            elif 200 <= status_code < 400:
+                state.rate = min(self.max_rate, state.rate + self.increase)
+
+        self._update(url, adapt)
+        return pause
+
+    def set_crawl_delay(self, url: str, delay: float):
+        """Space requests to the host at least `delay` seconds apart (robots.txt Crawl-delay)"""
+        def apply(state: HostState, now: float):
+            state.crawl_delay = max(state.crawl_delay, delay)
+
+        self._update(url, apply)
+
+    def stats(self, url: str) -> Dict:
+        db = SessionLocal()
+        try:
+            state = db.query(HostRate).filter(HostRate.host == host_key(url)).first()
+        finally:
+            db.close()
+        if state is None:
+            return {}
+        return {
+            'rate': round(state.rate, 3),
+            'crawl_delay': state.crawl_delay,
+            'latency': round(state.latency, 3) if state.latency is not None else None,
+            'requests': state.requests,
+            'throttled': state.throttled,
+            'errors': state.errors,
+        }
+
+
+_governor: Optional[RateGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_governor() -> Optional[RateGovernor]:
+    """Governor for the process; its host state is shared with every other process (None if disabled)"""
+    global _governor
+    if not settings.RATE_GOVERNOR_ENABLED:
+        return None
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = RateGovernor()
+    return _governor
@@ -0,0 +1,73 @@
+import re
+from typing import Dict
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Pages with less visible text than this look like an unrendered shell
+THIN_TEXT_CHARS = 200
+
+# <div id="root"></div> style mount points left empty for the client to fill
+EMPTY_SPA_ROOT = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt|___gatsby|svelte|main-app|ember-app)["\'][^>]*>\s*</div>',
+    re.IGNORECASE
+)
+
+NOSCRIPT_BLOCK = re.compile(r'<noscript[^>]*>(.*?)</noscript>', re.IGNORECASE | re.DOTALL)
+NOSCRIPT_WARNING = re.compile(
+    r'enable javascript|javascript (?:is )?(?:required|disabled)|requires javascript|turn on javascript',
+    re.IGNORECASE
+)
+
+# Markers of client-side frameworks; only meaningful when little text is server-rendered
+FRAMEWORK_MARKERS = [
+    'data-reactroot', '__NEXT_DATA__', 'window.__NUXT__', 'ng-version', 'ng-app',
+    'data-v-app', 'data-server-rendered', '__INITIAL_STATE__', 'webpackJsonp',
+    '__APOLLO_STATE__', 'data-ember-extension', 'window.__remixContext',
+]
+
+
+def classify_render_need(raw_html: str, visible_text: str) -> Dict:
+    """
+    Decide from a static response whether the page is likely client-rendered
+    and therefore worth a browser render.
+
+    Returns the decision plus the signals behind it so the heuristic can be tuned
+    from scan metadata.
+    """
+    text_chars = len(visible_text or '')
+    html_chars = max(len(raw_html or ''), 1)
+    ratio = text_chars / html_chars
+    score = 0
+    reasons = []
+
+    if text_chars < THIN_TEXT_CHARS:
+        score += 3
+        reasons.append('thin_body')
+
+    if EMPTY_SPA_ROOT.search(raw_html or ''):
+        score += 3
+        reasons.append('empty_spa_root')
+
+    if any(NOSCRIPT_WARNING.search(block) for block in NOSCRIPT_BLOCK.findall(raw_html or '')):
+        score += 2
+        reasons.append('noscript_warning')
+
+    markers = [m for m in FRAMEWORK_MARKERS if m in (raw_html or '')]
+    if markers:
+        reasons.append('framework:' + ','.join(markers[:3]))
+        if ratio < 0.02:
+            score += 2
+
+    if ratio < 0.01:
+        score += 1
+        reasons.append('low_text_ratio')
+
+    return {
+        'render': score >= settings.RENDER_SCORE_THRESHOLD,
+        'score': score,
+        'reasons': reasons,
+        'text_chars': text_chars,
+        'text_ratio': round(ratio, 4),
+    }
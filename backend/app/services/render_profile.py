@@ -0,0 +1,104 @@
+from typing import List
+from urllib.parse import urlparse
+
+from selenium.webdriver.chrome.options import Options
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Asset types that never contribute DOM text
+BLOCKED_EXTENSIONS = [
+    # images
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'bmp', 'ico', 'svg',
+    # fonts
+    'woff', 'woff2', 'ttf', 'otf', 'eot',
+    # audio / video
+    'mp4', 'webm', 'ogg', 'mp3', 'wav', 'm4a', 'mov', 'avi', 'm3u8', 'ts',
+]
+
+# Analytics, ads, tag managers, session replay and chat widgets
+BLOCKED_HOSTS = [
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com',
+    'googlesyndication.com', 'doubleclick.net', 'adservice.google.com',
+    'connect.facebook.net', 'facebook.com/tr', 'analytics.tiktok.com',
+    'snap.licdn.com', 'px.ads.linkedin.com', 'bat.bing.com', 'static.ads-twitter.com',
+    'hotjar.com', 'fullstory.com', 'clarity.ms', 'mouseflow.com', 'crazyegg.com',
+    'segment.com', 'segment.io', 'mixpanel.com', 'amplitude.com', 'heap.io',
+    'newrelic.com', 'nr-data.net', 'sentry.io', 'optimizely.com',
+    'intercom.io', 'intercomcdn.com', 'drift.com', 'zopim.com', 'tawk.to',
+    'criteo.com', 'criteo.net', 'taboola.com', 'outbrain.com', 'adnxs.com',
+    'scorecardresearch.com', 'quantserve.com', 'hubspot.com/analytics', 'hs-analytics.net',
+]
+
+# Resource types (Playwright naming) dropped by should_block_request
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+
+# Chrome switches for a text-only headless render
+LIGHTWEIGHT_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+    "--autoplay-policy=user-gesture-required",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-domain-reliability",
+    "--disable-notifications",
+    "--disable-remote-fonts",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions",
+    "--no-first-run",
+    "--window-size=1280,1024",
+]
+
+# 2 = block
+LIGHTWEIGHT_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+    'profile.managed_default_content_settings.notifications': 2,
+    'profile.managed_default_content_settings.geolocation': 2,
+    'profile.managed_default_content_settings.plugins': 2,
+    'profile.default_content_setting_values.automatic_downloads': 2,
+}
+
+
+def blocked_url_patterns() -> List[str]:
+    """URL patterns for CDP Network.setBlockedURLs (`*` wildcards)"""
+    patterns = [f"*.{ext}" for ext in BLOCKED_EXTENSIONS]
+    patterns += [f"*.{ext}?*" for ext in BLOCKED_EXTENSIONS]
+    patterns += [f"*{host}*" for host in BLOCKED_HOSTS]
+    if settings.RENDER_BLOCK_STYLESHEETS:
+        patterns += ["*.css", "*.css?*"]
+    return patterns
+
+
+def apply_lightweight_options(chrome_options: Options):
+    """Add the lightweight switches and content settings to Chrome options"""
+    if not settings.RENDER_BLOCK_RESOURCES:
+        return
+    for argument in LIGHTWEIGHT_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    chrome_options.add_experimental_option('prefs', LIGHTWEIGHT_PREFS)
+
+
+def install_request_blocking(driver):
+    """Block asset and tracker requests for every page this driver loads"""
+    if not settings.RENDER_BLOCK_RESOURCES:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns()})
+
+
+def should_block_request(url: str, resource_type: str) -> bool:
+    """Same policy for request-interception APIs that expose the resource type"""
+    if not settings.RENDER_BLOCK_RESOURCES:
+        return False
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    if resource_type == 'stylesheet' and settings.RENDER_BLOCK_STYLESHEETS:
+        return True
+    parsed = urlparse(url)
+    target = f"{parsed.netloc}{parsed.path}".lower()
+    return any(host in target for host in BLOCKED_HOSTS)
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.scan import Scan
+from app.models.scan_cache import ScanCacheEntry
+from app.services.crawl_frontier import canonicalize_url
+
+settings = get_settings()
+
+
+def domain_key(url: str) -> str:
+    """Cache key for a site: host (and non-default port) with www./apex and http/https folded together"""
+    host = urlsplit(canonicalize_url(url)).netloc
+    return host[4:] if host.startswith('www.') else host
+
+
+class ScanCache:
+    """
+    Reuse of recent scan results per site. A scan stays fresh for
+    SCAN_CACHE_TTL_HOURS after it was made (0 disables reuse); deleted scans
+    are never returned.
+    """
+
+    def __init__(self, db: Session, ttl_hours: Optional[float] = None):
+        self.db = db
+        self.ttl_hours = settings.SCAN_CACHE_TTL_HOURS if ttl_hours is None else ttl_hours
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_hours > 0
+
+    def lookup(self, key: str) -> Optional[int]:
+        """Id of a fresh scan of the site, or None"""
+        return self.lookup_many([key]).get(key)
+
+    def lookup_many(self, keys: Iterable[str]) -> Dict[str, int]:
+        """Fresh scan ids by domain key, for the keys that have one"""
+        keys = list(set(keys))
+        if not self.enabled or not keys:
+            return {}
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.ttl_hours)
+        rows = (
+            self.db.query(ScanCacheEntry.domain_key, ScanCacheEntry.scan_id)
+            .join(Scan, Scan.id == ScanCacheEntry.scan_id)
+            .filter(ScanCacheEntry.domain_key.in_(keys), ScanCacheEntry.scanned_at >= cutoff)
+            .all()
+        )
+        return {key: scan_id for key, scan_id in rows}
+
+    def store(self, key: str, scan_id: int):
+        """Make `scan_id` the site's latest scan"""
+        self.db.merge(ScanCacheEntry(domain_key=key, scan_id=scan_id, scanned_at=datetime.now(timezone.utc)))
+        self.db.commit()
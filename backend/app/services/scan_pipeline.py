@@ -0,0 +1,81 @@
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.scan import Scan
+from app.services.ultimate_scraper import scrape_website_ultimate
+from app.services.ultimate_extractor import extract_contacts_in_pool
+from app.services.llm_services import process_with_llm
+from app.services.database_services import DatabaseService
+from app.services.link_yield import aggregate_page_yields
+from app.services.scan_cache import ScanCache, domain_key
+from app.services.incremental_scan import IncrementalScan
+
+settings = get_settings()
+
+
+class ScanFailed(Exception):
+    """The site could not be scanned; retrying will not help"""
+
+
+def run_scan_pipeline(website_url: str, db: Session) -> Scan:
+    """
+    Ultimate scan pipeline: scrape -> extract -> LLM -> save.
+    Raises ScanFailed for permanent failures; other exceptions may be transient.
+    """
+    print(f"\n{'='*80}")
+    print(f"[Pipeline] ULTIMATE SCAN INITIATED")
+    print(f"[Pipeline] URL: {website_url}")
+    print(f"{'='*80}\n")
+
+    db_service = DatabaseService(db)
+
+    # Step 1: Ultimate scraping, visiting links in order of past yield
+    scraped = scrape_website_ultimate(
+        url=website_url,
+        max_pages=10,
+        use_selenium=True,
+        yield_model=db_service.load_yield_model()
+    )
+
+    if scraped.get('error'):
+        raise ScanFailed(scraped['error'])
+
+    try:
+        db_service.record_path_yields(aggregate_page_yields(scraped['metadata']['page_yields']))
+    except Exception as e:
+        db.rollback()
+        print(f"[Pipeline] Could not record link yields: {e}")
+
+    # Step 2: Ultimate extraction (only changed pages when the site was scanned before)
+    incremental = IncrementalScan.load(db, website_url) if settings.SCAN_INCREMENTAL_ENABLED else None
+    contacts = incremental.extract(scraped) if incremental else extract_contacts_in_pool(scraped)
+
+    # Step 3: LLM processing, skipped when its input is unchanged since the last scan
+    structured_result = incremental.reusable_result() if incremental else None
+    llm_skipped = structured_result is not None
+    if structured_result is None:
+        structured_result = process_with_llm(
+            website_url=scraped['base_url'],
+            scraped_text=scraped['combined_text'],
+            extracted_contacts=contacts
+        )
+    if incremental:
+        structured_result = incremental.finish(structured_result, llm_skipped=llm_skipped)
+
+    # Step 4: Save to database
+    scan = db_service.create_scan(
+        website_url=scraped['base_url'],
+        structured_data=structured_result
+    )
+    ScanCache(db).store(domain_key(website_url), scan.id)
+    if incremental:
+        incremental.record(db, scan.id)
+
+    print(f"\n{'='*80}")
+    print(f"[Pipeline] SCAN COMPLETE")
+    print(f"[Pipeline] Scan ID: {scan.id}")
+    print(f"[Pipeline] Emails: {len(structured_result.emails)}")
+    print(f"[Pipeline] Phones: {len(structured_result.phone_numbers)}")
+    print(f"{'='*80}\n")
+
+    return scan
@@ -1,10 +1,73 @@
+import json
 import re
-from typing import List, Dict, Set
+from typing import Iterable, List, Dict, Optional, Set
 from bs4 import BeautifulSoup
 import html as html_lib
 import phonenumbers
 from email_validator import validate_email, EmailNotValidError
 from urllib.parse import urlparse
+from app.services.page_store import load_page_html
+from app.services.progress import NullPublisher, current_progress
+from app.services.cpu_pool import run_cpu
+
+# Fields of a scrape result the extractor reads (all that is sent to the CPU pool)
+EXTRACTION_FIELDS = ('base_url', 'pages', 'combined_text', 'combined_html')
+
+# Bump when the page evidence format or the patterns producing it change, so stored evidence is re-extracted
+EVIDENCE_VERSION = 1
+
+# (platform, pattern), in the order social profiles are reported
+SOCIAL_PATTERNS = [
+    ('LinkedIn', r'linkedin\.com/company/[^\s\"\'\)><\]]+'),
+    ('LinkedIn', r'linkedin\.com/in/[^\s\"\'\)><\]]+'),
+    ('LinkedIn', r'linkedin\.com/school/[^\s\"\'\)><\]]+'),
+    ('Twitter', r'twitter\.com/[^\s\"\'\)><\]]+'),
+    ('Twitter', r'x\.com/[^\s\"\'\)><\]]+'),
+    ('Facebook', r'facebook\.com/[^\s\"\'\)><\]]+'),
+    ('Facebook', r'fb\.com/[^\s\"\'\)><\]]+'),
+    ('Instagram', r'instagram\.com/[^\s\"\'\)><\]]+'),
+    ('YouTube', r'youtube\.com/[^\s\"\'\)><\]]+'),
+    ('YouTube', r'youtu\.be/[^\s\"\'\)><\]]+'),
+    ('GitHub', r'github\.com/[^\s\"\'\)><\]]+'),
+    ('TikTok', r'tiktok\.com/@[^\s\"\'\)><\]]+'),
+    ('Pinterest', r'pinterest\.com/[^\s\"\'\)><\]]+'),
+]
+
+
+def combined_page_text(page: Dict) -> str:
+    """A page's part of the scraper's combined_text: heading, text and structured data"""
+    parts = [f"\n\n=== {page.get('title', '')} ({page['url']}) ===\n", page.get('text', '')]
+    if page.get('structured_data'):
+        parts.append(f"\n\nStructured Data: {json.dumps(page['structured_data'], indent=2)}")
+    return "\n".join(parts)
+
+
+def validate_emails(emails: Set[str]) -> Set[str]:
+    """Normalized emails that pass syntax checks and are not placeholders, assets or no-reply addresses"""
+    validated = set()
+    blacklist = [
+        'example.com', 'test.com', 'domain.com', 'yourcompany.com',
+        'yourdomain.com', 'company.com', 'email.com', 'mail.com',
+        'sentry.io', 'schema.org', 'wix.com', 'wordpress.com',
+        'gravatar.com', 'w3.org', 'localhost', '127.0.0.1',
+        'googleusercontent.com', 'googleapis.com',
+        'noreply', 'no-reply', 'donotreply', 'mailer-daemon',
+        '.png', '.jpg', '.jpeg', '.gif', '.svg', '.css', '.js'
+    ]
+    for email in emails:
+        email_clean = email.lower().strip()
+        if not (5 <= len(email_clean) <= 254):
+            continue
+        if any(bad in email_clean for bad in blacklist):
+            continue
+        if email_clean.count('@') != 1:
+            continue
+        try:
+            valid = validate_email(email_clean, check_deliverability=False)
+            validated.add(valid.email)
+        except EmailNotValidError:
+            continue
+    return validated
 
 
 class UltimateContactExtractor:
@@ -12,13 +75,16 @@ class UltimateContactExtractor:
     Military-grade contact extraction with validation
     """
     
-    def __init__(self, scraped_data: Dict):
+    def __init__(self, scraped_data: Dict, default_region: Optional[str] = None):
         self.scraped_data = scraped_data
         self.pages = scraped_data.get('pages', [])
         self.combined_text = scraped_data.get('combined_text', '')
+        # Legacy callers may still pass one big HTML string; otherwise raw
+        # page HTML is loaded from the page store one page at a time
         self.combined_html = scraped_data.get('combined_html', '')
         self.base_url = scraped_data.get('base_url', '')
-        self.default_region = self._infer_region()
+        # Pass the site's region when extracting a subset of its pages
+        self.default_region = default_region or self._infer_region()
     
     def _infer_region(self) -> str:
         url = self.base_url or (self.pages[0]['url'] if self.pages else '')
@@ -34,7 +100,7 @@ class UltimateContactExtractor:
             return 'IN'
         return 'US'
     
-    def extract_all(self) -> Dict:
+    def extract_all(self, publish_progress: bool = True) -> Dict:
         """
         Extract everything
         """
@@ -42,10 +108,17 @@ class UltimateContactExtractor:
         print("[Extractor] ULTIMATE EXTRACTION STARTING")
         print(f"{'='*60}\n")
         
+        # Partial results go out as each field completes, long before the LLM step ends
+        progress = current_progress() if publish_progress else NullPublisher()
+        progress.publish('phase', phase='extraction', message="Extracting contact details")
         emails = self._extract_emails()
+        progress.publish('contacts', emails=emails)
         phones = self._extract_phones()
+        progress.publish('contacts', emails=emails, phone_numbers=phones)
         socials = self._extract_socials()
+        progress.publish('contacts', emails=emails, phone_numbers=phones, socials=socials)
         addresses = self._extract_addresses()
+        progress.publish('contacts', emails=emails, phone_numbers=phones, socials=socials, addresses=addresses)
         
         print(f"\n{'='*60}")
         print("[Extractor] EXTRACTION COMPLETE")
@@ -61,6 +134,20 @@ class UltimateContactExtractor:
             'socials': socials,
             'addresses': addresses
         }
+
+    def page_evidence(self) -> Dict:
+        """
+        What extract_all() reads from these pages, before phones are scored and
+        socials de-duplicated across pages. Evidence of several page sets
+        merges into that of their union (see contacts_from_evidence).
+        """
+        return {
+            'version': EVIDENCE_VERSION,
+            'emails': self._extract_emails(),
+            'phones': self._phone_evidence(),
+            'socials': self._social_evidence(),
+            'addresses': self._extract_addresses()
+        }
     
     def _extract_emails(self) -> List[str]:
         """
@@ -89,7 +176,9 @@ class UltimateContactExtractor:
         emails.update(found)
         
         # Search in HTML
-        found_html = set(re.findall(pattern, self.combined_html, re.IGNORECASE))
+        found_html = set()
+        for html in self._iter_html():
+            found_html.update(re.findall(pattern, html, re.IGNORECASE))
         emails.update(found_html)
         
         # Search in decoded text
@@ -130,38 +219,24 @@ class UltimateContactExtractor:
                                 emails.add(item['email'])
         
         # Validate and filter
-        validated = self._validate_emails(emails)
+        validated = validate_emails(emails)
         
         print(f"[Extractor] Total valid emails: {len(validated)}")
         return sorted(list(validated))
     
-    def _validate_emails(self, emails: Set[str]) -> Set[str]:
-        validated = set()
-        blacklist = [
-            'example.com', 'test.com', 'domain.com', 'yourcompany.com',
-            'yourdomain.com', 'company.com', 'email.com', 'mail.com',
-            'sentry.io', 'schema.org', 'wix.com', 'wordpress.com',
-            'gravatar.com', 'w3.org', 'localhost', '127.0.0.1',
-            'googleusercontent.com', 'googleapis.com',
-            'noreply', 'no-reply', 'donotreply', 'mailer-daemon',
-            '.png', '.jpg', '.jpeg', '.gif', '.svg', '.css', '.js'
-        ]
-        for email in emails:
-            email_clean = email.lower().strip()
-            if not (5 <= len(email_clean) <= 254):
-                continue
-            if any(bad in email_clean for bad in blacklist):
-                continue
-            if email_clean.count('@') != 1:
-                continue
-            try:
-                valid = validate_email(email_clean, check_deliverability=False)
-                validated.add(valid.email)
-            except EmailNotValidError:
-                continue
-        return validated
+    def _iter_html(self):
+        """Yield raw HTML without holding every page in memory at once"""
+        if self.combined_html:
+            yield self.combined_html
+            return
+        for page in self.pages:
+            yield load_page_html(page)
 
     def _extract_phones(self) -> List[str]:
+        return self._select_phones(self._phone_evidence())
+
+    def _phone_evidence(self) -> Dict:
+        """Phone candidates with their per-source scores; context matches are scored once per site"""
         print("[Extractor] Extracting phone numbers...")
         raw = set()
         source_scores = {}
@@ -201,11 +276,6 @@ class UltimateContactExtractor:
                 for pattern in patterns:
                     for m in re.findall(pattern, line):
                         context_raw.add(m)
-        if context_raw:
-            raw.update(context_raw)
-            for m in context_raw:
-                k = re.sub(r'[^\d+]', '', str(m))
-                source_scores[k] = source_scores.get(k, 0) + 2
         structured_phones = set()
         for page in self.pages:
             sd = page.get('structured_data', {})
@@ -223,6 +293,18 @@ class UltimateContactExtractor:
                             k = re.sub(r'[^\d+]', '', str(item['telephone']))
                             source_scores[k] = source_scores.get(k, 0) + 3
         raw.update(structured_phones)
+        return {'raw': sorted(raw), 'scores': source_scores, 'context': sorted(context_raw)}
+
+    def _select_phones(self, evidence: Dict) -> List[str]:
+        """Validated, formatted phones from (possibly merged) phone evidence"""
+        raw = set(evidence['raw'])
+        source_scores = dict(evidence['scores'])
+        context_raw = set(evidence['context'])
+        if context_raw:
+            raw.update(context_raw)
+            for m in context_raw:
+                k = re.sub(r'[^\d+]', '', str(m))
+                source_scores[k] = source_scores.get(k, 0) + 2
         cleaned = set()
         for p in raw:
             s = re.sub(r'[^\d+]', '', str(p))
@@ -302,47 +384,41 @@ class UltimateContactExtractor:
         return formatted
 
     def _extract_socials(self) -> List[Dict[str, str]]:
+        return self._select_socials(self._social_evidence())
+
+    def _social_evidence(self) -> Dict:
+        """Matches of each SOCIAL_PATTERNS entry, in the combined text and in the raw HTML"""
         print("[Extractor] Extracting social media...")
+        evidence = {'text': [[] for _ in SOCIAL_PATTERNS], 'html': [[] for _ in SOCIAL_PATTERNS]}
+        for source, content in self._social_search_content():
+            for i, (_, pattern) in enumerate(SOCIAL_PATTERNS):
+                evidence[source][i].extend(m.group(0) for m in re.finditer(pattern, content, re.IGNORECASE))
+        return evidence
+
+    def _select_socials(self, evidence: Dict) -> List[Dict[str, str]]:
+        """Distinct profile URLs from (possibly merged) social evidence, in platform/pattern order"""
         socials = []
         seen = set()
-        search_content = self.combined_text + ' ' + self.combined_html
-        platforms = {
-            'LinkedIn': [
-                r'linkedin\.com/company/[^\s\"\'\)><\]]+',
-                r'linkedin\.com/in/[^\s\"\'\)><\]]+',
-                r'linkedin\.com/school/[^\s\"\'\)><\]]+'
-            ],
-            'Twitter': [
-                r'twitter\.com/[^\s\"\'\)><\]]+',
-                r'x\.com/[^\s\"\'\)><\]]+'
-            ],
-            'Facebook': [
-                r'facebook\.com/[^\s\"\'\)><\]]+',
-                r'fb\.com/[^\s\"\'\)><\]]+'
-            ],
-            'Instagram': [r'instagram\.com/[^\s\"\'\)><\]]+'],
-            'YouTube': [
-                r'youtube\.com/[^\s\"\'\)><\]]+',
-                r'youtu\.be/[^\s\"\'\)><\]]+'
-            ],
-            'GitHub': [r'github\.com/[^\s\"\'\)><\]]+'],
-            'TikTok': [r'tiktok\.com/@[^\s\"\'\)><\]]+'],
-            'Pinterest': [r'pinterest\.com/[^\s\"\'\)><\]]+'],
-        }
-        for platform, patterns in platforms.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, search_content, re.IGNORECASE)
-                for match in matches:
-                    url = match.group(0)
-                    url = url.rstrip('"\'>).,:;!?]')
-                    if not url.startswith('http'):
-                        url = 'https://' + url
-                    if url not in seen and len(url) < 200:
-                        socials.append({'platform': platform, 'url': url})
-                        seen.add(url)
+        for i, (platform, _) in enumerate(SOCIAL_PATTERNS):
+            for url in evidence['text'][i] + evidence['html'][i]:
+                url = url.rstrip('"\'>).,:;!?]')
+                if not url.startswith('http'):
+                    url = 'https://' + url
+                if url not in seen and len(url) < 200:
+                    socials.append({'platform': platform, 'url': url})
+                    seen.add(url)
         print(f"[Extractor] Found {len(socials)} social links")
         return socials
 
+    def _social_search_content(self):
+        """
+        (source, content) searched for social profiles: the combined text, then
+        each page's raw HTML (attributes, inline scripts and JSON-LD), one page at a time
+        """
+        yield 'text', self.combined_text
+        for html in self._iter_html():
+            yield 'html', html
+
     def _extract_addresses(self) -> List[str]:
         print("[Extractor] Extracting addresses...")
         addresses = set()
@@ -356,9 +432,13 @@ class UltimateContactExtractor:
                 if 15 < len(match) < 300:
                     addresses.add(match.strip())
         for page in self.pages:
-            soup = BeautifulSoup(page['html'], 'lxml')
-            for tag in soup.find_all('address'):
-                addr = tag.get_text(strip=True)
+            document = page.get('document')
+            if document is not None:
+                address_texts = document.addresses
+            else:
+                soup = BeautifulSoup(load_page_html(page), 'lxml')
+                address_texts = [tag.get_text(strip=True) for tag in soup.find_all('address')]
+            for addr in address_texts:
                 if 10 < len(addr) < 300:
                     addresses.add(addr)
         for page in self.pages:
@@ -379,14 +459,19 @@ class UltimateContactExtractor:
                         addresses.add(addr)
         print(f"[Extractor] Found {len(addresses)} addresses")
         return sorted(list(addresses))
-def extract_contacts_ultimate(scraped_data: Dict) -> Dict:
+def extract_contacts_ultimate(scraped_data: Dict, publish_progress: bool = True) -> Dict:
     """Main entry point for ultimate extraction"""
     try:
         extractor = UltimateContactExtractor(scraped_data)
-        return extractor.extract_all()
+        return extractor.extract_all(publish_progress=publish_progress)
     except Exception:
         text = scraped_data.get('combined_text', '') or ''
         html = scraped_data.get('combined_html', '') or ''
+        if not html:
+            try:
+                html = "\n\n".join(load_page_html(p) for p in scraped_data.get('pages', []))
+            except Exception:
+                html = ''
         # Minimal fallback using regex only
         email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         phones = set()
@@ -422,3 +507,67 @@ def extract_contacts_ultimate(scraped_data: Dict) -> Dict:
             'socials': socials,
             'addresses': []
         }
+
+
+def extract_page_evidence(page: Dict, base_url: str, default_region: str) -> Optional[Dict]:
+    """
+    Evidence of a single page, for reuse while the page is unchanged (no
+    progress events). None if extraction failed; the page then contributes nothing.
+    """
+    scraped = {
+        'base_url': base_url,
+        'pages': [page],
+        'combined_text': combined_page_text(page),
+    }
+    try:
+        return UltimateContactExtractor(scraped, default_region=default_region).page_evidence()
+    except Exception as e:
+        print(f"[Extractor] Page extraction failed for {page.get('url')}: {e}")
+        return None
+
+
+def merge_evidence(evidence: Iterable[Optional[Dict]]) -> Dict:
+    """Evidence of several pages (in crawl order) as if extracted from them together"""
+    emails, addresses = set(), set()
+    raw, context, scores = set(), set(), {}
+    socials = {'text': [[] for _ in SOCIAL_PATTERNS], 'html': [[] for _ in SOCIAL_PATTERNS]}
+    for page in evidence:
+        if not page:
+            continue
+        emails.update(page['emails'])
+        addresses.update(page['addresses'])
+        raw.update(page['phones']['raw'])
+        context.update(page['phones']['context'])
+        for key, score in page['phones']['scores'].items():
+            scores[key] = scores.get(key, 0) + score
+        for source in ('text', 'html'):
+            for matches, page_matches in zip(socials[source], page['socials'][source]):
+                matches.extend(page_matches)
+    return {
+        'version': EVIDENCE_VERSION,
+        'emails': sorted(emails),
+        'phones': {'raw': sorted(raw), 'scores': scores, 'context': sorted(context)},
+        'socials': socials,
+        'addresses': sorted(addresses)
+    }
+
+
+def contacts_from_evidence(evidence: Iterable[Optional[Dict]], base_url: str, default_region: str) -> Dict:
+    """
+    Site contacts from per-page evidence: the same result as extract_all() on
+    all the pages, with phone scores summed and socials de-duplicated across pages
+    """
+    merged = merge_evidence(evidence)
+    extractor = UltimateContactExtractor({'base_url': base_url}, default_region=default_region)
+    return {
+        'emails': merged['emails'],
+        'phone_numbers': extractor._select_phones(merged['phones']),
+        'socials': extractor._select_socials(merged['socials']),
+        'addresses': merged['addresses']
+    }
+
+
+def extract_contacts_in_pool(scraped_data: Dict, publish_progress: bool = True) -> Dict:
+    """extract_contacts_ultimate in the CPU pool (inline if it is disabled)"""
+    payload = {key: scraped_data[key] for key in EXTRACTION_FIELDS if key in scraped_data}
+    return run_cpu(extract_contacts_ultimate, payload, publish_progress)
@@ -1,18 +1,30 @@
-import requests
-from bs4 import BeautifulSoup
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from typing import Dict, List, Set, Optional, Tuple
+from selenium.common.exceptions import TimeoutException
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse, parse_qs
 import time
 import re
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from fake_useragent import UserAgent
-import json
+from app.services.fetch_engine import AsyncFetchEngine, PolitenessPolicy
+from app.services.http_client import get_http_client, ByteBudget, ResponseRejected, HTML_CONTENT_TYPES
+from app.services.browser_pool import PooledBrowser, get_browser_pool
+from app.services.render_classifier import classify_render_need
+from app.services.page_readiness import wait_for_page_settled
+from app.services.page_model import ParsedPage
+from app.services.html_parsers import decode_html
+from app.services.cpu_pool import run_cpu
+from app.services.ultimate_extractor import combined_page_text
+from app.services.page_store import get_page_store
+from app.services.link_discovery import SiteLinks, discover_site_links_async
+from app.services.link_yield import YieldModel
+from app.services.crawl_monitor import CrawlMonitor
+from app.services.crawl_frontier import CrawlFrontier, site_host
+from app.services.rate_governor import get_rate_governor
+from app.services.progress import current_progress
+from app.config import get_settings
+
+settings = get_settings()
 
 
 class UltimateWebScraper:
@@ -20,13 +32,42 @@ class UltimateWebScraper:
     The most advanced web scraper - handles everything
     """
     
-    def __init__(self, base_url: str, max_pages: int = 10, use_selenium: bool = True):
+    def __init__(
+        self,
+        base_url: str,
+        max_pages: int = 10,
+        use_selenium: bool = True,
+        politeness: Optional[PolitenessPolicy] = None,
+        yield_model: Optional[YieldModel] = None
+    ):
         self.base_url = self._normalize_url(base_url)
         self.max_pages = max_pages
         self.use_selenium = use_selenium
-        self.visited_urls: Set[str] = set()
+        self.politeness = politeness or PolitenessPolicy()
+        self.crawl_delay = 0.0
+        self.yield_model = yield_model or YieldModel()
         self.scraped_pages: List[Dict] = []
         self.contact_forms: List[Dict] = []
+        self.render_decisions: List[Dict] = []
+        self.render_timings: List[Dict] = []
+        self.byte_budget = ByteBudget(settings.SCRAPER_MAX_SCAN_BYTES)
+        self.truncated_pages: List[Dict] = []
+        self.skipped_pages: List[Dict] = []
+        self.site_links: Optional[SiteLinks] = None
+        self.page_yields: List[Dict] = []
+        # Same host rule as the extractor's region guess
+        host = site_host(self.base_url)
+        self.crawl_monitor = CrawlMonitor(default_region='IN' if host.endswith('.in') else 'US')
+        self.pages_skipped_by_stop: List[str] = []
+        self.frontier = CrawlFrontier(
+            self.yield_model.expected_yield,
+            max_depth=settings.SCRAPER_MAX_DEPTH,
+            min_score=self.yield_model.min_expected,
+            explore_slots=settings.LINK_YIELD_EXPLORE_PAGES
+        )
+        self.frontier_end_reason = 'frontier_exhausted'
+        # Captured here: fetch worker threads do not inherit the caller's context
+        self.progress = current_progress()
         
         # Generate random user agent
         ua = UserAgent()
@@ -45,6 +86,7 @@ class UltimateWebScraper:
             'Cache-Control': 'max-age=0',
         }
         
+        self.selenium_browser: Optional[PooledBrowser] = None
         self.selenium_driver: Optional[webdriver.Chrome] = None
     
     def _normalize_url(self, url: str) -> str:
@@ -59,45 +101,38 @@ class UltimateWebScraper:
         return urlparse(url).netloc
     
     def _is_same_domain(self, url: str) -> bool:
-        """Check if URL is from same domain"""
-        return self._get_domain(url) == self._get_domain(self.base_url)
+        """Check if URL is from same site (www. and apex count as one)"""
+        return site_host(url) == site_host(self.base_url)
     
     def _init_selenium(self):
-        """Initialize Selenium driver"""
+        """Borrow a warm browser from the shared pool for this scan"""
         if self.selenium_driver:
             return
         
-        print("[Scraper] Initializing Selenium WebDriver...")
-        
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument(f"user-agent={self.user_agent}")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
+        print("[Scraper] Borrowing Selenium browser from pool...")
         
         try:
-            service = Service(ChromeDriverManager().install())
-            self.selenium_driver = webdriver.Chrome(service=service, options=chrome_options)
-            # Execute script to hide webdriver
-            self.selenium_driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            print("[Scraper] Selenium initialized successfully")
+            self.selenium_browser = get_browser_pool().acquire(user_agent=self.user_agent)
         except Exception as e:
             print(f"[Scraper] Selenium initialization failed: {e}")
-            self.selenium_driver = None
+            self.selenium_browser = None
+        
+        if self.selenium_browser:
+            self.selenium_driver = self.selenium_browser.driver
+            print("[Scraper] Selenium browser ready")
+        else:
+            print("[Scraper] No Selenium browser available")
     
     def _close_selenium(self):
-        """Close Selenium driver"""
-        if self.selenium_driver:
+        """Return the borrowed browser to the pool"""
+        if self.selenium_browser:
             try:
-                self.selenium_driver.quit()
-                print("[Scraper] Selenium closed")
-            except:
+                get_browser_pool().release(self.selenium_browser)
+                print("[Scraper] Selenium browser returned to pool")
+            except Exception:
                 pass
-            self.selenium_driver = None
+        self.selenium_browser = None
+        self.selenium_driver = None
     
     def scrape(self) -> Dict:
         """
@@ -110,9 +145,16 @@ class UltimateWebScraper:
         print(f"[Scraper] Selenium: {'Enabled' if self.use_selenium else 'Disabled'}")
         print(f"{'='*60}\n")
         
+        # robots.txt / sitemap discovery runs while the homepage is fetched
+        discovery = (
+            discover_site_links_async(self.base_url, self.headers)
+            if settings.LINK_DISCOVERY_ENABLED else None
+        )
+        
         try:
             # Phase 1: Scrape homepage
             print("[Scraper] PHASE 1: Scraping Homepage")
+            self.progress.publish('phase', phase='homepage', message=f"Scraping {self.base_url}")
             homepage_data = self._scrape_page(self.base_url, priority=True)
             
             if not homepage_data:
@@ -120,36 +162,39 @@ class UltimateWebScraper:
             
             # Phase 2: Discover all relevant links
             print("\n[Scraper] PHASE 2: Discovering Links")
+            self.progress.publish('phase', phase='link_discovery', message="Discovering links")
+            self.site_links = self._await_site_links(discovery)
+            self._apply_crawl_delay()
             all_links = self._discover_links(homepage_data)
-            contact_links = self._prioritize_contact_links(all_links)
+            for link in all_links:
+                self.frontier.add(link, depth=1)
             
             print(f"[Scraper] Found {len(all_links)} total links")
-            print(f"[Scraper] Found {len(contact_links)} priority contact links")
+            print(f"[Scraper] Queued {len(self.frontier)} priority contact links")
             
-            # Phase 3: Scrape priority pages
+            # Phase 3: Crawl the frontier, best expected yield first
             print("\n[Scraper] PHASE 3: Scraping Priority Pages")
-            pages_to_scrape = contact_links[:self.max_pages - 1]
-            
-            for i, url in enumerate(pages_to_scrape, 1):
-                if url in self.visited_urls:
-                    continue
-                
-                print(f"[Scraper] Scraping page {i}/{len(pages_to_scrape)}: {url}")
-                time.sleep(1)  # Polite delay
-                self._scrape_page(url, priority=True)
+            self.progress.publish(
+                'phase', phase='priority_pages', message=f"Scraping {len(self.frontier)} priority pages",
+                links_found=len(all_links), queued=len(self.frontier)
+            )
+            contact_links = self._crawl_frontier()
             
             # Phase 4: Deep scrape with Selenium if enabled
-            if self.use_selenium and len(self.scraped_pages) < 3:
+            if self.crawl_monitor.should_stop():
+                print(f"\n[Scraper] PHASE 4: Skipped ({self.crawl_monitor.stop_reason})")
+            elif self.use_selenium and len(self.scraped_pages) < 3:
                 print("\n[Scraper] PHASE 4: Deep Selenium Scraping")
+                self.progress.publish('phase', phase='deep_scrape', message="Rendering pages in a browser")
                 self._selenium_deep_scrape([self.base_url] + contact_links[:2])
             
             # Phase 5: Detect contact forms
             print("\n[Scraper] PHASE 5: Detecting Contact Forms")
+            self.progress.publish('phase', phase='forms', message="Detecting contact forms")
             self._detect_contact_forms()
             
             # Compile results
             combined_text = self._combine_text()
-            combined_html = self._combine_html()
             
             print(f"\n{'='*60}")
             print(f"[Scraper] SCRAPING COMPLETE")
@@ -162,13 +207,29 @@ class UltimateWebScraper:
                 'base_url': self.base_url,
                 'pages': self.scraped_pages,
                 'combined_text': combined_text,
-                'combined_html': combined_html,
                 'pages_scraped': len(self.scraped_pages),
                 'contact_forms': self.contact_forms,
                 'metadata': {
-                    'total_links_found': len(all_links),
-                    'priority_links': len(contact_links),
+                    'total_links_found': self.frontier.discovered,
+                    'priority_links': self.frontier.discovered - self.frontier.rejected,
+                    'exploration_pages': self.frontier.explored,
+                    'max_depth': self.frontier.max_depth,
+                    'duplicate_pages': self.frontier.duplicates,
+                    'sitemap_links': len(self.site_links.urls) if self.site_links else 0,
+                    'crawl_delay': self.crawl_delay,
+                    'rate_governor': self._governor_stats(),
+                    'page_yields': self.page_yields,
+                    'stop_reason': self.crawl_monitor.stop_reason or self.frontier_end_reason,
+                    'pages_skipped_by_stop': self.pages_skipped_by_stop,
+                    'contacts_found': self.crawl_monitor.summary()['fields_found'],
                     'selenium_used': self.use_selenium,
+                    'pages_rendered': sum(1 for d in self.render_decisions if d['render']),
+                    'render_decisions': self.render_decisions,
+                    'render_timings': self.render_timings,
+                    'bytes_downloaded': self.byte_budget.used,
+                    'byte_budget_exhausted': self.byte_budget.exhausted,
+                    'truncated_pages': self.truncated_pages,
+                    'skipped_pages': self.skipped_pages,
                 }
             }
             
@@ -179,56 +240,136 @@ class UltimateWebScraper:
         """
         Scrape single page with multiple strategies
         """
-        if url in self.visited_urls:
+        if self.frontier.is_visited(url):
             return None
         
-        self.visited_urls.add(url)
+        self.frontier.mark_visited(url)
         
         # Try static scraping first
         page_data = self._static_scrape(url)
-        
-        # If priority page and Selenium available, also try dynamic scraping
-        if priority and self.use_selenium and page_data:
-            dynamic_data = self._dynamic_scrape(url)
-            if dynamic_data and len(dynamic_data['text']) > len(page_data.get('text', '')):
-                print(f"[Scraper] ✓ Selenium found more content for {url}")
-                page_data = dynamic_data
+        if page_data and not self.frontier.claim_final_url(url, page_data['final_url']):
+            return None
+        return self._finish_page(url, page_data, priority)
+    
+    def _finish_page(self, url: str, page_data: Optional[Dict], priority: bool) -> Optional[Dict]:
+        """
+        Optionally upgrade a statically fetched page with Selenium, then record it
+        """
+        if page_data and 'new_contacts' not in page_data:
+            self._observe(page_data)
+        
+        # If priority page looks client-rendered and Selenium is available, render it
+        # (not needed once the crawl monitor has everything it wants)
+        if priority and self.use_selenium and page_data and not self.crawl_monitor.should_stop():
+            decision = page_data.get('render_hint') or {'render': True, 'score': None, 'reasons': ['no_hint']}
+            record = {
+                'url': url,
+                'render': decision['render'],
+                'score': decision['score'],
+                'reasons': decision['reasons'],
+                'static_chars': len(page_data.get('text', '')),
+            }
+            
+            if decision['render']:
+                print(f"[Scraper] Rendering {url} ({', '.join(decision['reasons'])})")
+                dynamic_data = self._dynamic_scrape(url)
+                if not dynamic_data:
+                    record['outcome'] = 'render_failed'
+                else:
+                    record['rendered_chars'] = len(dynamic_data['text'])
+                    if len(dynamic_data['text']) > len(page_data.get('text', '')):
+                        print(f"[Scraper] ✓ Selenium found more content for {url}")
+                        dynamic_data['new_contacts'] = page_data.get('new_contacts', 0)
+                        page_data = self._observe(dynamic_data, new_page=False)
+                        record['outcome'] = 'render_gained'
+                    else:
+                        record['outcome'] = 'render_no_gain'
+            else:
+                print(f"[Scraper] Skipping render for {url} (server-rendered)")
+                record['outcome'] = 'static_only'
+            
+            self.render_decisions.append(record)
         
         if page_data:
+            if url != self.base_url:
+                self.page_yields.append({'url': url, 'new_contacts': page_data['new_contacts']})
             self.scraped_pages.append(page_data)
             return page_data
         
         return None
     
+    def _observe(self, page_data: Optional[Dict], new_page: bool = True) -> Optional[Dict]:
+        """Feed a page to the crawl monitor and record how many new contacts it added"""
+        if page_data is not None:
+            new_contacts = self.crawl_monitor.observe(page_data, new_page)
+            page_data['new_contacts'] = page_data.get('new_contacts', 0) + new_contacts
+            self.progress.publish(
+                'page',
+                url=page_data.get('final_url') or page_data['url'],
+                rendered=not new_page,
+                new_contacts=new_contacts,
+                fields_found=self.crawl_monitor.summary()['fields_found'],
+                emails=self.crawl_monitor.found('emails')
+            )
+        return page_data
+    
+    def _fetch_and_observe(self, url: str) -> Optional[Dict]:
+        """Phase 3 fetch: static scrape plus quick extraction, on a fetch worker thread"""
+        page_data = self._static_scrape(url)
+        if page_data and not self.frontier.claim_final_url(url, page_data['final_url']):
+            print(f"[Scraper] Skipping {url}: redirects to an already scraped page")
+            return None
+        return self._observe(page_data)
+    
     def _static_scrape(self, url: str) -> Optional[Dict]:
         """
-        Static HTML scraping with requests + BeautifulSoup
+        Static HTML scraping with the pooled HTTP client + fast HTML parser
         """
+        allowance = self.byte_budget.reserve(settings.SCRAPER_MAX_PAGE_BYTES)
+        if allowance <= 0:
+            print(f"[Scraper] ✗ Scan byte budget exhausted, skipping {url}")
+            self.skipped_pages.append({'url': url, 'reason': 'scan_byte_budget'})
+            return None
+        
+        used = 0
         try:
-            session = requests.Session()
-            response = session.get(url, headers=self.headers, timeout=15, allow_redirects=True)
+            response = get_http_client().get(
+                url,
+                headers=self.headers,
+                timeout=15,
+                max_bytes=allowance,
+                accept_types=HTML_CONTENT_TYPES
+            )
+            used = len(response.content)
             response.raise_for_status()
             
-            # Try multiple parsers for robustness
-            for parser in ['lxml', 'html5lib', 'html.parser']:
-                try:
-                    soup = BeautifulSoup(response.content, parser)
-                    break
-                except:
-                    continue
-            else:
-                print(f"[Scraper] ✗ All parsers failed for {url}")
-                return None
+            if response.truncated:
+                reason = 'page_byte_cap' if allowance >= settings.SCRAPER_MAX_PAGE_BYTES else 'scan_byte_budget'
+                print(f"[Scraper] ⚠ Truncated {url} at {used:,} bytes ({reason})")
+                self.truncated_pages.append({'url': url, 'bytes': used, 'reason': reason})
             
-            # Extract comprehensive data
-            page_data = self._extract_page_data(soup, url, response.text)
+            # Extract comprehensive data. Decode from the bytes so a missing or
+            # bogus header charset falls back to <meta>/BOM detection
+            raw_html = decode_html(response.content, response.encoding)
+            # Resolve links against where the page actually lives after redirects
+            page_data = self._extract_page_data(response.url, raw_html)
+            page_data['url'] = url
+            page_data['final_url'] = response.url
+            # Body text alone: contact sections are already part of it
+            page_data['render_hint'] = classify_render_need(raw_html, page_data['document'].text)
             
             print(f"[Scraper] ✓ Static scrape: {len(page_data['text'])} chars")
             return page_data
             
+        except ResponseRejected as e:
+            print(f"[Scraper] ✗ Skipped {url}: {e.reason}")
+            self.skipped_pages.append({'url': url, 'reason': e.reason})
+            return None
         except Exception as e:
             print(f"[Scraper] ✗ Static scrape failed for {url}: {e}")
             return None
+        finally:
+            self.byte_budget.settle(allowance, used)
     
     def _dynamic_scrape(self, url: str) -> Optional[Dict]:
         """
@@ -240,182 +381,84 @@ class UltimateWebScraper:
             if not self.selenium_driver:
                 return None
             
-            self.selenium_driver.get(url)
-            
-            # Wait for page load
-            WebDriverWait(self.selenium_driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            started = time.monotonic()
+            page_deadline = settings.RENDER_PAGE_DEADLINE
+            self.selenium_driver.set_page_load_timeout(page_deadline)
+            try:
+                self.selenium_browser.open(url)
+            except TimeoutException:
+                # Keep whatever rendered so far
+                self.selenium_driver.execute_script("window.stop();")
             
-            # Additional wait for dynamic content
-            time.sleep(2)
+            # Wait until network and DOM go quiet instead of sleeping a fixed time
+            readiness = wait_for_page_settled(self.selenium_driver, page_deadline - (time.monotonic() - started))
             
-            # Scroll to load lazy content
+            # Scroll to load lazy content, then let it settle again
             self.selenium_driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            after_scroll = wait_for_page_settled(self.selenium_driver, page_deadline - (time.monotonic() - started))
+            
+            timing = {
+                'url': url,
+                'settled': readiness['settled'] and after_scroll['settled'],
+                'settle_ms': readiness['settle_ms'],
+                'scroll_settle_ms': after_scroll['settle_ms'],
+                'total_ms': int((time.monotonic() - started) * 1000),
+                'reason': after_scroll['reason'] if readiness['settled'] else readiness['reason'],
+            }
+            self.render_timings.append(timing)
             
             # Get rendered HTML
             html = self.selenium_driver.page_source
-            soup = BeautifulSoup(html, 'lxml')
+            page_data = self._extract_page_data(url, html)
+            page_data['render_timing'] = timing
             
-            page_data = self._extract_page_data(soup, url, html)
-            
-            print(f"[Scraper] ✓ Dynamic scrape: {len(page_data['text'])} chars")
+            print(
+                f"[Scraper] ✓ Dynamic scrape: {len(page_data['text'])} chars "
+                f"(settled in {timing['total_ms']}ms, {timing['reason']})"
+            )
             return page_data
             
         except Exception as e:
             print(f"[Scraper] ✗ Dynamic scrape failed for {url}: {e}")
             return None
     
-    def _extract_page_data(self, soup: BeautifulSoup, url: str, raw_html: str) -> Dict:
+    def _extract_page_data(self, url: str, raw_html: str) -> Dict:
         """
         Extract all useful data from parsed page
         """
-        # Title
-        title = ""
-        if soup.title:
-            title = soup.title.string.strip()
-        
-        # Meta description
-        meta_desc = ""
-        meta_tag = soup.find('meta', attrs={'name': 'description'})
-        if meta_tag and meta_tag.get('content'):
-            meta_desc = meta_tag['content']
-        
-        # Store original HTML before modification
-        original_html = str(soup)
-        
-        # Remove noise but KEEP headers/footers (they have contact info!)
-        for tag in soup(['script', 'style', 'noscript', 'iframe', 'svg', 'canvas']):
-            tag.decompose()
-        
-        # Extract structured data (JSON-LD)
-        structured_data = self._extract_structured_data(soup)
-        
-        # Get all visible text
-        text = soup.get_text(separator=' ', strip=True)
+        # Parse-once page model: every later step reads these views. Parsing
+        # runs in the CPU pool; this fetch thread just waits for the result
+        document = run_cpu(ParsedPage.from_html, url, raw_html)
         
-        # Also get text from specific contact-heavy sections
-        contact_sections = self._extract_contact_sections(soup)
-        if contact_sections:
-            text += "\n\n" + contact_sections
+        # Visible text plus text from specific contact-heavy sections
+        text = document.text
+        if document.contact_sections:
+            text += "\n\n" + document.contact_sections
         
         # Extract all links
         links = []
-        for link in soup.find_all('a', href=True):
-            full_url = urljoin(url, link['href'])
+        for anchor in document.anchors:
+            full_url = urljoin(url, anchor['href'])
             if self._is_same_domain(full_url):
                 links.append(full_url)
         
-        # Extract all email/phone from HTML attributes
-        attributes_data = self._extract_from_attributes(soup)
-        
         # Extract visible contact info patterns
         visible_contacts = self._extract_visible_contacts(text)
         
         return {
             'url': url,
-            'title': title,
-            'meta_description': meta_desc,
+            'title': document.title,
+            'meta_description': document.meta_description,
             'text': text,
-            'html': original_html,
+            'html_ref': get_page_store().put(raw_html),
+            'document': document,
             'links': list(set(links)),
-            'structured_data': structured_data,
-            'attributes_contacts': attributes_data,
+            'structured_data': document.structured_data,
+            'attributes_contacts': document.attribute_contacts,
             'visible_contacts': visible_contacts,
             'text_length': len(text)
         }
     
-    def _extract_structured_data(self, soup: BeautifulSoup) -> Dict:
-        """Extract JSON-LD and microdata"""
-        structured = {}
-        
-        # Extract JSON-LD
-        json_ld_scripts = soup.find_all('script', type='application/ld+json')
-        for script in json_ld_scripts:
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict):
-                    # Look for Organization data
-                    if data.get('@type') == 'Organization':
-                        structured['organization'] = data
-                    # Look for contact point
-                    if 'contactPoint' in data:
-                        structured['contact_point'] = data['contactPoint']
-            except:
-                pass
-        
-        return structured
-    
-    def _extract_contact_sections(self, soup: BeautifulSoup) -> str:
-        """Extract text from sections likely to have contact info"""
-        contact_parts = []
-        
-        keywords = [
-            'contact', 'footer', 'header', 'info', 'phone', 'email',
-            'address', 'location', 'office', 'headquarters', 'reach',
-            'connect', 'social', 'follow', 'touch', 'call', 'visit'
-        ]
-        
-        # Search by class
-        for keyword in keywords:
-            elements = soup.find_all(class_=lambda x: x and keyword in str(x).lower())
-            for elem in elements[:3]:  # Limit per keyword
-                text = elem.get_text(separator=' ', strip=True)
-                if text and len(text) > 10:
-                    contact_parts.append(text)
-        
-        # Search by id
-        for keyword in keywords:
-            elements = soup.find_all(id=lambda x: x and keyword in str(x).lower())
-            for elem in elements[:3]:
-                text = elem.get_text(separator=' ', strip=True)
-                if text and len(text) > 10:
-                    contact_parts.append(text)
-        
-        # Specific tags
-        for tag_name in ['footer', 'header', 'address', 'aside']:
-            for elem in soup.find_all(tag_name):
-                text = elem.get_text(separator=' ', strip=True)
-                if text and len(text) > 10:
-                    contact_parts.append(text)
-        
-        return "\n\n".join(set(contact_parts))
-    
-    def _extract_from_attributes(self, soup: BeautifulSoup) -> Dict:
-        """Extract contact info from HTML attributes"""
-        emails = set()
-        phones = set()
-        
-        # mailto: links
-        for link in soup.find_all('a', href=True):
-            href = link['href'].lower()
-            if 'mailto:' in href:
-                email = href.split('mailto:')[-1].split('?')[0]
-                emails.add(email)
-        
-        # tel: links
-        for link in soup.find_all('a', href=True):
-            href = link['href'].lower()
-            if 'tel:' in href:
-                phone = href.split('tel:')[-1]
-                phones.add(phone)
-        
-        # data-* attributes
-        for tag in soup.find_all(attrs={'data-email': True}):
-            emails.add(tag['data-email'])
-        
-        for tag in soup.find_all(attrs={'data-phone': True}):
-            phones.add(tag['data-phone'])
-        
-        for tag in soup.find_all(attrs={'data-tel': True}):
-            phones.add(tag['data-tel'])
-        
-        return {
-            'emails': list(emails),
-            'phones': list(phones)
-        }
-    
     def _extract_visible_contacts(self, text: str) -> Dict:
         """Quick extraction of visible contact patterns"""
         emails = set(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text, re.IGNORECASE))
@@ -437,22 +480,117 @@ class UltimateWebScraper:
             'phones': list(phones)
         }
     
+    def _await_site_links(self, discovery: Optional[Future]) -> Optional[SiteLinks]:
+        """Collect the background sitemap discovery, giving up after LINK_DISCOVERY_WAIT"""
+        if discovery is None:
+            return None
+        try:
+            return discovery.result(timeout=settings.LINK_DISCOVERY_WAIT)
+        except FutureTimeoutError:
+            print("[Scraper] Sitemap discovery still running, continuing without it")
+        except Exception as e:
+            print(f"[Scraper] Sitemap discovery failed: {e}")
+        return None
+    
+    def _apply_crawl_delay(self):
+        """
+        Slow the host down to its robots.txt Crawl-delay (bounded by
+        SCRAPER_MAX_CRAWL_DELAY), for every scan on the machine
+        """
+        if not self.site_links or not self.site_links.crawl_delay:
+            return
+        self.crawl_delay = min(self.site_links.crawl_delay, settings.SCRAPER_MAX_CRAWL_DELAY)
+        governor = get_rate_governor()
+        if governor is not None:
+            print(f"[Scraper] Honouring Crawl-delay of {self.crawl_delay}s")
+            governor.set_crawl_delay(self.base_url, self.crawl_delay)
+    
+    def _governor_stats(self) -> Dict:
+        governor = get_rate_governor()
+        return governor.stats(self.base_url) if governor is not None else {}
+    
     def _discover_links(self, homepage_data: Dict) -> List[str]:
-        """Discover all internal links"""
+        """Discover all internal links from scraped pages and the site's sitemaps"""
         all_links = set()
         
         for page in self.scraped_pages:
             all_links.update(page.get('links', []))
         
-        # Remove anchors and query params for deduplication
+        if self.site_links:
+            all_links.update(self.site_links.urls)
+        
+        return self._filter_links(all_links)
+    
+    def _filter_links(self, links) -> List[str]:
+        """Drop query strings, fragments, non-page files and robots.txt-disallowed links"""
         cleaned_links = set()
-        for link in all_links:
+        for link in links:
             clean_link = link.split('#')[0].split('?')[0]
             if clean_link and self._is_valid_link(clean_link):
                 cleaned_links.add(clean_link)
         
+        if self.site_links:
+            cleaned_links = {link for link in cleaned_links if self.site_links.is_allowed(link)}
+        
         return list(cleaned_links)
     
+    def _crawl_frontier(self) -> List[str]:
+        """
+        Fetch frontier pages in waves, best expected yield first, queueing the links
+        of each page one level deeper. Stops at max_pages, when the frontier is
+        empty or when the crawl monitor is satisfied. Returns the URLs fetched.
+        """
+        # Pages are checked as they arrive; fetching stops once the monitor is satisfied
+        engine = AsyncFetchEngine(self._fetch_and_observe, self.politeness, should_stop=self.crawl_monitor.should_stop)
+        wave_size = self.politeness.per_host_concurrency
+        remaining = self.max_pages - 1
+        fetched: List[str] = []
+        
+        print(
+            f"[Scraper] Crawling up to {remaining} pages, depth {self.frontier.max_depth} "
+            f"(concurrency {self.politeness.max_concurrency}, "
+            f"{self.politeness.per_host_concurrency}/host, paced by the rate governor)"
+        )
+        while remaining > 0 and not self.crawl_monitor.should_stop():
+            wave = []
+            while len(wave) < min(wave_size, remaining):
+                # The last pages of the budget are reserved for exploration links
+                item = None
+                if remaining - len(wave) <= self.frontier.exploration_left:
+                    item = self.frontier.pop_exploration()
+                item = item or self.frontier.pop() or self.frontier.pop_exploration()
+                if item is None:
+                    break
+                wave.append(item)
+            if not wave:
+                break
+            remaining -= len(wave)
+            
+            urls = [url for url, _ in wave]
+            results = engine.fetch_all(urls)
+            fetched.extend(url for url in urls if url not in engine.skipped)
+            
+            # Selenium is single-threaded, so rendering stays sequential
+            for (url, depth), page_data in zip(wave, results):
+                page_data = self._finish_page(url, page_data, priority=True)
+                if page_data and depth < self.frontier.max_depth:
+                    for link in self._filter_links(page_data['links']):
+                        self.frontier.add(link, depth + 1)
+        
+        if self.crawl_monitor.should_stop():
+            self.pages_skipped_by_stop = list(engine.skipped)
+            while remaining > 0:
+                item = self.frontier.pop()
+                if item is None:
+                    break
+                self.pages_skipped_by_stop.append(item[0])
+                remaining -= 1
+            print(f"[Scraper] Stopped early ({self.crawl_monitor.stop_reason}), skipped {len(self.pages_skipped_by_stop)} pages")
+        elif remaining <= 0 and len(self.frontier):
+            self.frontier_end_reason = 'page_limit'
+        
+        return fetched
+    
     def _is_valid_link(self, url: str) -> bool:
         """Check if link is worth scraping"""
         # Skip certain file types
@@ -465,46 +603,6 @@ class UltimateWebScraper:
         url_lower = url.lower()
         return not any(url_lower.endswith(ext) for ext in skip_extensions)
     
-    def _prioritize_contact_links(self, links: List[str]) -> List[str]:
-        """Sort links by relevance to contact information"""
-        scored_links = []
-        
-        # High priority keywords
-        high_priority = [
-            'contact', 'reach', 'get-in-touch', 'talk', 'connect'
-        ]
-        
-        # Medium priority keywords
-        medium_priority = [
-            'about', 'team', 'people', 'company', 'who-we-are',
-            'leadership', 'careers', 'jobs', 'location', 'office',
-            'info', 'information', 'help', 'support', 'faq'
-        ]
-        
-        for link in links:
-            link_lower = link.lower()
-            score = 0
-            
-            # Check high priority
-            for keyword in high_priority:
-                if keyword in link_lower:
-                    score += 100
-            
-            # Check medium priority
-            for keyword in medium_priority:
-                if keyword in link_lower:
-                    score += 10
-            
-            # Prefer shorter URLs (usually main pages)
-            score -= len(link) * 0.01
-            
-            scored_links.append((score, link))
-        
-        # Sort by score descending
-        scored_links.sort(reverse=True, key=lambda x: x[0])
-        
-        return [link for score, link in scored_links if score > 0]
-    
     def _selenium_deep_scrape(self, urls: List[str]):
         """Deep scrape with Selenium for missed content"""
         self._init_selenium()
@@ -513,70 +611,35 @@ class UltimateWebScraper:
             return
         
         for url in urls:
-            if url in self.visited_urls:
+            if self.frontier.is_visited(url):
                 continue
             
             print(f"[Scraper] Deep Selenium scrape: {url}")
             self._dynamic_scrape(url)
-            time.sleep(1)
     
     def _detect_contact_forms(self):
         """Detect contact forms in scraped pages"""
+        contact_indicators = [
+            'contact', 'message', 'inquiry', 'email',
+            'phone', 'reach', 'get in touch', 'name'
+        ]
+        
         for page in self.scraped_pages:
-            soup = BeautifulSoup(page['html'], 'lxml')
-            forms = soup.find_all('form')
-            
-            for form in forms:
+            for form in page['document'].forms:
                 # Check if it's a contact form
-                form_text = form.get_text().lower()
-                form_html = str(form).lower()
-                
-                contact_indicators = [
-                    'contact', 'message', 'inquiry', 'email',
-                    'phone', 'reach', 'get in touch', 'name'
-                ]
-                
-                if any(indicator in form_text or indicator in form_html for indicator in contact_indicators):
-                    # Extract form details
-                    action = form.get('action', '')
-                    method = form.get('method', 'get')
-                    
-                    # Get input fields
-                    inputs = []
-                    for input_tag in form.find_all(['input', 'textarea', 'select']):
-                        inputs.append({
-                            'type': input_tag.get('type', 'text'),
-                            'name': input_tag.get('name', ''),
-                            'placeholder': input_tag.get('placeholder', ''),
-                            'required': input_tag.has_attr('required')
-                        })
-                    
+                if any(indicator in form['text'] or indicator in form['markup'] for indicator in contact_indicators):
                     self.contact_forms.append({
                         'url': page['url'],
-                        'action': action,
-                        'method': method,
-                        'fields': inputs
+                        'action': form['action'],
+                        'method': form['method'],
+                        'fields': form['fields']
                     })
                     
                     print(f"[Scraper] ✓ Found contact form on {page['url']}")
     
     def _combine_text(self) -> str:
         """Combine all text from scraped pages"""
-        parts = []
-        
-        for page in self.scraped_pages:
-            parts.append(f"\n\n=== {page['title']} ({page['url']}) ===\n")
-            parts.append(page['text'])
-            
-            # Add structured data if available
-            if page.get('structured_data'):
-                parts.append(f"\n\nStructured Data: {json.dumps(page['structured_data'], indent=2)}")
-        
-        return "\n".join(parts)
-    
-    def _combine_html(self) -> str:
-        """Combine all HTML"""
-        return "\n\n".join([page['html'] for page in self.scraped_pages])
+        return "\n".join(combined_page_text(page) for page in self.scraped_pages)
     
     def _empty_result(self, error: str) -> Dict:
         """Return empty result"""
@@ -584,16 +647,20 @@ class UltimateWebScraper:
             'base_url': self.base_url,
             'pages': [],
             'combined_text': '',
-            'combined_html': '',
             'pages_scraped': 0,
             'contact_forms': [],
             'error': error
         }
 
 
-def scrape_website_ultimate(url: str, max_pages: int = 10, use_selenium: bool = True) -> Dict:
+def scrape_website_ultimate(
+    url: str,
+    max_pages: int = 10,
+    use_selenium: bool = True,
+    yield_model: Optional[YieldModel] = None
+) -> Dict:
     """
     Main entry point for ultimate scraping
     """
-    scraper = UltimateWebScraper(url, max_pages=max_pages, use_selenium=use_selenium)
+    scraper = UltimateWebScraper(url, max_pages=max_pages, use_selenium=use_selenium, yield_model=yield_model)
     return scraper.scrape()
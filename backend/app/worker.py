@@ -0,0 +1,215 @@
+"""
+Background scan workers.
+
+Run next to the API, as many as needed, against the same database:
+    python -m app.worker [--processes N]
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import traceback
+from typing import Type
+
+from app.config import get_settings
+from app.database import SessionLocal, engine, Base
+from app.models.scan_job import ScanJob
+from app.models.scan_batch import ScanBatch, ScanBatchItem
+from app.services.job_queue import JobQueue
+from app.services.batch_pipeline import BatchPipeline
+from app.services.scan_pipeline import ScanFailed, run_scan_pipeline
+from app.services.progress import progress_scope
+from app.services.http_client import close_http_client
+from app.services.http_cache import close_http_cache
+from app.services.asset_cache import close_asset_cache
+from app.services.browser_pool import get_browser_pool, close_browser_pool
+from app.services.cpu_pool import get_cpu_pool, close_cpu_pool
+from app.services.playwright_renderer import close_playwright_renderer
+
+settings = get_settings()
+
+
+def _heartbeat(job_id: int, worker_id: str, done: threading.Event, model: Type = ScanJob):
+    """Keep extending the job's (or batch's) lease while the pipeline runs"""
+    db = SessionLocal()
+    try:
+        queue = JobQueue(db, model=model)
+        interval = max(1.0, queue.visibility_timeout / 3)
+        while not done.wait(interval):
+            try:
+                if not queue.heartbeat(job_id, worker_id):
+                    print(f"[Worker {worker_id}] Lost lease on job {job_id}")
+                    return
+            except Exception as e:
+                db.rollback()
+                print(f"[Worker {worker_id}] Heartbeat failed for job {job_id}: {e}")
+    finally:
+        db.close()
+
+
+def run_job(job_id: int, website_url: str, worker_id: str, attempt: int = 1):
+    """Run one claimed job and record its outcome"""
+    done = threading.Event()
+    beat = threading.Thread(target=_heartbeat, args=(job_id, worker_id, done), daemon=True)
+    beat.start()
+
+    db = SessionLocal()
+    try:
+        with progress_scope(job_id) as progress:
+            progress.publish('status', status='running', attempt=attempt)
+            queue = JobQueue(db)
+            try:
+                scan = run_scan_pipeline(website_url, db)
+            except ScanFailed as e:
+                db.rollback()
+                status = queue.fail(job_id, worker_id, str(e), retryable=False)
+                progress.publish('status', status=status or 'failed', error=str(e))
+                print(f"[Worker {worker_id}] Job {job_id} failed: {e}")
+            except Exception as e:
+                db.rollback()
+                traceback.print_exc()
+                status = queue.fail(job_id, worker_id, f"Scan failed: {e}")
+                progress.publish('status', status=status or 'failed', error=f"Scan failed: {e}")
+                print(f"[Worker {worker_id}] Job {job_id} attempt failed ({status}): {e}")
+            else:
+                queue.complete(job_id, worker_id, scan_id=scan.id)
+                progress.publish('status', status='succeeded', scan_id=scan.id)
+                print(f"[Worker {worker_id}] Job {job_id} done -> scan {scan.id}")
+    finally:
+        done.set()
+        beat.join()
+        db.close()
+
+
+def run_batch(batch_id: int, worker_id: str, stop: threading.Event):
+    """Run a claimed bulk scan until its items are finished or `stop` is set"""
+    done = threading.Event()
+    beat = threading.Thread(target=_heartbeat, args=(batch_id, worker_id, done, ScanBatch), daemon=True)
+    beat.start()
+
+    try:
+        try:
+            BatchPipeline(batch_id, worker_id, stop).run()
+        except Exception as e:
+            traceback.print_exc()
+            db = SessionLocal()
+            try:
+                status = JobQueue(db, model=ScanBatch).fail(batch_id, worker_id, f"Batch failed: {e}")
+            finally:
+                db.close()
+            print(f"[Worker {worker_id}] Batch {batch_id} attempt failed ({status}): {e}")
+            return
+
+        db = SessionLocal()
+        try:
+            queue = JobQueue(db, model=ScanBatch)
+            unfinished = (
+                db.query(ScanBatchItem.id)
+                .filter(ScanBatchItem.batch_id == batch_id, ScanBatchItem.status.in_(["pending", "running"]))
+                .count()
+            )
+            if unfinished:
+                # Stopped early: another worker picks up the rest
+                queue.release(batch_id, worker_id)
+                print(f"[Worker {worker_id}] Released batch {batch_id} with {unfinished} items left")
+            else:
+                queue.complete(batch_id, worker_id)
+                print(f"[Worker {worker_id}] Batch {batch_id} done")
+        finally:
+            db.close()
+    finally:
+        done.set()
+        beat.join()
+
+
+def _claim(worker_id: str):
+    """Lease a single scan job, or failing that a bulk scan: ('job'|'batch', row) or None"""
+    db = SessionLocal()
+    try:
+        job = JobQueue(db).claim(worker_id)
+        if job is not None:
+            return 'job', (job.id, job.website_url, job.attempts)
+        batch = JobQueue(db, model=ScanBatch).claim(worker_id)
+        if batch is not None:
+            return 'batch', (batch.id, batch.name)
+    except Exception as e:
+        db.rollback()
+        print(f"[Worker {worker_id}] Claim failed: {e}")
+    finally:
+        db.close()
+    return None
+
+
+def worker_loop(worker_id: str, stop: threading.Event):
+    """Claim and run jobs until `stop` is set"""
+    print(f"[Worker {worker_id}] Ready")
+    while not stop.is_set():
+        claimed = _claim(worker_id)
+
+        if claimed is None:
+            stop.wait(settings.SCAN_WORKER_POLL_INTERVAL)
+            continue
+
+        kind, row = claimed
+        if kind == 'batch':
+            print(f"[Worker {worker_id}] Running batch {row[0]}: {row[1]}")
+            run_batch(row[0], worker_id, stop)
+        else:
+            print(f"[Worker {worker_id}] Running job {row[0]}: {row[1]}")
+            run_job(row[0], row[1], worker_id, attempt=row[2])
+
+
+def _process_main():
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    # Finish the current job, then exit
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    if settings.SELENIUM_POOL_PREWARM > 0:
+        threading.Thread(target=get_browser_pool().warm, args=(settings.SELENIUM_POOL_PREWARM,), daemon=True).start()
+    # Start the parsing/extraction processes before the first job
+    get_cpu_pool()
+    try:
+        worker_loop(worker_id, stop)
+    finally:
+        close_http_client()
+        close_http_cache()
+        close_asset_cache()
+        close_browser_pool()
+        close_playwright_renderer()
+        close_cpu_pool()
+        print(f"[Worker {worker_id}] Stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background scan workers")
+    parser.add_argument('--processes', type=int, default=settings.SCAN_WORKER_PROCESSES, help='Worker processes to start')
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    # Connections must not be shared with forked children
+    engine.dispose()
+
+    processes = [
+        multiprocessing.Process(target=_process_main, name=f"scan-worker-{i}")
+        for i in range(max(1, args.processes))
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, _frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    main()
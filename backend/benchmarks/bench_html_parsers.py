@@ -0,0 +1,109 @@
+"""
+Compare HTML parser backends on per-page parse, text extraction and full
+ParsedPage build time.
+
+Usage (from backend/):
+    python -m benchmarks.bench_html_parsers [page.html ...] [--rounds N]
+
+Without files a synthetic business page is used.
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from app.services.html_parsers import SelectolaxParser, parse_html, parse_soup, SoupDocument
+from app.services.page_model import ParsedPage, NOISE_TAGS
+
+BACKENDS = ['bs4', 'lxml', 'selectolax']
+
+
+def synthetic_page(sections: int = 200) -> str:
+    """A large, link- and footer-heavy page shaped like a typical company site"""
+    nav = ''.join(f'<li><a href="/section-{i}">Section {i}</a></li>' for i in range(60))
+    body = ''.join(
+        f'<section class="block-{i}"><h2>Heading {i}</h2>'
+        f'<p>Paragraph {i} with <b>bold</b> text and <a href="/item/{i}">a link</a>.</p>'
+        f'<div class="card"><span>Item {i}</span><img src="/img/{i}.png" alt="item {i}"></div>'
+        f'<script>var x{i} = {i};</script></section>'
+        for i in range(sections)
+    )
+    footer = (
+        '<footer class="site-footer"><address>1 Main St, Springfield, IL 62701</address>'
+        '<a href="mailto:hello@example.com">hello@example.com</a>'
+        '<a href="tel:+15555550123">+1 555 555 0123</a>'
+        '<a href="https://www.linkedin.com/company/example">LinkedIn</a></footer>'
+    )
+    form = '<form action="/contact" method="post"><input name="email"><textarea name="msg"></textarea></form>'
+    return (
+        '<!DOCTYPE html><html><head><title>Example Co</title>'
+        '<meta name="description" content="Example company">'
+        '<script type="application/ld+json">{"@type": "Organization", "name": "Example Co"}</script>'
+        f'</head><body><nav><ul>{nav}</ul></nav><main>{body}{form}</main>{footer}</body></html>'
+    )
+
+
+def _parse(backend: str, html: str):
+    if backend == 'bs4':
+        return SoupDocument(parse_soup(html))
+    return parse_html(html, backend=backend)
+
+
+def _text(backend: str, html: str) -> str:
+    document = _parse(backend, html)
+    document.remove(NOISE_TAGS)
+    return document.document_text()
+
+
+def _build(backend: str, html: str) -> ParsedPage:
+    return ParsedPage.from_document('https://example.com/', _parse(backend, html))
+
+
+def _time(fn: Callable[[], object], rounds: int) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(pages: Dict[str, str], rounds: int) -> List[Dict]:
+    backends = [b for b in BACKENDS if b != 'selectolax' or SelectolaxParser is not None]
+    results = []
+    for name, html in pages.items():
+        for backend in backends:
+            results.append({
+                'page': name,
+                'backend': backend,
+                'parse_ms': _time(lambda: _parse(backend, html), rounds),
+                'text_ms': _time(lambda: _text(backend, html), rounds),
+                'build_ms': _time(lambda: _build(backend, html), rounds),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help='HTML files to parse')
+    parser.add_argument('--rounds', type=int, default=20, help='Timed runs per measurement')
+    args = parser.parse_args()
+
+    pages = {}
+    for path in args.files:
+        with open(path, 'rb') as f:
+            pages[path] = f.read().decode('utf-8', errors='replace')
+    if not pages:
+        pages['synthetic'] = synthetic_page()
+
+    print(f"{'page':<30} {'backend':<11} {'parse ms':>9} {'text ms':>9} {'build ms':>9}")
+    for row in run(pages, args.rounds):
+        print(
+            f"{row['page'][-30:]:<30} {row['backend']:<11} "
+            f"{row['parse_ms']:>9.2f} {row['text_ms']:>9.2f} {row['build_ms']:>9.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
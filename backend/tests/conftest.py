@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# Settings are read at import time: point everything at a scratch directory first
+_tmp = tempfile.mkdtemp(prefix="website-intel-tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp, 'test.db')}")
+os.environ.setdefault("PAGE_STORE_DIR", os.path.join(_tmp, "pages"))
+os.environ.setdefault("ASSET_CACHE_PATH", os.path.join(_tmp, "assets.db"))
+os.environ.setdefault("HTTP_CACHE_ENABLED", "False")
+os.environ.setdefault("CPU_POOL_ENABLED", "False")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
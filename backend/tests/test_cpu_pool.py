@@ -0,0 +1,27 @@
+import threading
+
+import pytest
+
+from app.services.cpu_pool import CpuPool
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = CpuPool(workers=1, max_pending=4)
+    yield pool
+    pool.close()
+
+
+def test_runs_in_worker(pool):
+    assert pool.run(sorted, [3, 1, 2]) == [1, 2, 3]
+
+
+def test_unpicklable_arguments_run_inline(pool):
+    assert pool.run(len, [threading.Lock()]) == 1
+
+
+def test_task_errors_propagate(pool, capsys):
+    # A TypeError raised by the task itself is not mistaken for a pickling failure
+    with pytest.raises(TypeError):
+        pool.run(len, 5)
+    assert "running inline" not in capsys.readouterr().out
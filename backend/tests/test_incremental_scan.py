@@ -0,0 +1,61 @@
+import json
+
+import app.services.incremental_scan as incremental_scan
+from app.services.incremental_scan import IncrementalScan
+from app.services.page_model import ParsedPage
+from app.services.page_store import get_page_store
+from app.services.ultimate_extractor import combined_page_text, extract_contacts_ultimate
+
+
+def _page(url: str, html: str) -> dict:
+    document = ParsedPage.from_html(url, html)
+    return {
+        'url': url,
+        'title': document.title,
+        'text': document.text,
+        'html_ref': get_page_store().put(html),
+        'document': document,
+        'structured_data': document.structured_data,
+        'attributes_contacts': document.attribute_contacts,
+    }
+
+
+def _site(bodies: dict) -> dict:
+    pages = [_page(url, f"<html><head><title>{url}</title></head><body>{body}</body></html>") for url, body in bodies.items()]
+    return {
+        'base_url': 'https://acme.example',
+        'pages': pages,
+        'combined_text': "\n".join(combined_page_text(page) for page in pages),
+    }
+
+
+def test_rescan_extracts_only_changed_pages_and_matches_full_extraction(monkeypatch):
+    bodies = {
+        # Seen without context on two pages: only the cross-page score keeps it
+        'https://acme.example/': "<p>Widgets since 1990. Office 415 555 2671</p>",
+        'https://acme.example/about': "<p>Our team. HQ 415 555 2671</p>"
+                                      '<a href="https://twitter.com/acme">Twitter</a>',
+        'https://acme.example/contact': "<p>Write to sales@acme-widgets.com</p>"
+                                        '<a href="https://www.linkedin.com/company/acme">LinkedIn</a>',
+    }
+    first = IncrementalScan('https://acme.example', {}, None)
+    first.extract(_site(bodies))
+
+    bodies['https://acme.example/contact'] = "<p>Write to hello@acme-widgets.com or call 212 555 0147</p>"
+    site = _site(bodies)
+    extracted = []
+    extract_page_evidence = incremental_scan.extract_page_evidence
+    monkeypatch.setattr(
+        incremental_scan, 'extract_page_evidence',
+        lambda page, *args: extracted.append(page['url']) or extract_page_evidence(page, *args)
+    )
+
+    # As loaded back from the database
+    previous_pages = {url: (fingerprint, json.loads(json.dumps(evidence))) for url, (fingerprint, evidence) in first.pages.items()}
+    rescan = IncrementalScan('https://acme.example', previous_pages, None)
+    contacts = rescan.extract(site)
+
+    assert extracted == ['https://acme.example/contact']
+    assert rescan.changed == ['https://acme.example/contact']
+    assert contacts == extract_contacts_ultimate(site, publish_progress=False)
+    assert '(415) 555-2671' in contacts['phone_numbers']
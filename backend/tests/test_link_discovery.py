@@ -0,0 +1,35 @@
+import io
+
+from app.services.link_discovery import _parse_sitemap_xml
+
+
+def test_image_sitemap_yields_only_page_urls():
+    xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"
+        xmlns:video="http://www.google.com/schemas/sitemap-video/1.1">
+  <url>
+    <loc>https://a.com/contact</loc>
+    <image:image>
+      <image:loc>https://a.com/img/team.jpg</image:loc>
+    </image:image>
+    <video:video>
+      <video:content_loc>https://a.com/video/intro.mp4</video:content_loc>
+      <video:loc>https://a.com/video/intro.mp4</video:loc>
+    </video:video>
+  </url>
+</urlset>"""
+    page_urls, child_sitemaps = _parse_sitemap_xml(io.BytesIO(xml), max_urls=100)
+    assert page_urls == ['https://a.com/contact']
+    assert child_sitemaps == []
+
+
+def test_sitemap_index_yields_child_sitemaps():
+    xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://a.com/sitemap-pages.xml</loc></sitemap>
+  <sitemap><loc>https://a.com/sitemap-posts.xml</loc></sitemap>
+</sitemapindex>"""
+    page_urls, child_sitemaps = _parse_sitemap_xml(io.BytesIO(xml), max_urls=100)
+    assert page_urls == []
+    assert child_sitemaps == ['https://a.com/sitemap-pages.xml', 'https://a.com/sitemap-posts.xml']
@@ -0,0 +1,36 @@
+import pytest
+
+from app.database import Base, engine
+from app.services.rate_governor import RateGovernor
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    Base.metadata.create_all(bind=engine)
+
+
+def test_governors_in_different_processes_share_a_hosts_budget():
+    # Two instances stand in for two worker processes
+    first = RateGovernor(initial_rate=1.0, max_rate=1.0, burst=1)
+    second = RateGovernor(initial_rate=1.0, max_rate=1.0, burst=1)
+
+    assert first.reserve('https://shared.example/a') == 0
+    assert second.reserve('https://www.shared.example/b') == pytest.approx(1.0, abs=0.1)
+    assert first.stats('https://shared.example/')['requests'] == 2
+
+
+def test_only_successful_responses_raise_the_rate():
+    governor = RateGovernor(initial_rate=2.0, min_rate=0.1, max_rate=10.0)
+    url = 'https://statuses.example/'
+
+    governor.record(url, 200, 0.1)
+    raised = governor.stats(url)['rate']
+    assert raised > 2.0
+
+    governor.record(url, 404, 0.1)
+    assert governor.stats(url)['rate'] == raised
+
+    governor.record(url, 403, 0.1)
+    stats = governor.stats(url)
+    assert stats['rate'] == pytest.approx(raised / 2, abs=0.001)
+    assert stats['throttled'] == 1
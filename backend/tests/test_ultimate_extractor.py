@@ -0,0 +1,35 @@
+from app.services.page_model import ParsedPage
+from app.services.page_store import get_page_store
+from app.services.ultimate_extractor import UltimateContactExtractor
+
+
+def _page(url: str, html: str) -> dict:
+    document = ParsedPage.from_html(url, html)
+    return {
+        'url': url,
+        'title': document.title,
+        'text': document.text,
+        'html_ref': get_page_store().put(html),
+        'document': document,
+        'structured_data': document.structured_data,
+        'attributes_contacts': document.attribute_contacts,
+    }
+
+
+def test_socials_found_outside_links_and_json_ld():
+    html = """
+    <html><body>
+      <p>Welcome</p>
+      <div data-profile="https://www.instagram.com/acme_widgets"></div>
+      <script>window.social = {twitter: "https://twitter.com/acmewidgets"};</script>
+      <a href="https://www.linkedin.com/company/acme-widgets">LinkedIn</a>
+    </body></html>
+    """
+    page = _page('https://acme.example/', html)
+    scraped = {'base_url': 'https://acme.example', 'pages': [page], 'combined_text': page['text']}
+
+    urls = {social['url'] for social in UltimateContactExtractor(scraped).extract_all(publish_progress=False)['socials']}
+
+    assert 'https://linkedin.com/company/acme-widgets' in urls
+    assert 'https://instagram.com/acme_widgets' in urls
+    assert 'https://twitter.com/acmewidgets' in urls
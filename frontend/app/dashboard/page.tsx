@@ -3,18 +3,31 @@
 import { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
 import { isAuthenticated } from '@/lib/auth';
-import { createScan } from '@/lib/api';
+import { createScan, ScanFailedError } from '@/lib/api';
 import ScanForm from '@/components/ScanForm';
 import ScanResult from '@/components/ScanResult';
-import type { Scan } from '@/types';
+import type { Scan, ScanEvent } from '@/types';
 import { AlertCircle, CheckCircle2, Loader2 } from 'lucide-react';
 
+// Progress reached when each pipeline phase starts
+const PHASE_PROGRESS: Record<string, number> = {
+  homepage: 15,
+  link_discovery: 25,
+  priority_pages: 30,
+  deep_scrape: 65,
+  forms: 70,
+  extraction: 75,
+  llm: 85,
+};
+
 export default function DashboardPage() {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [scan, setScan] = useState<Scan | null>(null);
   const [progress, setProgress] = useState(0);
   const [progressMessage, setProgressMessage] = useState('');
+  const [foundEmails, setFoundEmails] = useState<string[]>([]);
+  const [foundPhones, setFoundPhones] = useState<string[]>([]);
   const router = useRouter();
 
   useEffect(() => {
@@ -23,31 +36,28 @@ export default function DashboardPage() {
     }
   }, [router]);
 
-  const simulateProgress = () => {
-    let currentProgress = 0;
-    const messages = [
-      'Initializing scraper...',
-      'Fetching website content...',
-      'Discovering contact pages...',
-      'Extracting contact information...',
-      'Processing with AI...',
-      'Validating results...',
-      'Saving to database...'
-    ];
-
-    const interval = setInterval(() => {
-      currentProgress += Math.random() * 15;
-      if (currentProgress > 90) currentProgress = 90;
-
-      setProgress(Math.floor(currentProgress));
-
-      const messageIndex = Math.floor(currentProgress / 15);
-      if (messageIndex < messages.length) {
-        setProgressMessage(messages[messageIndex]);
+  const handleEvent = (event: ScanEvent) => {
+    const { type, data } = event;
+    if (type === 'status') {
+      if (data.status === 'queued') {
+        setProgress(5);
+        setProgressMessage('Waiting for a scan worker...');
+      } else if (data.status === 'running') {
+        setProgress(10);
+        setProgressMessage(data.attempt > 1 ? `Retrying (attempt ${data.attempt})...` : 'Starting scan...');
       }
-    }, 2000);
-
-    return () => clearInterval(interval);
+    } else if (type === 'phase') {
+      setProgress((current) => Math.max(current, PHASE_PROGRESS[data.phase] ?? current));
+      setProgressMessage(`${data.message}...`);
+    } else if (type === 'page') {
+      // Each crawled page moves the bar within the crawl phase
+      setProgress((current) => (current >= 30 && current < 60 ? current + 5 : current));
+      setProgressMessage(`Scraped ${data.url}`);
+      if (data.emails?.length) setFoundEmails(data.emails);
+    } else if (type === 'contacts') {
+      if (data.emails?.length) setFoundEmails(data.emails);
+      if (data.phone_numbers) setFoundPhones(data.phone_numbers);
+    }
   };
 
   const handleScan = async (url: string) => {
@@ -55,20 +65,21 @@ export default function DashboardPage() {
     setError('');
     setScan(null);
     setProgress(0);
-
-    const cleanup = simulateProgress();
+    setProgressMessage('Queueing scan...');
+    setFoundEmails([]);
+    setFoundPhones([]);
 
     try {
-      const result = await createScan(url);
+      const result = await createScan(url, handleEvent);
       setProgress(100);
       setProgressMessage('Complete!');
       setTimeout(() => {
         setScan(result);
-        cleanup();
       }, 500);
     } catch (err: any) {
-      cleanup();
-      if (err.response?.status === 429) {
+      if (err instanceof ScanFailedError) {
+        setError(err.message);
+      } else if (err.response?.status === 429) {
         setError('Rate limit exceeded. Please wait a few minutes before trying again.');
       } else {
         setError(err.response?.data?.detail || 'Failed to scan website. Please try again.');
@@ -121,6 +132,20 @@ export default function DashboardPage() {
           </div>
           <p className="text-center text-sm text-gray-600">{progress}%</p>
 
+          {(foundEmails.length > 0 || foundPhones.length > 0) && (
+            <div className="mt-6 p-4 bg-indigo-50 rounded-lg">
+              <h3 className="text-sm font-semibold text-indigo-900 mb-2">Found so far</h3>
+              <ul className="text-sm text-indigo-800 space-y-1">
+                {foundEmails.map((email) => (
+                  <li key={email}>✉️ {email}</li>
+                ))}
+                {foundPhones.map((phone) => (
+                  <li key={phone}>📞 {phone}</li>
+                ))}
+              </ul>
+            </div>
+          )}
+
           <div className="mt-6 grid grid-cols-3 gap-4 text-center">
             <div className="p-3 bg-gray-50 rounded-lg">
               <div className="text-2xl mb-1">🔍</div>
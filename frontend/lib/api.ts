@@ -1,6 +1,6 @@
 import axios from 'axios';
 import { getToken, removeToken } from './auth';
-import type { LoginRequest, LoginResponse, Scan, ScanListResponse } from '@/types';
+import type { LoginRequest, LoginResponse, Scan, ScanEvent, ScanEventType, ScanJob, ScanListResponse, ScanStreamToken } from '@/types';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -44,11 +44,84 @@ export const login = async (credentials: LoginRequest): Promise<LoginResponse> =
 };
 
 // Scan APIs
-export const createScan = async (websiteUrl: string): Promise<Scan> => {
-  const response = await api.post<Scan>('/scans/', { website_url: websiteUrl });
+const JOB_POLL_INTERVAL_MS = 2000;
+
+export class ScanFailedError extends Error {}
+
+// A recent scan of the same site is reused unless forceRefresh is set
+export const enqueueScan = async (websiteUrl: string, forceRefresh: boolean = false): Promise<ScanJob> => {
+  const response = await api.post<ScanJob>('/scans/', { website_url: websiteUrl, force_refresh: forceRefresh });
+  return response.data;
+};
+
+export const getScanJob = async (jobId: number): Promise<ScanJob> => {
+  const response = await api.get<ScanJob>(`/scans/jobs/${jobId}`);
   return response.data;
 };
 
+const SCAN_EVENT_TYPES: ScanEventType[] = ['status', 'phase', 'page', 'contacts', 'end'];
+
+const getScanJobStreamToken = async (jobId: number): Promise<string> => {
+  const response = await api.post<ScanStreamToken>(`/scans/jobs/${jobId}/stream-token`);
+  return response.data.token;
+};
+
+// Live progress over Server-Sent Events. EventSource cannot send headers, so the query carries
+// a short-lived token scoped to this job instead of the access token
+export const subscribeToScanJob = (jobId: number, onEvent: (event: ScanEvent) => void): (() => void) => {
+  let source: EventSource | null = null;
+  let closed = false;
+
+  getScanJobStreamToken(jobId)
+    .then((token) => {
+      if (closed) {
+        return;
+      }
+      source = new EventSource(`${API_BASE_URL}/scans/jobs/${jobId}/events?token=${encodeURIComponent(token)}`);
+
+      SCAN_EVENT_TYPES.forEach((type) => {
+        source?.addEventListener(type, (message) => {
+          const { lastEventId, data } = message as MessageEvent;
+          onEvent({ id: lastEventId ? Number(lastEventId) : null, type, data: JSON.parse(data) });
+          if (type === 'end') {
+            source?.close();
+          }
+        });
+      });
+    })
+    // Progress is best-effort: the job is still polled
+    .catch(() => undefined);
+
+  return () => {
+    closed = true;
+    source?.close();
+  };
+};
+
+// Queues a scan and polls its job until a worker finishes it, streaming progress to onEvent
+export const createScan = async (
+  websiteUrl: string,
+  onEvent?: (event: ScanEvent) => void,
+  forceRefresh: boolean = false
+): Promise<Scan> => {
+  let job = await enqueueScan(websiteUrl, forceRefresh);
+  const unsubscribe = onEvent ? subscribeToScanJob(job.id, onEvent) : null;
+
+  try {
+    while (job.status === 'queued' || job.status === 'running') {
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+      job = await getScanJob(job.id);
+    }
+  } finally {
+    unsubscribe?.();
+  }
+
+  if (job.status !== 'succeeded' || job.scan_id === null) {
+    throw new ScanFailedError(job.error || 'Scan failed');
+  }
+  return getScanById(job.scan_id);
+};
+
 export const getScans = async (page: number = 1, pageSize: number = 10): Promise<ScanListResponse> => {
   const response = await api.get<ScanListResponse>('/scans/', {
     params: { page, page_size: pageSize },
@@ -13,6 +13,20 @@ export interface SocialMedia {
   url: string;
 }
 
+// What changed since the site's previous scan (incremental rescans)
+export interface ScanDelta {
+  previous_scan_id: number | null;
+  pages_added: string[];
+  pages_changed: string[];
+  pages_removed: string[];
+  pages_unchanged: number;
+  emails_added: string[];
+  emails_removed: string[];
+  phone_numbers_added: string[];
+  phone_numbers_removed: string[];
+  llm_skipped: boolean;
+}
+
 export interface ScanResult {
   company_name: string;
   website: string;
@@ -23,6 +37,7 @@ export interface ScanResult {
   addresses: string[];
   notes: string | null;
   sources: string[];
+  delta?: ScanDelta | null;
 }
 
 export interface Scan {
@@ -48,4 +63,30 @@ export interface ScanListResponse {
   page: number;
   page_size: number;
   total_pages: number;
-}
\ No newline at end of file
+}
+
+export interface ScanJob {
+  id: number;
+  website_url: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  attempts: number;
+  max_attempts: number;
+  scan_id: number | null;
+  error: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+export interface ScanStreamToken {
+  token: string;
+  expires_in: number;
+}
+
+export type ScanEventType = 'status' | 'phase' | 'page' | 'contacts' | 'end';
+
+export interface ScanEvent {
+  id: number | null;
+  type: ScanEventType;
+  data: Record<string, any>;
+}